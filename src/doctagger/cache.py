@@ -0,0 +1,114 @@
+"""On-disk cache for extracted text and LLM tagging results."""
+
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+from .models import TaggingResult
+
+logger = logging.getLogger(__name__)
+
+
+def make_cache_key(*parts: str) -> str:
+    """
+    Build a cache key from the inputs that determine a result.
+
+    Args:
+        *parts: Strings identifying the input (content hash, model, prompt, ...)
+
+    Returns:
+        Hex digest usable as a file name
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Cache of extracted text and tagging results, one file per entry.
+
+    Entries are keyed by content (see make_cache_key), so unchanged PDFs skip
+    re-extraction and re-tagging, while any change to the document, model or
+    prompt simply misses.
+    """
+
+    def __init__(self, folder: Path, tagging_ttl: Optional[float] = None):
+        """
+        Initialize result cache.
+
+        Args:
+            folder: Directory the cache files are stored in
+            tagging_ttl: Seconds after which tagging results expire (None
+                to keep them; extracted text never expires)
+        """
+        self.folder = folder
+        self.tagging_ttl = tagging_ttl
+        self._text_folder = folder / "text"
+        self._tags_folder = folder / "tags"
+        self._text_folder.mkdir(parents=True, exist_ok=True)
+        self._tags_folder.mkdir(parents=True, exist_ok=True)
+
+    def get_text(self, key: str) -> Optional[str]:
+        """Get cached extracted text, or None on a miss."""
+        data = self._read(self._text_folder / f"{key}.txt")
+        return data.decode("utf-8") if data is not None else None
+
+    def put_text(self, key: str, text: str) -> None:
+        """Store extracted text."""
+        self._write(self._text_folder / f"{key}.txt", text.encode("utf-8"))
+
+    def get_tagging(self, key: str) -> Optional[TaggingResult]:
+        """Get a cached tagging result, or None on a miss."""
+        data = self._read(self._tags_folder / f"{key}.json", self.tagging_ttl)
+        if data is None:
+            return None
+        try:
+            return TaggingResult.model_validate_json(data)
+        except ValueError as e:
+            logger.warning(f"Ignoring invalid cached tagging result {key}: {e}")
+            return None
+
+    def put_tagging(self, key: str, result: TaggingResult) -> None:
+        """Store a tagging result."""
+        self._write(self._tags_folder / f"{key}.json", result.model_dump_json().encode("utf-8"))
+
+    def _read(self, path: Path, ttl: Optional[float] = None) -> Optional[bytes]:
+        """Read a cache file, treating any failure or expired entry as a miss."""
+        try:
+            if ttl is not None and time.time() - path.stat().st_mtime > ttl:
+                logger.debug(f"Cache entry expired: {path.parent.name}/{path.name}")
+                return None
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Failed to read cache entry {path.name}: {e}")
+            return None
+        logger.debug(f"Cache hit: {path.parent.name}/{path.name}")
+        return data
+
+    def _write(self, path: Path, data: bytes) -> None:
+        """
+        Write a cache file atomically.
+
+        Writing to a temporary file and renaming means concurrent readers
+        never see a partially written entry.
+        """
+        try:
+            fd, temp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(temp_name, path)
+            except BaseException:
+                os.unlink(temp_name)
+                raise
+        except OSError as e:
+            logger.warning(f"Failed to write cache entry {path.name}: {e}")
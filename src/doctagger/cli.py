@@ -3,7 +3,7 @@
 import logging
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 import click
 
@@ -13,27 +13,40 @@ from .processor import DocumentProcessor
 from .watcher import FolderWatcher
 
 
+# Handlers installed by setup_logging; replaced (and closed) when it runs again
+_log_handlers: List[logging.Handler] = []
+
+
 def setup_logging(verbose: bool = False, log_file: Optional[Path] = None) -> None:
     """
     Setup logging configuration.
 
+    Safe to call repeatedly: handlers from a previous call are removed and
+    closed instead of accumulating (and leaking log file descriptors).
+
     Args:
         verbose: Enable verbose (DEBUG) logging
         log_file: Optional log file path
     """
     level = logging.DEBUG if verbose else logging.INFO
-    format_str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    root = logging.getLogger()
 
-    handlers = [logging.StreamHandler(sys.stdout)]
+    for handler in _log_handlers:
+        root.removeHandler(handler)
+        handler.close()
+    _log_handlers.clear()
+
+    handlers: List[logging.Handler] = [logging.StreamHandler(sys.stdout)]
 
     if log_file:
         handlers.append(logging.FileHandler(log_file))
 
-    logging.basicConfig(
-        level=level,
-        format=format_str,
-        handlers=handlers,
-    )
+    for handler in handlers:
+        handler.setFormatter(formatter)
+        root.addHandler(handler)
+    root.setLevel(level)
+    _log_handlers.extend(handlers)
 
 
 @click.group()
@@ -56,18 +69,23 @@ def cli(ctx: click.Context, verbose: bool, log_file: Optional[str]) -> None:
 @click.argument("pdf_path", type=click.Path(exists=True, dir_okay=False))
 @click.option("--skip-ocr", is_flag=True, help="Skip OCR processing")
 @click.option("--skip-archive", is_flag=True, help="Skip archiving")
+@click.option("--force", is_flag=True, help="Process even if the same content is already archived")
 @click.pass_context
 def process(
-    ctx: click.Context, pdf_path: str, skip_ocr: bool, skip_archive: bool
+    ctx: click.Context, pdf_path: str, skip_ocr: bool, skip_archive: bool, force: bool
 ) -> None:
     """Process a single PDF file."""
     config = ctx.obj["config"]
-    processor = DocumentProcessor(config)
-
     pdf_file = Path(pdf_path)
-    click.echo(f"Processing: {pdf_file.name}")
 
-    result = processor.process(pdf_file, skip_ocr=skip_ocr, skip_archive=skip_archive)
+    # Closing waits for the background temp file cleanup, even on errors
+    with DocumentProcessor(config) as processor:
+        processor.preload_embedder()
+        click.echo(f"Processing: {pdf_file.name}")
+
+        result = processor.process(
+            pdf_file, skip_ocr=skip_ocr, skip_archive=skip_archive, force_reprocess=force
+        )
 
     if result.status.value == "completed":
         click.echo(click.style("✓ Success!", fg="green"))
@@ -81,6 +99,9 @@ def process(
         if result.archive_path:
             click.echo(f"  Archived to: {result.archive_path}")
         click.echo(f"  Processing time: {result.processing_time:.2f}s")
+    elif result.status.value == "skipped":
+        click.echo(click.style("↷ Skipped: content already archived", fg="yellow"))
+        click.echo(f"  Archived as: {result.archive_path}")
     else:
         click.echo(click.style("✗ Failed!", fg="red"))
         click.echo(f"  Error: {result.error}")
@@ -93,6 +114,12 @@ def process(
 @click.option("--skip-ocr", is_flag=True, help="Skip OCR processing")
 @click.option("--skip-archive", is_flag=True, help="Skip archiving")
 @click.option("--parallel", "-p", default=1, help="Number of parallel workers")
+@click.option(
+    "--processes",
+    "-P",
+    default=1,
+    help="Number of worker processes (each loads its own models; overrides --parallel)",
+)
 @click.pass_context
 def batch(
     ctx: click.Context,
@@ -101,12 +128,19 @@ def batch(
     skip_ocr: bool,
     skip_archive: bool,
     parallel: int,
+    processes: int,
 ) -> None:
     """Process multiple PDF files in batch."""
     import concurrent.futures
 
     config = ctx.obj["config"]
-    processor = DocumentProcessor(config)
+    processor = None
+    if processes <= 1:
+        processor = DocumentProcessor(config)
+        # Runs when the command exits, also on errors, so pending temp file
+        # cleanup is waited for
+        ctx.call_on_close(processor.close)
+        processor.preload_embedder()
 
     # Collect all PDF files
     files_to_process = []
@@ -124,9 +158,13 @@ def batch(
         click.echo(click.style("No PDF files to process", fg="yellow"))
         return
 
-    click.echo(f"Processing {len(files_to_process)} files with {parallel} worker(s)...")
+    if processes > 1:
+        click.echo(f"Processing {len(files_to_process)} files with {processes} process(es)...")
+    else:
+        click.echo(f"Processing {len(files_to_process)} files with {parallel} worker(s)...")
 
     completed = 0
+    skipped = 0
     failed = 0
     results = []
 
@@ -138,7 +176,26 @@ def batch(
             return (pdf_file, None, str(e))
 
     with click.progressbar(length=len(files_to_process), label="Processing") as bar:
-        if parallel > 1:
+        if processes > 1:
+            batch_results = DocumentProcessor.process_many(
+                files_to_process,
+                config=config,
+                skip_ocr=skip_ocr,
+                skip_archive=skip_archive,
+                workers=processes,
+            )
+            for pdf_file, result in zip(files_to_process, batch_results):
+                if result.status.value == "completed":
+                    completed += 1
+                    results.append((pdf_file.name, "completed", result.tagging.title if result.tagging else ""))
+                elif result.status.value == "skipped":
+                    skipped += 1
+                    results.append((pdf_file.name, "skipped", f"already archived as {result.archive_path}"))
+                else:
+                    failed += 1
+                    results.append((pdf_file.name, "failed", result.error or "Unknown error"))
+                bar.update(1)
+        elif parallel > 1:
             with concurrent.futures.ThreadPoolExecutor(max_workers=parallel) as executor:
                 futures = {executor.submit(process_file, f): f for f in files_to_process}
                 for future in concurrent.futures.as_completed(futures):
@@ -149,6 +206,9 @@ def batch(
                     elif result and result.status.value == "completed":
                         completed += 1
                         results.append((pdf_file.name, "completed", result.tagging.title if result.tagging else ""))
+                    elif result and result.status.value == "skipped":
+                        skipped += 1
+                        results.append((pdf_file.name, "skipped", f"already archived as {result.archive_path}"))
                     else:
                         failed += 1
                         results.append((pdf_file.name, "failed", result.error if result else "Unknown error"))
@@ -162,6 +222,9 @@ def batch(
                 elif result and result.status.value == "completed":
                     completed += 1
                     results.append((pdf_file.name, "completed", result.tagging.title if result.tagging else ""))
+                elif result and result.status.value == "skipped":
+                    skipped += 1
+                    results.append((pdf_file.name, "skipped", f"already archived as {result.archive_path}"))
                 else:
                     failed += 1
                     results.append((pdf_file.name, "failed", result.error if result else "Unknown error"))
@@ -171,6 +234,8 @@ def batch(
     click.echo(f"\n{'='*50}")
     click.echo(f"Batch processing complete:")
     click.echo(click.style(f"  ✓ Completed: {completed}", fg="green"))
+    if skipped > 0:
+        click.echo(click.style(f"  ↷ Skipped (duplicates): {skipped}", fg="yellow"))
     if failed > 0:
         click.echo(click.style(f"  ✗ Failed: {failed}", fg="red"))
 
@@ -179,6 +244,8 @@ def batch(
         for filename, status, info in results:
             if status == "completed":
                 click.echo(f"  ✓ {filename}: {info}")
+            elif status == "skipped":
+                click.echo(click.style(f"  ↷ {filename}: {info}", fg="yellow"))
             else:
                 click.echo(click.style(f"  ✗ {filename}: {info}", fg="red"))
 
@@ -215,6 +282,7 @@ def watch(
     set_config(config)
 
     watcher = FolderWatcher(config)
+    watcher.processor.preload_embedder()
 
     click.echo(f"Watching folder: {config.inbox_folder}")
     click.echo(f"Archive folder: {config.archive_folder}")
@@ -245,30 +313,33 @@ def status(ctx: click.Context) -> None:
     config = ctx.obj["config"]
     processor = DocumentProcessor(config)
 
-    click.echo("DocTagger Status\n")
-
     # Check system
     system_status = processor.check_system()
 
+    # Buffer output so the report is written in a single call
+    lines = ["DocTagger Status\n"]
+
     # LLM
     provider = system_status.get("llm_provider", "unknown")
     if system_status["llm_available"]:
-        click.echo(click.style(f"✓ LLM available ({provider})", fg="green"))
-        click.echo(f"  Model: {system_status['llm_model']}")
+        lines.append(click.style(f"✓ LLM available ({provider})", fg="green"))
+        lines.append(f"  Model: {system_status['llm_model']}")
     else:
-        click.echo(click.style(f"✗ LLM not available ({provider})", fg="red"))
+        lines.append(click.style(f"✗ LLM not available ({provider})", fg="red"))
         if provider == "ollama":
-            click.echo("  Make sure Ollama is running: ollama serve")
+            lines.append("  Make sure Ollama is running: ollama serve")
         else:
-            click.echo("  Make sure LM Studio is running with the server enabled")
+            lines.append("  Make sure LM Studio is running with the server enabled")
 
     # Folders
-    click.echo(f"\nInbox folder: {system_status['inbox_folder']}")
-    click.echo(f"Archive folder: {system_status['archive_folder']}")
+    lines.append(f"\nInbox folder: {system_status['inbox_folder']}")
+    lines.append(f"Archive folder: {system_status['archive_folder']}")
 
     # Features
-    click.echo(f"\nOCR enabled: {system_status['ocr_enabled']}")
-    click.echo(f"macOS tags enabled: {system_status['macos_tags_enabled']}")
+    lines.append(f"\nOCR enabled: {system_status['ocr_enabled']}")
+    lines.append(f"macOS tags enabled: {system_status['macos_tags_enabled']}")
+
+    click.echo("\n".join(lines))
 
 
 @cli.command()
@@ -305,11 +376,17 @@ def config(
 
     if not any([inbox, archive, ollama_url, ollama_model]):
         # Show current config
-        click.echo("Current Configuration:\n")
-        click.echo(f"Inbox folder: {cfg.inbox_folder}")
-        click.echo(f"Archive folder: {cfg.archive_folder}")
-        click.echo(f"Ollama URL: {cfg.ollama.url}")
-        click.echo(f"Ollama model: {cfg.ollama.model}")
+        click.echo(
+            "\n".join(
+                [
+                    "Current Configuration:\n",
+                    f"Inbox folder: {cfg.inbox_folder}",
+                    f"Archive folder: {cfg.archive_folder}",
+                    f"Ollama URL: {cfg.ollama.url}",
+                    f"Ollama model: {cfg.ollama.model}",
+                ]
+            )
+        )
 
 
 def main() -> None:
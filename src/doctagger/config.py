@@ -2,8 +2,9 @@
 
 import os
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional, Tuple
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -35,6 +36,16 @@ class LLMSettings(BaseSettings):
     timeout: int = Field(default=60, alias="timeout", description="Request timeout in seconds")
     temperature: float = Field(default=0.1, alias="temperature", description="Temperature for generation")
     max_tokens: int = Field(default=500, alias="max_tokens", description="Maximum tokens in response")
+    use_batch_api: bool = Field(
+        default=False,
+        description="Allow submitting backlogs through the OpenAI Batch API "
+        "(half price, results within 24h)",
+    )
+    structured_output: Literal["off", "json", "schema"] = Field(
+        default="off",
+        description="Constrain the server's output: 'json' for any JSON object, 'schema' to "
+        "decode against the TaggingResult JSON schema; use only if the server supports it",
+    )
 
     # Ollama-specific
     ollama_url: str = Field(
@@ -68,6 +79,26 @@ class LLMSettings(BaseSettings):
         default=150,
         description="DPI for rendering PDF pages to images (higher = better quality but slower)",
     )
+    vision_jpeg_quality: int = Field(
+        default=80,
+        ge=1,
+        le=100,
+        description="JPEG quality for page images sent to vision models (lower = smaller payload)",
+    )
+    vision_detail: Literal["auto", "low", "high"] = Field(
+        default="auto",
+        description="Image detail for vision requests: 'low' is enough for short receipts, "
+        "'high' makes the server tile each page and costs several times more image tokens",
+    )
+    vision_workers: int = Field(
+        default=1,
+        description="Worker processes for rendering PDF pages to images (1 = render in-process)",
+    )
+    max_concurrent_requests: int = Field(
+        default=8,
+        ge=1,
+        description="Maximum in-flight LLM requests when tagging several documents at once",
+    )
 
     model_config = SettingsConfigDict(
         env_prefix="LLM_",
@@ -97,8 +128,28 @@ class OCRSettings(BaseSettings):
     skip_if_exists: bool = Field(
         default=True, description="Skip OCR if text already exists"
     )
+    skip_text_threshold: int = Field(
+        default=50,
+        ge=0,
+        description="Characters one of the first pages must have for the PDF to count as having text",
+    )
     deskew: bool = Field(default=True, description="Deskew pages")
     force_ocr: bool = Field(default=False, description="Force OCR even if text exists")
+    jobs: Optional[int] = Field(
+        default=None, ge=1, description="CPU cores each OCR run may use (None = all cores)"
+    )
+    workers: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description=(
+            "Long-lived ocrmypdf worker processes shared by all documents "
+            "(None = half the CPU cores, 0 = start the ocrmypdf CLI per document)"
+        ),
+    )
+    in_memory: bool = Field(
+        default=True,
+        description="Pass OCR output to extraction in memory (False keeps a temp file for debugging)",
+    )
 
     model_config = SettingsConfigDict(env_prefix="OCR_")
 
@@ -111,10 +162,30 @@ class EmbeddingSettings(BaseSettings):
         default="all-MiniLM-L6-v2",
         description="Sentence-transformers model for embeddings"
     )
+    quantization: Literal["fp32", "fp16", "bf16", "int8"] = Field(
+        default="fp32",
+        description=(
+            "Embedding model precision (fp16 needs CUDA, bf16 needs CUDA or "
+            "AVX512-BF16, int8 uses the quantized ONNX export or dynamic "
+            "quantization on CPU)"
+        ),
+    )
+    cache_folder: Optional[Path] = Field(
+        default=None,
+        description="Local folder for downloaded model files (defaults to the Hugging Face cache)"
+    )
     max_chars: int = Field(
         default=8000,
         description="Maximum characters to use for embedding"
     )
+    batch_size: int = Field(
+        default=32,
+        description="Number of chunks to encode per model forward pass"
+    )
+    cache_size: int = Field(
+        default=4096,
+        description="Number of embeddings kept in the in-memory cache (0 disables it)"
+    )
     include_metadata: bool = Field(
         default=True,
         description="Include title/entities/tags in embedding context"
@@ -161,6 +232,30 @@ class MacOSTagsSettings(BaseSettings):
     model_config = SettingsConfigDict(env_prefix="MACOS_TAGS_")
 
 
+def _env_snapshot() -> Tuple[Any, ...]:
+    """Capture the inputs settings are parsed from: the environment and .env."""
+    try:
+        env_file_mtime = os.stat(".env").st_mtime_ns
+    except OSError:
+        env_file_mtime = None
+    return tuple(sorted(os.environ.items())), os.getcwd(), env_file_mtime
+
+
+@lru_cache(maxsize=32)
+def _load_settings(settings_cls: type, env: Tuple[Any, ...]) -> BaseSettings:
+    """Parse a settings class once per snapshot of its environment."""
+    return settings_cls()
+
+
+def _settings_factory(settings_cls: type):
+    """Build a default factory that copies the cached settings instance.
+
+    Each Config still gets its own (mutable) copy, but the environment and
+    .env file are only parsed again when they have changed.
+    """
+    return lambda: _load_settings(settings_cls, _env_snapshot()).model_copy(deep=True)
+
+
 class Config(BaseSettings):
     """Main configuration for DocTagger."""
 
@@ -176,12 +271,12 @@ class Config(BaseSettings):
     )
 
     # Sub-configurations
-    llm: LLMSettings = Field(default_factory=LLMSettings)
-    ollama: OllamaSettings = Field(default_factory=OllamaSettings)  # Deprecated
-    ocr: OCRSettings = Field(default_factory=OCRSettings)
-    embedding: EmbeddingSettings = Field(default_factory=EmbeddingSettings)
-    tags: TagsSettings = Field(default_factory=TagsSettings)
-    macos_tags: MacOSTagsSettings = Field(default_factory=MacOSTagsSettings)
+    llm: LLMSettings = Field(default_factory=_settings_factory(LLMSettings))
+    ollama: OllamaSettings = Field(default_factory=_settings_factory(OllamaSettings))  # Deprecated
+    ocr: OCRSettings = Field(default_factory=_settings_factory(OCRSettings))
+    embedding: EmbeddingSettings = Field(default_factory=_settings_factory(EmbeddingSettings))
+    tags: TagsSettings = Field(default_factory=_settings_factory(TagsSettings))
+    macos_tags: MacOSTagsSettings = Field(default_factory=_settings_factory(MacOSTagsSettings))
 
     # Processing settings
     archive_structure: str = Field(
@@ -195,6 +290,27 @@ class Config(BaseSettings):
         default=r"[^a-zA-Z0-9\-_\.]",
         description="Pattern for unsafe filename characters",
     )
+    batch_workers: int = Field(
+        default=4, description="Documents processed concurrently within a batch"
+    )
+    watch_batch_window_ms: int = Field(
+        default=500,
+        description="Time the watcher waits to coalesce new files into one batch",
+    )
+    watch_max_batch: int = Field(
+        default=16, description="Maximum number of files the watcher processes as one batch"
+    )
+    cache_enabled: bool = Field(
+        default=True,
+        description="Cache extracted text and LLM results for unchanged documents",
+    )
+    cache_folder: Optional[Path] = Field(
+        default=None, description="Result cache folder (defaults to <temp_folder>/cache)"
+    )
+    cache_ttl_hours: Optional[float] = Field(
+        default=None,
+        description="Re-tag documents whose cached LLM result is older than this (None = never)",
+    )
 
     # Server settings
     server_host: str = Field(default="0.0.0.0", description="API server host")
@@ -218,9 +334,14 @@ class Config(BaseSettings):
     def __init__(self, **kwargs: Any):
         """Initialize config and create necessary directories."""
         super().__init__(**kwargs)
-        self.inbox_folder.mkdir(parents=True, exist_ok=True)
-        self.archive_folder.mkdir(parents=True, exist_ok=True)
-        self.temp_folder.mkdir(parents=True, exist_ok=True)
+        for folder in (self.inbox_folder, self.archive_folder, self.temp_folder):
+            # One mkdir syscall in the common case; walk parents only when missing
+            try:
+                os.mkdir(folder)
+            except FileExistsError:
+                pass
+            except FileNotFoundError:
+                folder.mkdir(parents=True, exist_ok=True)
 
     @classmethod
     def load(cls, config_file: Optional[Path] = None) -> "Config":
@@ -1,6 +1,12 @@
 """Document embedding generation for RAG and semantic search."""
 
+import array
+import hashlib
 import logging
+import sys
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
 from typing import List, Optional
 
 from .config import Config, get_config
@@ -27,6 +33,12 @@ def _get_sentence_transformer():
     return _SentenceTransformer
 
 
+# Pre-exported ONNX weights published alongside sentence-transformers models
+_ONNX_FILES = {
+    "int8": "onnx/model_qint8_avx512_vnni.onnx",
+}
+
+
 class DocumentEmbedder:
     """Generates embeddings for document text using local models.
     
@@ -36,48 +48,158 @@ class DocumentEmbedder:
     """
 
     # Popular embedding models with their dimensions
-    MODELS = {
+    MODELS = MappingProxyType({
         "all-MiniLM-L6-v2": 384,           # Fast, good quality, small
         "all-mpnet-base-v2": 768,          # Better quality, slower
         "paraphrase-MiniLM-L6-v2": 384,    # Good for paraphrase detection
         "multi-qa-MiniLM-L6-cos-v1": 384,  # Optimized for Q&A
-    }
+    })
 
     def __init__(
         self,
         config: Optional[Config] = None,
         model_name: str = "all-MiniLM-L6-v2",
+        quantization: Optional[str] = None,
     ):
         """Initialize the embedder.
         
         Args:
             config: DocTagger configuration
             model_name: Name of the sentence-transformers model to use
+            quantization: Weight precision ("fp32", "fp16", "bf16" or "int8");
+                defaults to the configured value
         """
         self.config = config or get_config()
         self.model_name = model_name
+        self._dimensions = self.MODELS.get(model_name, 384)
+        self.quantization = quantization or self.config.embedding.quantization
         self._model = None
+        self._model_lock = threading.Lock()
         self._enabled = True
+        # Exact-match LRU cache: blake2b digest of the encoded text -> vector
+        self._cache: "OrderedDict[bytes, object]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        """Pickle without the model, locks or cache (torch-free transport).
+
+        Worker processes receive a lightweight embedder and load the model
+        lazily from the local model cache; forked workers that inherit an
+        already-loaded parent share its weights copy-on-write instead.
+        """
+        state = self.__dict__.copy()
+        state["_model"] = None
+        state["_enabled"] = True
+        del state["_model_lock"]
+        del state["_cache_lock"]
+        state["_cache"] = OrderedDict()
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore a pickled embedder with fresh locks."""
+        self.__dict__.update(state)
+        self._model_lock = threading.Lock()
+        self._cache_lock = threading.Lock()
 
     @property
     def model(self):
-        """Lazy load the embedding model."""
+        """Lazy load the embedding model (safe to call from several threads)."""
         if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    try:
+                        logger.info(
+                            f"Loading embedding model: {self.model_name} ({self.quantization})"
+                        )
+                        self._model = self._load_model()
+                        logger.info(f"Embedding model loaded: {self.model_name}")
+                    except Exception as e:
+                        logger.warning(f"Failed to load embedding model: {e}")
+                        self._enabled = False
+                        raise
+        return self._model
+
+    def load(self) -> None:
+        """Load the embedding model now rather than on first use."""
+        _ = self.model
+
+    def _load_model(self):
+        """Load the model at the configured precision, falling back to fp32.
+
+        int8 prefers the model's pre-quantized ONNX export and otherwise
+        quantizes the torch model's Linear layers dynamically.
+        """
+        onnx_file = _ONNX_FILES.get(self.quantization)
+        if onnx_file:
             try:
-                SentenceTransformer = _get_sentence_transformer()
-                logger.info(f"Loading embedding model: {self.model_name}")
-                self._model = SentenceTransformer(self.model_name)
-                logger.info(f"Embedding model loaded: {self.model_name}")
+                return self._from_pretrained(
+                    backend="onnx",
+                    model_kwargs={"file_name": onnx_file},
+                )
             except Exception as e:
-                logger.warning(f"Failed to load embedding model: {e}")
-                self._enabled = False
-                raise
-        return self._model
+                logger.warning(f"Quantized {self.quantization} ONNX model unavailable: {e}")
+
+        model = self._from_pretrained()
+        if self.quantization in ("fp16", "bf16"):
+            model = self._cast_model(model)
+        elif self.quantization == "int8":
+            model = self._quantize_dynamic(model)
+        return model
+
+    def _quantize_dynamic(self, model):
+        """Quantize Linear weights to int8 with torch dynamic quantization (CPU only)."""
+        import torch
+
+        if model.device.type != "cpu":
+            logger.warning("int8 dynamic quantization runs on CPU only, using fp32")
+            return model
+        try:
+            # In place, so the fp32 weights are not held twice while converting
+            return torch.ao.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+            )
+        except Exception as e:
+            logger.warning(f"int8 dynamic quantization failed, using fp32: {e}")
+            return model
+
+    def _from_pretrained(self, **kwargs):
+        """Instantiate the model, preferring files already in the local cache.
+
+        Loading with local_files_only skips the Hugging Face Hub round-trips
+        made on every cold start; the hub is only contacted when the model
+        has not been downloaded yet.
+        """
+        SentenceTransformer = _get_sentence_transformer()
+        cache_folder = self.config.embedding.cache_folder
+        if cache_folder is not None:
+            kwargs["cache_folder"] = str(cache_folder)
+
+        try:
+            return SentenceTransformer(self.model_name, local_files_only=True, **kwargs)
+        except Exception as e:
+            logger.debug(f"Model not in local cache, downloading: {e}")
+            return SentenceTransformer(self.model_name, **kwargs)
+
+    def _cast_model(self, model):
+        """Cast torch weights to half precision where the hardware supports it."""
+        import torch
+
+        if self.quantization == "fp16":
+            if torch.cuda.is_available():
+                return model.half()
+            logger.warning("fp16 embeddings require a CUDA device, using fp32")
+            return model
+
+        bf16_supported = getattr(torch.cpu, "_is_avx512_bf16_supported", lambda: False)
+        if torch.cuda.is_available() or bf16_supported():
+            return model.to(dtype=torch.bfloat16)
+        logger.warning("bf16 embeddings are not supported on this CPU, using fp32")
+        return model
 
     @property
     def dimensions(self) -> int:
         """Get the embedding dimensions for the current model."""
-        return self.MODELS.get(self.model_name, 384)
+        return self._dimensions
 
     @property
     def enabled(self) -> bool:
@@ -89,7 +211,8 @@ class DocumentEmbedder:
         
         Args:
             text: The text to embed
-            max_chars: Maximum characters to use (models have token limits)
+            max_chars: Maximum characters to tokenize (the text is then cut at
+                the model's token limit)
             
         Returns:
             List of floats representing the embedding, or None if failed
@@ -98,66 +221,164 @@ class DocumentEmbedder:
             return None
 
         try:
-            # Truncate text if too long (most models have ~512 token limit)
-            truncated = text[:max_chars] if len(text) > max_chars else text
-            
-            # Generate embedding
-            embedding = self.model.encode(
-                truncated,
-                convert_to_numpy=True,
-                show_progress_bar=False,
-            )
-            
             # Convert to list of floats for JSON serialization
-            return embedding.tolist()
+            return self._encode(text, max_chars).tolist()
+        except Exception as e:
+            logger.error(f"Failed to generate embedding: {e}")
+            return None
+
+    def embed_text_bytes(self, text: str, max_chars: int = 8000) -> Optional[bytes]:
+        """Generate embedding as packed little-endian float32 bytes.
+        
+        Faster and ~7x smaller than embed_text for storage or IPC, since no
+        Python float objects are created. Decode with decode_embedding().
+        
+        Args:
+            text: The text to embed
+            max_chars: Maximum characters to tokenize
             
+        Returns:
+            Raw embedding bytes (dimensions * 4), or None if failed
+        """
+        if not self._enabled:
+            return None
+
+        try:
+            return self._encode(text, max_chars).astype("<f4", copy=False).tobytes()
         except Exception as e:
             logger.error(f"Failed to generate embedding: {e}")
             return None
 
+    def _encode(self, text: str, max_chars: int):
+        """Encode text to a float32 numpy vector, using the cache when possible."""
+        truncated = text[:max_chars] if len(text) > max_chars else text
+
+        # Look up before tokenizing, so cache hits never run the tokenizer
+        # (or load the model)
+        key = hashlib.blake2b(truncated.encode("utf-8"), digest_size=16).digest()
+        with self._cache_lock:
+            embedding = self._cache.get(key)
+            if embedding is not None:
+                self._cache.move_to_end(key)
+                return embedding
+
+        # Generate embedding, cut at the model's token limit
+        embedding = self.model.encode(
+            self._truncate_to_tokens(truncated),
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+        # Half-precision models return fp16 arrays; store a stable fp32 copy
+        embedding = embedding.astype("float32", copy=False)
+        self._cache_put(key, embedding)
+        return embedding
+
+    def _truncate_to_tokens(self, text: str) -> str:
+        """Cut text at the last character the model can actually see.
+
+        Sentence-transformers silently drops tokens beyond max_seq_length, so
+        trimming here keeps the model input limited to embedded content.
+        """
+        tokenizer = getattr(self.model, "tokenizer", None)
+        max_tokens = getattr(self.model, "max_seq_length", None)
+        if tokenizer is None or not max_tokens:
+            return text
+
+        try:
+            # Leave room for the [CLS]/[SEP] special tokens
+            offsets = tokenizer(
+                text,
+                add_special_tokens=False,
+                truncation=True,
+                max_length=max_tokens - 2,
+                return_offsets_mapping=True,
+            )["offset_mapping"]
+        except Exception as e:
+            logger.debug(f"Token-aware truncation unavailable: {e}")
+            return text
+
+        if len(offsets) < max_tokens - 2:
+            return text
+        return text[: offsets[-1][1]]
+
+    def _cache_put(self, key: bytes, embedding) -> None:
+        """Store an embedding, evicting the least recently used entries."""
+        cache_size = self.config.embedding.cache_size
+        if cache_size <= 0:
+            return
+        with self._cache_lock:
+            self._cache[key] = embedding
+            self._cache.move_to_end(key)
+            while len(self._cache) > cache_size:
+                self._cache.popitem(last=False)
+
     def embed_chunks(
         self,
         text: str,
         chunk_size: int = 1000,
         overlap: int = 200,
+        batch_size: Optional[int] = None,
     ) -> List[dict]:
         """Generate embeddings for text chunks (for long documents).
         
         This is useful for RAG where you want to embed and retrieve
-        specific sections of a document.
+        specific sections of a document. All chunks are encoded in a
+        single batched call to the model.
         
         Args:
             text: The full document text
             chunk_size: Size of each chunk in characters
             overlap: Overlap between chunks
+            batch_size: Encoding batch size (defaults to config value)
             
         Returns:
             List of dicts with 'text', 'start', 'end', 'embedding' keys
+
+        Raises:
+            ValueError: If overlap is not smaller than chunk_size
         """
-        if not self._enabled:
+        if chunk_size <= 0 or not 0 <= overlap < chunk_size:
+            raise ValueError(
+                f"Invalid chunking: chunk_size={chunk_size}, overlap={overlap} "
+                "(overlap must be smaller than chunk_size)"
+            )
+
+        if not self._enabled or not text:
             return []
 
-        chunks = []
-        start = 0
-        
-        while start < len(text):
-            end = min(start + chunk_size, len(text))
-            chunk_text = text[start:end]
-            
-            embedding = self.embed_text(chunk_text)
-            if embedding:
-                chunks.append({
-                    "text": chunk_text,
-                    "start": start,
-                    "end": end,
-                    "embedding": embedding,
-                })
-            
-            start += chunk_size - overlap
-            if start >= len(text):
+        text_len = len(text)
+        spans = []
+        for start in range(0, text_len, chunk_size - overlap):
+            end = min(start + chunk_size, text_len)
+            spans.append((start, end))
+            # A chunk that reaches the end already covers any later start
+            if end == text_len:
                 break
-                
-        return chunks
+
+        texts = [text[start:end] for start, end in spans]
+        if batch_size is None:
+            batch_size = self.config.embedding.batch_size
+
+        try:
+            embeddings = self.model.encode(
+                texts,
+                batch_size=min(batch_size, len(texts)),
+                convert_to_numpy=True,
+                show_progress_bar=False,
+            ).astype("float32", copy=False)
+        except Exception as e:
+            logger.error(f"Failed to generate chunk embeddings: {e}")
+            return []
+
+        return [
+            {
+                "text": chunk_text,
+                "start": start,
+                "end": end,
+                "embedding": embedding.tolist(),
+            }
+            for chunk_text, (start, end), embedding in zip(texts, spans, embeddings)
+        ]
 
     def embed_with_metadata(
         self,
@@ -165,6 +386,7 @@ class DocumentEmbedder:
         title: Optional[str] = None,
         entities: Optional[List[str]] = None,
         tags: Optional[List[str]] = None,
+        max_chars: int = 8000,
     ) -> Optional[List[float]]:
         """Generate embedding with enriched context.
         
@@ -176,6 +398,7 @@ class DocumentEmbedder:
             title: Document title
             entities: List of entities mentioned
             tags: List of tags
+            max_chars: Maximum characters to use, including the metadata prefix
             
         Returns:
             Embedding vector or None
@@ -190,12 +413,21 @@ class DocumentEmbedder:
         if tags:
             parts.append(f"Tags: {', '.join(tags[:10])}")
         
-        if parts:
-            enriched_text = "\n".join(parts) + "\n\n" + text
-        else:
-            enriched_text = text
-            
-        return self.embed_text(enriched_text)
+        if not parts:
+            return self.embed_text(text, max_chars=max_chars)
+
+        prefix = "\n".join(parts) + "\n\n"
+        # Only copy the part of the document that survives truncation
+        enriched_text = prefix + text[: max(max_chars - len(prefix), 0)]
+        return self.embed_text(enriched_text, max_chars=max_chars)
+
+
+def decode_embedding(data: bytes) -> List[float]:
+    """Decode bytes produced by DocumentEmbedder.embed_text_bytes."""
+    values = array.array("f", data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tolist()
 
 
 # Global embedder instance (lazy loaded)
@@ -1,32 +1,138 @@
-"""Text extraction from PDF files."""
+"""Text extraction from PDF files (PDFium via pypdfium2)."""
 
+import hashlib
+import io
 import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, List, Optional, Union
 
-import pdfplumber
+import pypdfium2 as pdfium
+
+from .cache import ResultCache, make_cache_key
+from .utils import calculate_file_hash
 
 logger = logging.getLogger(__name__)
 
+# PDFium extracts a page in well under a millisecond, so below this many pages
+# shipping the PDF to the workers costs more than parallel extraction saves
+PARALLEL_MIN_PAGES = 64
+
+# PDFium is not thread-safe, so every use of it within a process (opening,
+# reading and closing documents) holds this lock. Page-range workers are
+# separate processes and extract in parallel regardless.
+PDFIUM_LOCK = threading.Lock()
+
+# Result keys and the PDF document-info entries they are read from
+_METADATA_KEYS = (
+    ("title", "Title"),
+    ("author", "Author"),
+    ("subject", "Subject"),
+    ("keywords", "Keywords"),
+    ("creator", "Creator"),
+    ("producer", "Producer"),
+    ("creation_date", "CreationDate"),
+    ("modification_date", "ModDate"),
+)
+
+
+def _page_text(pdf: pdfium.PdfDocument, page_index: int) -> str:
+    """Extract the plain text of a single page (no layout analysis)."""
+    page = pdf[page_index]
+    try:
+        textpage = page.get_textpage()
+        try:
+            # PDFium separates lines with CRLF
+            return textpage.get_text_range().replace("\r\n", "\n")
+        finally:
+            textpage.close()
+    finally:
+        page.close()
+
+
+def _extract_pages(pdf: pdfium.PdfDocument, start: int, end: int) -> Iterator[str]:
+    """Yield non-empty page texts from pages [start, end) of an open PDF."""
+    for page_num in range(start + 1, end + 1):
+        try:
+            page_text = _page_text(pdf, page_num - 1)
+        except Exception as e:
+            logger.warning(f"Failed to extract text from page {page_num}: {e}")
+            continue
+        if page_text and not page_text.isspace():
+            logger.debug(f"Extracted {len(page_text)} chars from page {page_num}")
+            yield page_text
+
+
+def _write_pages(buf: io.StringIO, page_texts: Iterable[str]) -> None:
+    """Append page texts to buf, separated by blank lines."""
+    for page_text in page_texts:
+        if buf.tell():
+            buf.write("\n\n")
+        buf.write(page_text)
+
+
+def _pdf_name(pdf: Union[Path, bytes]) -> str:
+    """Name of a PDF for log messages."""
+    return pdf.name if isinstance(pdf, Path) else "in-memory PDF"
+
+
+def _extract_page_range(pdf_path: Union[Path, bytes], start: int, end: int) -> List[str]:
+    """
+    Extract text from pages [start, end) of a PDF in a worker process.
+
+    The PDF is reopened here because PDFium documents cannot be pickled.
+    """
+    with PDFIUM_LOCK, pdfium.PdfDocument(pdf_path) as pdf:
+        return list(_extract_pages(pdf, start, end))
+
 
 class TextExtractor:
     """Extracts text from PDF files."""
 
-    def __init__(self, max_pages: Optional[int] = None):
+    def __init__(
+        self,
+        max_pages: Optional[int] = None,
+        workers: int = 1,
+        cache: Optional[ResultCache] = None,
+    ):
         """
         Initialize text extractor.
 
         Args:
             max_pages: Maximum number of pages to extract (None for all)
+            workers: Worker processes for long documents (1 to always
+                extract in-process)
+            cache: Optional cache of previously extracted text
         """
         self.max_pages = max_pages
+        self.workers = workers
+        self.cache = cache
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
 
-    def extract(self, pdf_path: Path) -> str:
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        """Lazy-load the page extraction pool, reused across documents."""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def close(self) -> None:
+        """Shut down the page extraction pool, if one was started."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def extract(self, pdf_path: Union[Path, bytes]) -> str:
         """
         Extract text from a PDF file.
 
         Args:
-            pdf_path: Path to the PDF file
+            pdf_path: Path to the PDF file, or the PDF's content (e.g. OCR
+                output that was never written to disk)
 
         Returns:
             Extracted text
@@ -34,13 +140,31 @@ class TextExtractor:
         Raises:
             RuntimeError: If extraction fails
         """
-        logger.info(f"Extracting text from {pdf_path.name}")
+        name = _pdf_name(pdf_path)
+        logger.info(f"Extracting text from {name}")
 
-        try:
-            text_parts = []
+        cache_key = None
+        if self.cache is not None:
+            try:
+                if isinstance(pdf_path, Path):
+                    content_hash = calculate_file_hash(pdf_path)
+                else:
+                    content_hash = hashlib.sha256(pdf_path).hexdigest()
+                cache_key = make_cache_key("text", content_hash, str(self.max_pages))
+            except Exception as e:
+                logger.warning(f"Failed to hash {name} for the text cache: {e}")
+            else:
+                cached = self.cache.get_text(cache_key)
+                if cached is not None:
+                    logger.info(f"Using cached text for {name}")
+                    return cached
 
-            with pdfplumber.open(pdf_path) as pdf:
-                total_pages = len(pdf.pages)
+        try:
+            # Pages are written into one buffer as they are extracted, so the
+            # per-page strings can be freed instead of held until a final join
+            buf = io.StringIO()
+            with PDFIUM_LOCK, pdfium.PdfDocument(pdf_path) as pdf:
+                total_pages = len(pdf)
                 pages_to_process = (
                     min(total_pages, self.max_pages)
                     if self.max_pages
@@ -51,27 +175,24 @@ class TextExtractor:
                     f"Processing {pages_to_process} of {total_pages} pages"
                 )
 
-                for page_num, page in enumerate(pdf.pages[:pages_to_process], 1):
-                    try:
-                        page_text = page.extract_text()
-                        if page_text:
-                            text_parts.append(page_text)
-                            logger.debug(
-                                f"Extracted {len(page_text)} chars from page {page_num}"
-                            )
-                    except Exception as e:
-                        logger.warning(f"Failed to extract text from page {page_num}: {e}")
-                        continue
-
-            full_text = "\n\n".join(text_parts)
-
-            if not full_text.strip():
-                logger.warning(f"No text extracted from {pdf_path.name}")
+                parallel = self.workers > 1 and pages_to_process >= PARALLEL_MIN_PAGES
+                if not parallel:
+                    _write_pages(buf, _extract_pages(pdf, 0, pages_to_process))
+
+            if parallel:
+                self._extract_parallel(pdf_path, pages_to_process, buf)
+
+            full_text = buf.getvalue()
+
+            if not full_text or full_text.isspace():
+                logger.warning(f"No text extracted from {name}")
                 return ""
 
             logger.info(
-                f"Successfully extracted {len(full_text)} characters from {pdf_path.name}"
+                f"Successfully extracted {len(full_text)} characters from {name}"
             )
+            if cache_key is not None:
+                self.cache.put_text(cache_key, full_text)
             return full_text
 
         except Exception as e:
@@ -79,6 +200,38 @@ class TextExtractor:
             logger.error(error_msg)
             raise RuntimeError(error_msg)
 
+    def _extract_parallel(
+        self, pdf_path: Union[Path, bytes], pages_to_process: int, buf: io.StringIO
+    ) -> None:
+        """
+        Extract pages in a process pool, split into page ranges.
+
+        Ranges are sized so each worker gets about two of them, which evens
+        out pages that take much longer than others.
+
+        Args:
+            pdf_path: Path to the PDF file, or its content
+            pages_to_process: Number of leading pages to extract
+            buf: Buffer that non-empty page texts are written to, in page order
+        """
+        workers = min(self.workers, pages_to_process)
+        chunk_size = max(1, pages_to_process // (workers * 2))
+        starts = range(0, pages_to_process, chunk_size)
+
+        logger.debug(f"Extracting {pages_to_process} pages with {workers} workers")
+
+        futures = [
+            self.pool.submit(
+                _extract_page_range,
+                pdf_path,
+                start,
+                min(start + chunk_size, pages_to_process),
+            )
+            for start in starts
+        ]
+        for future in futures:
+            _write_pages(buf, future.result())
+
     def extract_metadata(self, pdf_path: Path) -> dict:
         """
         Extract PDF metadata.
@@ -93,19 +246,12 @@ class TextExtractor:
             RuntimeError: If metadata extraction fails
         """
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                metadata = pdf.metadata or {}
-                return {
-                    "title": metadata.get("Title"),
-                    "author": metadata.get("Author"),
-                    "subject": metadata.get("Subject"),
-                    "keywords": metadata.get("Keywords"),
-                    "creator": metadata.get("Creator"),
-                    "producer": metadata.get("Producer"),
-                    "creation_date": metadata.get("CreationDate"),
-                    "modification_date": metadata.get("ModDate"),
-                    "page_count": len(pdf.pages),
-                }
+            with PDFIUM_LOCK, pdfium.PdfDocument(pdf_path) as pdf:
+                info = pdf.get_metadata_dict()
+                # PDFium reports missing entries as empty strings
+                metadata = {key: info.get(pdf_key) or None for key, pdf_key in _METADATA_KEYS}
+                metadata["page_count"] = len(pdf)
+                return metadata
         except Exception as e:
             error_msg = f"Metadata extraction failed: {e}"
             logger.error(error_msg)
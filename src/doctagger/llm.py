@@ -1,35 +1,174 @@
 """LLM integration supporting Ollama and OpenAI-compatible APIs (LM Studio, vLLM, etc.)."""
 
+import asyncio
 import base64
-import io
+import importlib.util
 import json
 import logging
+import re
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple, Union
 
+import httpx
 import ollama
-from openai import OpenAI
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+from pydantic import ValidationError
 
+from .cache import ResultCache, make_cache_key
 from .config import Config, LLMProvider, get_config
 from .models import TaggingResult
+from .utils import calculate_file_hash
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; stdlib json is used otherwise
+    orjson = None
+
+# httpx speaks HTTP/2 when h2 is installed; connections stay on HTTP/1.1 otherwise
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
 
 logger = logging.getLogger(__name__)
 
+# Trailing commas before } or ], a common LLM JSON mistake
+_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+
+_JPEG_DATA_URL_PREFIX = "data:image/jpeg;base64,"
+
+# Parses Batch API output files, one JSON record per line (orjson is much
+# faster on large files). orjson.JSONDecodeError subclasses
+# json.JSONDecodeError, so catching ValueError covers both.
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# custom_id of a batch output line that is not valid JSON
+_CUSTOM_ID_RE = re.compile(r'"custom_id"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+_JSON_DECODER = json.JSONDecoder()
+
+# Constrained-output request arguments per llm.structured_output mode
+_TAGGING_SCHEMA = TaggingResult.model_json_schema()
+_OPENAI_RESPONSE_FORMATS = {
+    "off": {"type": "text"},
+    "json": {"type": "json_object"},
+    "schema": {
+        "type": "json_schema",
+        "json_schema": {"name": "TaggingResult", "schema": _TAGGING_SCHEMA},
+    },
+}
+_OLLAMA_FORMATS = {"json": "json", "schema": _TAGGING_SCHEMA}
+
+# Provider dispatch tables (LLMTagger method names, so subclasses can override them)
+_PROVIDER_CALLS = {
+    LLMProvider.OLLAMA: "_call_ollama",
+    LLMProvider.OPENAI: "_call_openai",
+}
+_ASYNC_PROVIDER_CALLS = {
+    LLMProvider.OLLAMA: "_call_ollama_async",
+    LLMProvider.OPENAI: "_call_openai_async",
+}
+_PROVIDER_CHECKS = {
+    LLMProvider.OLLAMA: "_check_ollama_availability",
+    LLMProvider.OPENAI: "_check_openai_availability",
+}
+
+# System messages are identical on every request (never mutated by callers),
+# which also keeps the provider's prompt prefix cache warm
+_OPENAI_SYSTEM_MSG = {
+    "role": "system",
+    "content": "You are a document analysis assistant. You MUST respond with valid JSON only. Never use markdown code fences (```). Never add explanatory text before or after the JSON.",
+}
+_OPENAI_VISION_SYSTEM_MSG = {
+    "role": "system",
+    "content": "You are a document analysis assistant with excellent OCR and reading skills. You MUST respond with valid JSON only. Never use markdown code fences (```). Never add explanatory text before or after the JSON.",
+}
+
+# PyMuPDF is not thread-safe, so documents opened in this process (by tagger
+# threads such as process_batch's) are only touched while holding this lock
+_FITZ_LOCK = threading.Lock()
+
+
+def _render_pages_jpeg(pdf, start: int, end: int, zoom: float, quality: int) -> List[bytes]:
+    """Render pages [start, end) of an open PyMuPDF document to JPEG bytes."""
+    import fitz  # PyMuPDF
+
+    # Render pages with the specified DPI
+    matrix = fitz.Matrix(zoom, zoom)
+    images = []
+    for page_num in range(start, end):
+        # RGB without alpha: no extra channel to encode
+        pix = pdf[page_num].get_pixmap(matrix=matrix, colorspace=fitz.csRGB, alpha=False)
+        images.append(pix.tobytes("jpeg", jpg_quality=quality))
+    return images
+
+
+def _render_page_range_jpeg(
+    pdf_path: str, start: int, end: int, zoom: float, quality: int
+) -> List[bytes]:
+    """Render pages [start, end) of a PDF to JPEG bytes (runs in a worker process)."""
+    import fitz  # PyMuPDF
+
+    with fitz.open(pdf_path) as pdf:
+        return _render_pages_jpeg(pdf, start, end, zoom, quality)
+
+
+def _validate_tagging_json(json_str: str) -> Optional[TaggingResult]:
+    """
+    Parse and validate a JSON string as a TaggingResult in one step.
+
+    Returns None if the string is not valid JSON; schema errors still raise.
+    """
+    try:
+        return TaggingResult.model_validate_json(json_str)
+    except ValidationError as e:
+        if any(error["type"] == "json_invalid" for error in e.errors()):
+            return None
+        raise
+
 
 class LLMTagger:
     """Uses LLM to tag and categorize documents. Supports Ollama and OpenAI-compatible APIs."""
 
-    def __init__(self, config: Optional[Config] = None):
-        """Initialize LLM tagger."""
+    def __init__(self, config: Optional[Config] = None, cache: Optional[ResultCache] = None):
+        """
+        Initialize LLM tagger.
+
+        Args:
+            config: Configuration (defaults to the global config)
+            cache: Optional cache of previous tagging results
+        """
         self.config = config or get_config()
+        self.cache = cache
         self._ollama_client: Optional[ollama.Client] = None
         self._openai_client: Optional[OpenAI] = None
+        self._async_ollama_client: Optional[ollama.AsyncClient] = None
+        self._async_openai_client: Optional[AsyncOpenAI] = None
+        # tag_many_async batches in flight, and whether they opened the async clients
+        self._async_batches = 0
+        self._async_batches_own_clients = False
+        self._render_pool: Optional[ProcessPoolExecutor] = None
+        self._render_pool_lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+
+    @property
+    def config(self) -> Config:
+        """Configuration in use; assigning a new one rebuilds the prompt templates."""
+        return self._config
+
+    @config.setter
+    def config(self, config: Config) -> None:
+        self._config = config
+        self._build_prompt_templates()
 
     @property
     def ollama_client(self) -> ollama.Client:
         """Lazy-load Ollama client."""
         if self._ollama_client is None:
-            self._ollama_client = ollama.Client(host=self.config.llm.ollama_url)
+            self._ollama_client = ollama.Client(
+                host=self.config.llm.ollama_url, **self._http_client_kwargs()
+            )
         return self._ollama_client
 
     @property
@@ -40,45 +179,142 @@ class LLMTagger:
                 base_url=self.config.llm.openai_base_url,
                 api_key=self.config.llm.openai_api_key,
                 timeout=self.config.llm.timeout,
+                http_client=DefaultHttpxClient(**self._http_client_kwargs()),
             )
         return self._openai_client
 
-    def get_default_prompt_template(self) -> str:
-        """Get the default prompt template."""
-        categories = ", ".join(self.config.tags.custom_categories)
-        return f"""Analyze the following document and provide structured information about it.
+    @property
+    def async_ollama_client(self) -> ollama.AsyncClient:
+        """Lazy-load async Ollama client."""
+        if self._async_ollama_client is None:
+            self._async_ollama_client = ollama.AsyncClient(
+                host=self.config.llm.ollama_url, **self._http_client_kwargs()
+            )
+        return self._async_ollama_client
 
-Document text:
-{{text}}
+    @property
+    def async_openai_client(self) -> AsyncOpenAI:
+        """Lazy-load async OpenAI-compatible client."""
+        if self._async_openai_client is None:
+            self._async_openai_client = AsyncOpenAI(
+                base_url=self.config.llm.openai_base_url,
+                api_key=self.config.llm.openai_api_key,
+                timeout=self.config.llm.timeout,
+                http_client=DefaultAsyncHttpxClient(**self._http_client_kwargs()),
+            )
+        return self._async_openai_client
+
+    def _http_client_kwargs(self) -> dict:
+        """
+        Connection settings for the Ollama and OpenAI-compatible HTTP clients.
+
+        Each client is created once and reused for every request, so
+        connections (and TLS sessions) stay open between documents. The pool
+        keeps a warm connection for every request tag_many and
+        tag_many_async may have in flight, and HTTP/2 (when h2 is installed
+        and the server negotiates it over TLS) multiplexes them instead.
+        """
+        max_requests = self.config.llm.max_concurrent_requests
+        return {
+            "http2": _HTTP2_AVAILABLE,
+            "limits": httpx.Limits(
+                max_connections=max(max_requests, 100),
+                max_keepalive_connections=max(max_requests, 20),
+            ),
+        }
+
+    @property
+    def render_pool(self) -> ProcessPoolExecutor:
+        """Lazy-load the page rendering pool, reused across documents."""
+        if self._render_pool is None:
+            with self._render_pool_lock:
+                if self._render_pool is None:
+                    self._render_pool = ProcessPoolExecutor(
+                        max_workers=self.config.llm.vision_workers
+                    )
+        return self._render_pool
+
+    def close(self) -> None:
+        """
+        Shut down the page rendering pool and close the sync HTTP connections.
+
+        The async clients are bound to the event loop that used them, so they
+        are closed by aclose() on that loop instead.
+        """
+        if self._render_pool is not None:
+            self._render_pool.shutdown(wait=True)
+            self._render_pool = None
+        if self._openai_client is not None:
+            self._openai_client.close()
+            self._openai_client = None
+        if self._ollama_client is not None:
+            self._ollama_client.close()
+            self._ollama_client = None
+
+    async def aclose(self) -> None:
+        """Close the async HTTP clients (call on the event loop that used them)."""
+        if self._async_openai_client is not None:
+            await self._async_openai_client.close()
+            self._async_openai_client = None
+        if self._async_ollama_client is not None:
+            await self._async_ollama_client.close()
+            self._async_ollama_client = None
+
+    def _build_prompt_templates(self) -> None:
+        """Build the prompt templates once, since they only depend on config."""
+        self._categories_str = categories = ", ".join(self.config.tags.custom_categories)
+        max_tags = self.config.tags.max_tags
+        # A schema-constrained server cannot produce anything but the JSON object
+        rules = (
+            ""
+            if self.config.llm.structured_output == "schema"
+            else "\n\nIMPORTANT: Respond ONLY with the raw JSON object. Do NOT wrap it in markdown code fences (```). Do NOT include any text before or after the JSON."
+        )
+
+        # The instructions come before the document text so every prompt shares
+        # a byte-identical prefix, which servers with prefix caching (OpenAI,
+        # vLLM, LM Studio, Ollama) can reuse instead of re-processing
+        self._default_prompt_prefix = f"""Analyze the following document and provide structured information about it.
 
 Provide a JSON response with the following fields:
 - title: A concise, descriptive title for the document (max 100 chars)
 - document_type: The type of document (choose from: {categories}, or "other")
-- tags: An array of relevant keywords/tags (max {self.config.tags.max_tags} tags)
+- tags: An array of relevant keywords/tags (max {max_tags} tags)
 - summary: A brief 1-2 sentence summary of the document
 - date: Any date mentioned in the document (format: YYYY-MM-DD) or null
 - entities: An array of people, organizations, companies, or other named entities mentioned in the document (e.g., sender, recipient, account holder, company names). Include names exactly as they appear.
-- confidence: Your confidence in this classification (0.0 to 1.0)
+- confidence: Your confidence in this classification (0.0 to 1.0){rules}
 
-IMPORTANT: Respond ONLY with the raw JSON object. Do NOT wrap it in markdown code fences (```). Do NOT include any text before or after the JSON."""
+Document text:
+"""
 
-    def get_vision_prompt(self) -> str:
-        """Get the prompt template for vision models (no {text} placeholder)."""
-        categories = ", ".join(self.config.tags.custom_categories)
-        return f"""Analyze the document image(s) shown and provide structured information about it.
+        self._vision_prompt = f"""Analyze the document image(s) shown and provide structured information about it.
 
 Look carefully at ALL text visible in the image including headers, dates, amounts, names, and any other content.
 
 Provide a JSON response with the following fields:
 - title: A concise, descriptive title for the document (max 100 chars)
 - document_type: The type of document (choose from: {categories}, or "other")
-- tags: An array of relevant keywords/tags (max {self.config.tags.max_tags} tags)
+- tags: An array of relevant keywords/tags (max {max_tags} tags)
 - summary: A brief 1-2 sentence summary of the document
 - date: The most relevant date from the document (format: YYYY-MM-DD) or null. Look for dates in headers, footings, or prominently displayed.
 - entities: An array of people, organizations, companies, or other named entities mentioned in the document (e.g., sender, recipient, account holder, company names). Include names exactly as they appear.
-- confidence: Your confidence in this classification (0.0 to 1.0)
+- confidence: Your confidence in this classification (0.0 to 1.0){rules}"""
 
-IMPORTANT: Respond ONLY with the raw JSON object. Do NOT wrap it in markdown code fences (```). Do NOT include any text before or after the JSON."""
+    def _tagging_cache_key(self, *parts: str) -> str:
+        """Build a cache key from the request inputs and the generation settings."""
+        llm = self.config.llm
+        return make_cache_key(
+            llm.provider.value, llm.model, str(llm.temperature), str(llm.max_tokens), *parts
+        )
+
+    def get_default_prompt_template(self) -> str:
+        """Get the default prompt template."""
+        return self._default_prompt_prefix + "{text}"
+
+    def get_vision_prompt(self) -> str:
+        """Get the prompt template for vision models (no {text} placeholder)."""
+        return self._vision_prompt
 
     def pdf_to_images(self, pdf_path: Path) -> List[str]:
         """
@@ -93,28 +329,45 @@ IMPORTANT: Respond ONLY with the raw JSON object. Do NOT wrap it in markdown cod
         try:
             import fitz  # PyMuPDF
 
-            images = []
             max_pages = self.config.llm.vision_max_pages
             dpi = self.config.llm.vision_dpi
             zoom = dpi / 72  # 72 DPI is the default
+            quality = self.config.llm.vision_jpeg_quality
 
-            with fitz.open(pdf_path) as pdf:
+            page_images = None
+            with _FITZ_LOCK, fitz.open(pdf_path) as pdf:
                 pages_to_process = min(len(pdf), max_pages)
-                logger.info(f"Converting {pages_to_process} PDF pages to images (DPI: {dpi})")
-
-                for page_num in range(pages_to_process):
-                    page = pdf[page_num]
-                    # Render page to image with specified DPI
-                    mat = fitz.Matrix(zoom, zoom)
-                    pix = page.get_pixmap(matrix=mat)
-
-                    # Convert to JPEG bytes
-                    img_bytes = pix.tobytes("jpeg")
-
-                    # Encode to base64
-                    b64_image = base64.b64encode(img_bytes).decode("utf-8")
-                    images.append(b64_image)
-                    logger.debug(f"Converted page {page_num + 1} to image ({len(img_bytes)} bytes)")
+                workers = min(self.config.llm.vision_workers, pages_to_process)
+                logger.info(
+                    f"Converting {pages_to_process} PDF pages to images "
+                    f"(DPI: {dpi}, workers: {max(workers, 1)})"
+                )
+                if workers <= 1:
+                    page_images = _render_pages_jpeg(pdf, 0, pages_to_process, zoom, quality)
+
+            if page_images is None:
+                # PyMuPDF holds the GIL while rendering, so pages are rendered in
+                # a process pool kept across documents, one contiguous page range
+                # (and one document open) per worker
+                chunk_size = -(-pages_to_process // workers)
+                starts = range(0, pages_to_process, chunk_size)
+                page_images = [
+                    img_bytes
+                    for chunk in self.render_pool.map(
+                        _render_page_range_jpeg,
+                        repeat(str(pdf_path)),
+                        starts,
+                        [min(start + chunk_size, pages_to_process) for start in starts],
+                        repeat(zoom),
+                        repeat(quality),
+                    )
+                    for img_bytes in chunk
+                ]
+
+            # Encode to base64 (always ASCII, so skip UTF-8 decoding)
+            images = [base64.b64encode(img_bytes).decode("ascii") for img_bytes in page_images]
+            for page_num, img_bytes in enumerate(page_images):
+                logger.debug(f"Converted page {page_num + 1} to image ({len(img_bytes)} bytes)")
 
             return images
 
@@ -145,8 +398,8 @@ IMPORTANT: Respond ONLY with the raw JSON object. Do NOT wrap it in markdown cod
                 content.append({
                     "type": "image_url",
                     "image_url": {
-                        "url": f"data:image/jpeg;base64,{img_b64}",
-                        "detail": "high"  # Use high detail for document reading
+                        "url": _JPEG_DATA_URL_PREFIX + img_b64,
+                        "detail": self.config.llm.vision_detail,
                     }
                 })
                 logger.debug(f"Added image {i + 1} to vision request")
@@ -159,20 +412,18 @@ IMPORTANT: Respond ONLY with the raw JSON object. Do NOT wrap it in markdown cod
 
             logger.info(f"Sending {len(images)} images to vision model: {self.config.llm.model}")
 
+            vision_kwargs = {}
+            if self.config.llm.structured_output != "off":
+                vision_kwargs["response_format"] = _OPENAI_RESPONSE_FORMATS[
+                    self.config.llm.structured_output
+                ]
+
             response = self.openai_client.chat.completions.create(
                 model=self.config.llm.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a document analysis assistant with excellent OCR and reading skills. You MUST respond with valid JSON only. Never use markdown code fences (```). Never add explanatory text before or after the JSON.",
-                    },
-                    {
-                        "role": "user",
-                        "content": content,
-                    },
-                ],
+                messages=[_OPENAI_VISION_SYSTEM_MSG, {"role": "user", "content": content}],
                 temperature=self.config.llm.temperature,
                 max_tokens=self.config.llm.max_tokens,
+                **vision_kwargs,
             )
             return response.choices[0].message.content or ""
         except Exception as e:
@@ -194,6 +445,22 @@ IMPORTANT: Respond ONLY with the raw JSON object. Do NOT wrap it in markdown cod
         logger.info(f"Using vision model to analyze PDF: {pdf_path.name}")
 
         try:
+            cache_key = None
+            if self.cache is not None:
+                llm = self.config.llm
+                cache_key = self._tagging_cache_key(
+                    "vision",
+                    calculate_file_hash(pdf_path),
+                    str(llm.vision_max_pages),
+                    str(llm.vision_dpi),
+                    str(llm.vision_jpeg_quality),
+                    self.get_vision_prompt(),
+                )
+                cached = self.cache.get_tagging(cache_key)
+                if cached is not None:
+                    logger.info(f"Using cached vision tagging result for {pdf_path.name}")
+                    return cached
+
             # Convert PDF to images
             images = self.pdf_to_images(pdf_path)
 
@@ -215,6 +482,8 @@ IMPORTANT: Respond ONLY with the raw JSON object. Do NOT wrap it in markdown cod
                 f"date: {result.date}, {len(result.tags)} tags, {len(result.entities)} entities"
             )
 
+            if cache_key is not None:
+                self.cache.put_tagging(cache_key, result)
             return result
 
         except Exception as e:
@@ -235,40 +504,28 @@ IMPORTANT: Respond ONLY with the raw JSON object. Do NOT wrap it in markdown cod
         Returns:
             Formatted prompt
         """
-        # Truncate text if too long
-        truncated_text = text[:max_chars] if len(text) > max_chars else text
+        # Truncate text if too long, at the last word boundary so the LLM
+        # does not see (and spend tokens on) a word cut in half
+        truncated_text = text
+        if len(text) > max_chars:
+            truncated_text = text[:max_chars]
+            cut = max(truncated_text.rfind(" "), truncated_text.rfind("\n"))
+            if cut > max_chars // 2:
+                truncated_text = truncated_text[:cut]
 
         if custom_template:
             # Use custom template with {text} placeholder
             try:
                 return custom_template.format(
                     text=truncated_text,
-                    categories=", ".join(self.config.tags.custom_categories),
+                    categories=self._categories_str,
                     max_tags=self.config.tags.max_tags,
                 )
             except KeyError as e:
                 logger.warning(f"Invalid placeholder in custom template: {e}, using default")
 
         # Use default template
-        categories = ", ".join(self.config.tags.custom_categories)
-
-        prompt = f"""Analyze the following document and provide structured information about it.
-
-Document text:
-{truncated_text}
-
-Provide a JSON response with the following fields:
-- title: A concise, descriptive title for the document (max 100 chars)
-- document_type: The type of document (choose from: {categories}, or "other")
-- tags: An array of relevant keywords/tags (max {self.config.tags.max_tags} tags)
-- summary: A brief 1-2 sentence summary of the document
-- date: Any date mentioned in the document (format: YYYY-MM-DD) or null
-- entities: An array of people, organizations, companies, or other named entities mentioned in the document (e.g., sender, recipient, account holder, company names). Include names exactly as they appear.
-- confidence: Your confidence in this classification (0.0 to 1.0)
-
-IMPORTANT: Respond ONLY with the raw JSON object. Do NOT wrap it in markdown code fences (```). Do NOT include any text before or after the JSON."""
-
-        return prompt
+        return self._default_prompt_prefix + truncated_text
 
     def parse_response(self, response_text: str) -> TaggingResult:
         """
@@ -286,22 +543,25 @@ IMPORTANT: Respond ONLY with the raw JSON object. Do NOT wrap it in markdown cod
         try:
             # Clean up the response text
             cleaned = response_text.strip()
-            
-            # Remove markdown code fences if present (```json ... ``` or ``` ... ```)
-            import re
-            # Match ```json or ``` at start and ``` at end
-            code_fence_pattern = r'^```(?:json)?\s*\n?(.*?)\n?```\s*$'
-            match = re.match(code_fence_pattern, cleaned, re.DOTALL | re.IGNORECASE)
-            if match:
-                cleaned = match.group(1).strip()
-            
-            # Also handle case where there's text before/after code fences
-            if '```' in cleaned:
-                # Extract content between first ``` and last ```
-                fence_match = re.search(r'```(?:json)?\s*\n?(.*?)\n?```', cleaned, re.DOTALL | re.IGNORECASE)
-                if fence_match:
-                    cleaned = fence_match.group(1).strip()
-            
+
+            # Fast path: a bare JSON object (always the case with structured output)
+            # Pydantic parses and validates in one step, without building a dict first
+            if cleaned.startswith("{") and cleaned.endswith("}"):
+                result = _validate_tagging_json(cleaned)
+                if result is not None:
+                    return result
+
+            # Strip markdown code fences if present (```json ... ``` or ``` ... ```),
+            # including when the model adds text before/after the fences
+            fence = cleaned.find("```")
+            if fence != -1:
+                body_start = fence + 3
+                if cleaned[body_start:body_start + 4].lower() == "json":
+                    body_start += 4
+                fence_end = cleaned.find("```", body_start)
+                if fence_end != -1:
+                    cleaned = cleaned[body_start:fence_end].strip()
+
             # Try to find JSON in the response
             # Sometimes LLMs add extra text around the JSON
             start_idx = cleaned.find("{")
@@ -312,24 +572,26 @@ IMPORTANT: Respond ONLY with the raw JSON object. Do NOT wrap it in markdown cod
                 raise ValueError("No JSON found in response")
 
             json_str = cleaned[start_idx:end_idx]
-            
+
             # Try to parse the JSON
             try:
-                data = json.loads(json_str)
+                # Decode exactly one object from the first brace; unlike the
+                # first/last brace slice, this tolerates braces in trailing prose
+                data, _ = _JSON_DECODER.raw_decode(cleaned, start_idx)
+                return TaggingResult.model_validate(data)
             except json.JSONDecodeError:
-                # Try to fix common JSON issues
-                # Remove trailing commas before } or ]
-                fixed_json = re.sub(r',\s*([}\]])', r'\1', json_str)
-                # Replace single quotes with double quotes (some LLMs do this)
-                # Only if the JSON still fails to parse
-                try:
-                    data = json.loads(fixed_json)
-                except json.JSONDecodeError:
-                    # Last resort: try replacing single quotes
-                    fixed_json = fixed_json.replace("'", '"')
-                    data = json.loads(fixed_json)
-
-            return TaggingResult(**data)
+                pass
+
+            # Try to fix common JSON issues
+            # Remove trailing commas before } or ]
+            fixed_json = _TRAILING_COMMA_RE.sub(r"\1", json_str)
+            result = _validate_tagging_json(fixed_json)
+            if result is None:
+                # Last resort: replace single quotes (some LLMs do this)
+                result = _validate_tagging_json(fixed_json.replace("'", '"'))
+            if result is None:
+                raise json.JSONDecodeError("No valid JSON object", json_str, 0)
+            return result
 
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse JSON response: {e}")
@@ -355,56 +617,386 @@ IMPORTANT: Respond ONLY with the raw JSON object. Do NOT wrap it in markdown cod
         """
         logger.info(f"Sending document to LLM for tagging (provider: {self.config.llm.provider})")
 
-        if not text.strip():
-            logger.warning("Empty text provided for tagging")
-            return TaggingResult(
-                title="Untitled Document",
-                document_type="other",
-                tags=[],
-                confidence=0.0,
-            )
+        if not text or text.isspace():
+            return self._empty_tagging_result()
 
         try:
-            prompt = self.create_prompt(text)
+            prompt, key, cached = self._prepare_tagging(text)
+            if cached is not None:
+                return cached
+
+            # Identical documents tagged concurrently (e.g. duplicates in one
+            # batch) share a single LLM request
+            with self._inflight_lock:
+                inflight = self._inflight.get(key)
+                if inflight is None:
+                    self._inflight[key] = pending = Future()
+            if inflight is not None:
+                logger.info("Identical document is already being tagged, reusing its result")
+                return inflight.result()
 
-            if self.config.llm.provider == LLMProvider.OLLAMA:
-                response_text = self._call_ollama(prompt)
-            else:
-                response_text = self._call_openai(prompt)
+            try:
+                call = getattr(self, _PROVIDER_CALLS[self.config.llm.provider])
+                result = self._finish_tagging(call(prompt), key)
+                pending.set_result(result)
+                return result
+            except BaseException as e:
+                pending.set_exception(e)
+                raise
+            finally:
+                with self._inflight_lock:
+                    del self._inflight[key]
 
-            logger.debug(f"LLM response: {response_text}")
+        except Exception as e:
+            error_msg = f"LLM tagging failed: {e}"
+            logger.error(error_msg)
+            raise RuntimeError(error_msg)
 
-            result = self.parse_response(response_text)
+    async def tag_async(self, text: str) -> TaggingResult:
+        """
+        Tag a document using the LLM without blocking the event loop.
 
-            # Filter tags based on confidence
-            if result.confidence < self.config.tags.min_confidence:
-                logger.warning(
-                    f"Low confidence result: {result.confidence}, "
-                    f"using fallback values"
-                )
+        Uses the providers' async clients, so many requests can be in flight
+        as coroutines rather than threads. The async clients are created on
+        first use and should only be used from one event loop; close them
+        with aclose() on that loop.
 
-            logger.info(
-                f"Tagging completed: {result.title} ({result.document_type}), "
-                f"{len(result.tags)} tags"
-            )
+        Args:
+            text: Document text to analyze
 
-            return result
+        Returns:
+            TaggingResult with extracted information
+
+        Raises:
+            RuntimeError: If tagging fails
+        """
+        logger.info(f"Sending document to LLM for tagging (provider: {self.config.llm.provider})")
+
+        if not text or text.isspace():
+            return self._empty_tagging_result()
+
+        try:
+            prompt, key, cached = self._prepare_tagging(text)
+            if cached is not None:
+                return cached
+
+            call = getattr(self, _ASYNC_PROVIDER_CALLS[self.config.llm.provider])
+            response_text = await call(prompt)
+            # Parsing/validation and the cache write would otherwise stall the
+            # other requests in flight on this event loop
+            return await asyncio.to_thread(self._finish_tagging, response_text, key)
 
         except Exception as e:
             error_msg = f"LLM tagging failed: {e}"
             logger.error(error_msg)
             raise RuntimeError(error_msg)
 
+    def _empty_tagging_result(self) -> TaggingResult:
+        """Result for documents without any text."""
+        logger.warning("Empty text provided for tagging")
+        return TaggingResult(
+            title="Untitled Document",
+            document_type="other",
+            tags=[],
+            confidence=0.0,
+        )
+
+    def _prepare_tagging(self, text: str) -> Tuple[str, str, Optional[TaggingResult]]:
+        """Build the prompt and look it up in the cache (prompt, request key, cached result)."""
+        prompt = self.create_prompt(text)
+        key = self._tagging_cache_key("text", prompt)
+
+        cached = None
+        if self.cache is not None:
+            cached = self.cache.get_tagging(key)
+            if cached is not None:
+                logger.info("Using cached tagging result")
+        return prompt, key, cached
+
+    def _finish_tagging(self, response_text: str, cache_key: str) -> TaggingResult:
+        """Parse an LLM response and store it in the cache."""
+        logger.debug(f"LLM response: {response_text}")
+
+        result = self.parse_response(response_text)
+
+        # Filter tags based on confidence
+        if result.confidence < self.config.tags.min_confidence:
+            logger.warning(
+                f"Low confidence result: {result.confidence}, "
+                f"using fallback values"
+            )
+
+        logger.info(
+            f"Tagging completed: {result.title} ({result.document_type}), "
+            f"{len(result.tags)} tags"
+        )
+
+        if self.cache is not None:
+            self.cache.put_tagging(cache_key, result)
+        return result
+
+    def tag_many(
+        self, texts: List[str], return_exceptions: bool = False
+    ) -> List[Union[TaggingResult, BaseException]]:
+        """
+        Tag several documents with concurrent LLM requests.
+
+        Keeping multiple requests in flight lets servers such as vLLM or
+        LM Studio batch them together instead of decoding one sequence at a time.
+
+        Args:
+            texts: Document texts to analyze
+            return_exceptions: Return a failed document's exception in its
+                slot instead of raising, so one failure does not discard the
+                rest of the batch
+
+        Returns:
+            TaggingResults in the same order as the input texts
+
+        Raises:
+            RuntimeError: If tagging any document fails (unless return_exceptions)
+        """
+        tag = self.tag
+        if return_exceptions:
+
+            def tag(text: str) -> Union[TaggingResult, BaseException]:
+                try:
+                    return self.tag(text)
+                except Exception as e:
+                    return e
+
+        # Identical texts are only sent once, shortest first so requests
+        # in flight together have similar lengths (see _by_length)
+        unique_texts = self._by_length(texts)
+        if len(unique_texts) <= 1:
+            results = [tag(text) for text in unique_texts]
+        else:
+            workers = min(self.config.llm.max_concurrent_requests, len(unique_texts))
+            logger.info(
+                f"Tagging {len(unique_texts)} documents with {workers} concurrent requests"
+            )
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(tag, unique_texts))
+
+        by_text = dict(zip(unique_texts, results))
+        return [by_text[text] for text in texts]
+
+    @staticmethod
+    def _by_length(texts: List[str]) -> List[str]:
+        """
+        Deduplicate texts and order them by length for sending.
+
+        Requests are started in this order, so each wave of concurrent
+        requests holds prompts of similar length: a server that pads or
+        steps a batch in lockstep then no longer waits on one long document
+        while short ones sit finished.
+        """
+        return sorted(dict.fromkeys(texts), key=len)
+
+    async def tag_many_async(
+        self,
+        texts: List[str],
+        concurrency: Optional[int] = None,
+        return_exceptions: bool = False,
+    ) -> List[Union[TaggingResult, BaseException]]:
+        """
+        Tag several documents concurrently on the current event loop.
+
+        Args:
+            texts: Document texts to analyze
+            concurrency: Maximum requests in flight (defaults to
+                llm.max_concurrent_requests)
+            return_exceptions: Return a failed document's exception in its
+                slot instead of raising, so one failure does not discard the
+                rest of the batch
+
+        Returns:
+            TaggingResults (or exceptions) in the same order as the input texts
+
+        Raises:
+            RuntimeError: If tagging any document fails and return_exceptions is False
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.config.llm.max_concurrent_requests)
+        # Clients opened for batches are closed when the last concurrent batch
+        # finishes, so they never outlive its event loop (e.g. one asyncio.run
+        # per batch) nor get closed under another batch still using them
+        if self._async_batches == 0:
+            self._async_batches_own_clients = (
+                self._async_openai_client is None and self._async_ollama_client is None
+            )
+        self._async_batches += 1
+
+        async def tag_one(text: str) -> TaggingResult:
+            async with semaphore:
+                return await self.tag_async(text)
+
+        # Identical texts are only sent once, shortest first (see _by_length)
+        unique_texts = self._by_length(texts)
+        try:
+            results = await asyncio.gather(
+                *(tag_one(text) for text in unique_texts), return_exceptions=return_exceptions
+            )
+        finally:
+            self._async_batches -= 1
+            if self._async_batches == 0 and self._async_batches_own_clients:
+                await self.aclose()
+        by_text = dict(zip(unique_texts, results))
+        return [by_text[text] for text in texts]
+
+    def submit_batch(self, texts: List[str], custom_ids: Optional[List[str]] = None) -> str:
+        """
+        Submit documents to the OpenAI Batch API for asynchronous tagging.
+
+        Batch requests are billed at half price and do not count against the
+        realtime rate limits, which suits large backlogs that are not
+        latency-sensitive. Collect the results later with poll_batch().
+
+        Args:
+            texts: Document texts to analyze
+            custom_ids: IDs to match results to documents (defaults to the
+                position of each text as a string)
+
+        Returns:
+            Batch ID
+
+        Raises:
+            RuntimeError: If the Batch API is disabled or submission fails
+        """
+        if not self.config.llm.use_batch_api:
+            raise RuntimeError("Batch API is disabled (set LLM_USE_BATCH_API=true)")
+        if self.config.llm.provider != LLMProvider.OPENAI:
+            raise RuntimeError("Batch API requires the OpenAI provider")
+
+        if custom_ids is None:
+            custom_ids = [str(i) for i in range(len(texts))]
+        if len(custom_ids) != len(texts):
+            raise ValueError("custom_ids must have one entry per text")
+
+        lines = [
+            json.dumps(
+                {
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": self._openai_chat_kwargs(self.create_prompt(text)),
+                }
+            )
+            for custom_id, text in zip(custom_ids, texts)
+        ]
+
+        try:
+            input_file = self.openai_client.files.create(
+                file=("batch.jsonl", "\n".join(lines).encode("utf-8")), purpose="batch"
+            )
+            batch = self.openai_client.batches.create(
+                input_file_id=input_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h",
+            )
+        except Exception as e:
+            raise RuntimeError(f"OpenAI batch submission failed: {e}")
+
+        logger.info(f"Submitted batch {batch.id} with {len(texts)} documents")
+        return batch.id
+
+    def poll_batch(self, batch_id: str) -> Optional[Dict[str, TaggingResult]]:
+        """
+        Collect the results of a batch submitted with submit_batch().
+
+        Args:
+            batch_id: Batch ID returned by submit_batch()
+
+        Returns:
+            TaggingResults keyed by custom ID, or None if the batch is still
+            running. Documents whose request or response failed are logged
+            and left out.
+
+        Raises:
+            RuntimeError: If the batch failed, expired or was cancelled
+        """
+        try:
+            batch = self.openai_client.batches.retrieve(batch_id)
+        except Exception as e:
+            raise RuntimeError(f"Failed to retrieve batch {batch_id}: {e}")
+
+        if batch.status in ("failed", "expired", "cancelled"):
+            raise RuntimeError(f"Batch {batch_id} {batch.status}")
+        if batch.status != "completed":
+            logger.debug(f"Batch {batch_id} is {batch.status}")
+            return None
+
+        results: Dict[str, TaggingResult] = {}
+        if not batch.output_file_id:
+            return results
+
+        output = self.openai_client.files.content(batch.output_file_id).text
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = _json_loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError("record is not a JSON object")
+            except ValueError as e:
+                # One bad line must not discard the rest of the batch
+                match = _CUSTOM_ID_RE.search(line)
+                custom_id = match.group(1) if match else "<unknown>"
+                logger.warning(f"Batch request {custom_id} failed: malformed output line: {e}")
+                continue
+            custom_id = record.get("custom_id")
+            response = record.get("response") or {}
+            if record.get("error") or response.get("status_code") != 200:
+                logger.warning(
+                    f"Batch request {custom_id} failed: {record.get('error') or response}"
+                )
+                continue
+            try:
+                content = response["body"]["choices"][0]["message"]["content"] or ""
+                results[custom_id] = self.parse_response(content)
+            except (KeyError, IndexError, ValueError) as e:
+                logger.warning(f"Failed to parse batch result {custom_id}: {e}")
+
+        logger.info(f"Batch {batch_id} completed: {len(results)} documents tagged")
+        return results
+
+    def _ollama_generate_kwargs(self, prompt: str) -> dict:
+        """Request arguments for Ollama's generate endpoint."""
+        kwargs = {
+            "model": self.config.llm.model,
+            "prompt": prompt,
+            "options": {
+                "temperature": self.config.llm.temperature,
+                "num_predict": self.config.llm.max_tokens,
+            },
+        }
+        response_format = _OLLAMA_FORMATS.get(self.config.llm.structured_output)
+        if response_format is not None:
+            kwargs["format"] = response_format
+        return kwargs
+
+    def _openai_chat_kwargs(self, prompt: str) -> dict:
+        """Request arguments for the OpenAI-compatible chat completions endpoint."""
+        return {
+            "model": self.config.llm.model,
+            "messages": [_OPENAI_SYSTEM_MSG, {"role": "user", "content": prompt}],
+            "temperature": self.config.llm.temperature,
+            "max_tokens": self.config.llm.max_tokens,
+            "response_format": _OPENAI_RESPONSE_FORMATS[self.config.llm.structured_output],
+        }
+
     def _call_ollama(self, prompt: str) -> str:
         """Call Ollama API."""
         try:
-            response = self.ollama_client.generate(
-                model=self.config.llm.model,
-                prompt=prompt,
-                options={
-                    "temperature": self.config.llm.temperature,
-                    "num_predict": self.config.llm.max_tokens,
-                },
+            response = self.ollama_client.generate(**self._ollama_generate_kwargs(prompt))
+            return response.get("response", "")
+        except ollama.ResponseError as e:
+            raise RuntimeError(f"Ollama API error: {e}")
+
+    async def _call_ollama_async(self, prompt: str) -> str:
+        """Call Ollama API with the async client."""
+        try:
+            response = await self.async_ollama_client.generate(
+                **self._ollama_generate_kwargs(prompt)
             )
             return response.get("response", "")
         except ollama.ResponseError as e:
@@ -414,20 +1006,17 @@ IMPORTANT: Respond ONLY with the raw JSON object. Do NOT wrap it in markdown cod
         """Call OpenAI-compatible API (LM Studio, vLLM, etc.)."""
         try:
             response = self.openai_client.chat.completions.create(
-                model=self.config.llm.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a document analysis assistant. You MUST respond with valid JSON only. Never use markdown code fences (```). Never add explanatory text before or after the JSON.",
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt,
-                    },
-                ],
-                temperature=self.config.llm.temperature,
-                max_tokens=self.config.llm.max_tokens,
-                response_format={"type": "text"},
+                **self._openai_chat_kwargs(prompt)
+            )
+            return response.choices[0].message.content or ""
+        except Exception as e:
+            raise RuntimeError(f"OpenAI-compatible API error: {e}")
+
+    async def _call_openai_async(self, prompt: str) -> str:
+        """Call OpenAI-compatible API with the async client."""
+        try:
+            response = await self.async_openai_client.chat.completions.create(
+                **self._openai_chat_kwargs(prompt)
             )
             return response.choices[0].message.content or ""
         except Exception as e:
@@ -440,21 +1029,18 @@ IMPORTANT: Respond ONLY with the raw JSON object. Do NOT wrap it in markdown cod
         Returns:
             True if available, False otherwise
         """
-        if self.config.llm.provider == LLMProvider.OLLAMA:
-            return self._check_ollama_availability()
-        else:
-            return self._check_openai_availability()
+        return getattr(self, _PROVIDER_CHECKS[self.config.llm.provider])()
 
     def _check_ollama_availability(self) -> bool:
         """Check if Ollama is available and the model exists."""
         try:
             models = self.ollama_client.list()
-            model_names = [m.get("name", "") for m in models.get("models", [])]
+            model_names = {m.get("name", "") for m in models.get("models", [])}
 
             if self.config.llm.model not in model_names:
                 logger.warning(
                     f"Model {self.config.llm.model} not found. "
-                    f"Available models: {model_names}"
+                    f"Available models: {sorted(model_names)}"
                 )
                 return False
 
@@ -469,14 +1055,15 @@ IMPORTANT: Respond ONLY with the raw JSON object. Do NOT wrap it in markdown cod
         try:
             # Try to list models - LM Studio supports this endpoint
             models = self.openai_client.models.list()
-            model_ids = [m.id for m in models.data]
-            logger.info(f"Available models: {model_ids}")
+            model_ids = {m.id for m in models.data}
+            available = sorted(model_ids)
+            logger.info(f"Available models: {available}")
 
             # Check if the configured model is available
             if model_ids and self.config.llm.model not in model_ids:
                 logger.warning(
                     f"Model {self.config.llm.model} not in list. "
-                    f"Available: {model_ids}. Will try anyway."
+                    f"Available: {available}. Will try anyway."
                 )
 
             return True
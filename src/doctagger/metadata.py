@@ -1,15 +1,24 @@
 """PDF metadata handling."""
 
+import io
 import logging
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Mapping, Optional, Union
 
 from PyPDF2 import PdfReader, PdfWriter
 
 from .models import DocumentMetadata
 
+try:
+    import pikepdf  # Installed with ocrmypdf
+except ImportError:  # PyPDF2 is used otherwise
+    pikepdf = None
+
 logger = logging.getLogger(__name__)
 
+# PyPDF2 writes objects in many small chunks
+_WRITE_BUFFER_SIZE = 1024 * 1024
+
 
 class MetadataWriter:
     """Writes metadata to PDF files."""
@@ -19,15 +28,19 @@ class MetadataWriter:
         pass
 
     def write_metadata(
-        self, pdf_path: Path, metadata: DocumentMetadata, output_path: Optional[Path] = None
+        self,
+        pdf_path: Union[Path, bytes],
+        metadata: DocumentMetadata,
+        output_path: Optional[Path] = None,
     ) -> Path:
         """
         Write metadata to a PDF file.
 
         Args:
-            pdf_path: Path to the PDF file
+            pdf_path: Path to the PDF file, or the PDF's content
             metadata: Metadata to write
-            output_path: Output path (if None, overwrites input)
+            output_path: Output path (if None, overwrites input; required
+                when pdf_path is the content)
 
         Returns:
             Path to the output PDF
@@ -36,41 +49,14 @@ class MetadataWriter:
             RuntimeError: If writing fails
         """
         if output_path is None:
+            if not isinstance(pdf_path, Path):
+                raise ValueError("output_path is required when writing PDF content")
             output_path = pdf_path
 
-        logger.info(f"Writing metadata to {pdf_path.name}")
+        logger.info(f"Writing metadata to {output_path.name}")
 
         try:
-            reader = PdfReader(pdf_path)
-            writer = PdfWriter()
-
-            # Copy all pages
-            for page in reader.pages:
-                writer.add_page(page)
-
-            # Set metadata
-            metadata_dict = {}
-
-            if metadata.title:
-                metadata_dict["/Title"] = metadata.title
-            if metadata.author:
-                metadata_dict["/Author"] = metadata.author
-            if metadata.subject:
-                metadata_dict["/Subject"] = metadata.subject
-            if metadata.keywords:
-                # Join keywords with semicolons (PDF standard)
-                metadata_dict["/Keywords"] = "; ".join(metadata.keywords)
-            if metadata.creator:
-                metadata_dict["/Creator"] = metadata.creator
-            if metadata.producer:
-                metadata_dict["/Producer"] = metadata.producer
-
-            writer.add_metadata(metadata_dict)
-
-            # Write to output
-            with open(output_path, "wb") as output_file:
-                writer.write(output_file)
-
+            self._update_info(pdf_path, self._info_dict(metadata), output_path)
             logger.info(f"Successfully wrote metadata to {output_path.name}")
             return output_path
 
@@ -79,6 +65,117 @@ class MetadataWriter:
             logger.error(error_msg)
             raise RuntimeError(error_msg)
 
+    def update_metadata(
+        self, pdf_path: Path, metadata: DocumentMetadata, output_path: Optional[Path] = None
+    ) -> DocumentMetadata:
+        """
+        Write metadata to a PDF file and return the metadata it replaced.
+
+        Opens and parses the PDF once, instead of a read_metadata call
+        followed by write_metadata.
+
+        Args:
+            pdf_path: Path to the PDF file
+            metadata: Metadata to write
+            output_path: Output path (if None, overwrites input)
+
+        Returns:
+            The PDF's metadata before the update
+
+        Raises:
+            RuntimeError: If updating fails
+        """
+        if output_path is None:
+            output_path = pdf_path
+
+        logger.info(f"Updating metadata of {pdf_path.name}")
+
+        try:
+            previous = self._update_info(pdf_path, self._info_dict(metadata), output_path)
+            logger.info(f"Successfully wrote metadata to {output_path.name}")
+            return self._metadata_from_info(previous)
+
+        except Exception as e:
+            error_msg = f"Failed to update metadata: {e}"
+            logger.error(error_msg)
+            raise RuntimeError(error_msg)
+
+    def _info_dict(self, metadata: DocumentMetadata) -> Dict[str, str]:
+        """Build the PDF Info dictionary entries for the given metadata."""
+        metadata_dict = {}
+
+        if metadata.title:
+            metadata_dict["/Title"] = metadata.title
+        if metadata.author:
+            metadata_dict["/Author"] = metadata.author
+        if metadata.subject:
+            metadata_dict["/Subject"] = metadata.subject
+        if metadata.keywords:
+            # Join keywords with semicolons (PDF standard)
+            metadata_dict["/Keywords"] = "; ".join(metadata.keywords)
+        if metadata.creator:
+            metadata_dict["/Creator"] = metadata.creator
+        if metadata.producer:
+            metadata_dict["/Producer"] = metadata.producer
+
+        return metadata_dict
+
+    def _update_info(
+        self, pdf_path: Union[Path, bytes], metadata_dict: Dict[str, str], output_path: Path
+    ) -> Dict[str, str]:
+        """Set Info dictionary entries, returning the entries found before the update."""
+        if isinstance(pdf_path, bytes):
+            # Both libraries read file-like objects
+            pdf_path = io.BytesIO(pdf_path)
+        if pikepdf is not None:
+            return self._update_with_pikepdf(pdf_path, metadata_dict, output_path)
+        return self._update_with_pypdf2(pdf_path, metadata_dict, output_path)
+
+    def _update_with_pikepdf(
+        self, pdf_path: Union[Path, io.BytesIO], metadata_dict: Dict[str, str], output_path: Path
+    ) -> Dict[str, str]:
+        """
+        Update the Info dictionary with pikepdf (qpdf).
+
+        Only the Info dictionary (and the XMP metadata, if present) is
+        modified; pages and content streams are copied by qpdf without being
+        parsed in Python.
+        """
+        # Overwriting is only needed (and only allowed) for file paths
+        overwrite = isinstance(pdf_path, Path)
+        with pikepdf.open(pdf_path, allow_overwriting_input=overwrite) as pdf:
+            previous = {str(key): str(value) for key, value in pdf.docinfo.items()}
+            for key, value in metadata_dict.items():
+                pdf.docinfo[key] = value
+            if "/Metadata" in pdf.Root:
+                # XMP-first readers (and PDF/A, which OCRmyPDF produces) need
+                # the XMP to match the Info dictionary
+                with pdf.open_metadata(set_pikepdf_as_editor=False) as meta:
+                    meta.load_from_docinfo(pdf.docinfo)
+            pdf.save(output_path)
+        return previous
+
+    def _update_with_pypdf2(
+        self, pdf_path: Union[Path, io.BytesIO], metadata_dict: Dict[str, str], output_path: Path
+    ) -> Dict[str, str]:
+        """Rewrite the PDF with PyPDF2, setting the Info dictionary."""
+        reader = PdfReader(pdf_path)
+        previous = dict(reader.metadata or {})
+        writer = PdfWriter()
+
+        # Clone the whole document in one pass rather than page by page
+        writer.clone_document_from_reader(reader)
+        writer.add_metadata(metadata_dict)
+        # PyPDF2 cannot update XMP, so drop it rather than keep stale values
+        # that XMP-first readers would show instead of the Info dictionary
+        if "/Metadata" in writer._root_object:
+            del writer._root_object["/Metadata"]
+
+        # Write to output
+        with open(output_path, "wb", buffering=_WRITE_BUFFER_SIZE) as output_file:
+            writer.write(output_file)
+        return previous
+
     def read_metadata(self, pdf_path: Path) -> DocumentMetadata:
         """
         Read metadata from a PDF file.
@@ -93,30 +190,40 @@ class MetadataWriter:
             RuntimeError: If reading fails
         """
         try:
-            reader = PdfReader(pdf_path)
-            meta = reader.metadata or {}
-
-            # Extract keywords
-            keywords = []
-            if "/Keywords" in meta:
-                keywords_str = meta["/Keywords"]
-                # Split by semicolon or comma
-                keywords = [
-                    k.strip()
-                    for k in keywords_str.replace(";", ",").split(",")
-                    if k.strip()
-                ]
-
-            return DocumentMetadata(
-                title=meta.get("/Title"),
-                author=meta.get("/Author"),
-                subject=meta.get("/Subject"),
-                keywords=keywords,
-                creator=meta.get("/Creator"),
-                producer=meta.get("/Producer"),
-            )
+            if pikepdf is not None:
+                # qpdf only resolves the objects that are accessed (the trailer
+                # and Info dictionary), never the page tree or content streams
+                with pikepdf.open(pdf_path) as pdf:
+                    info = {str(key): str(value) for key, value in pdf.docinfo.items()}
+            else:
+                info = PdfReader(pdf_path).metadata or {}
+
+            return self._metadata_from_info(info)
 
         except Exception as e:
             error_msg = f"Failed to read metadata: {e}"
             logger.error(error_msg)
             raise RuntimeError(error_msg)
+
+    def _metadata_from_info(self, meta: Mapping[str, str]) -> DocumentMetadata:
+        """Build DocumentMetadata from PDF Info dictionary entries."""
+        # Extract keywords
+        keywords = []
+        if "/Keywords" in meta:
+            keywords_str = meta["/Keywords"]
+            # Split by semicolon or comma
+            keywords = [
+                k.strip()
+                for k in keywords_str.replace(";", ",").split(",")
+                if k.strip()
+            ]
+
+        return DocumentMetadata(
+            title=meta.get("/Title"),
+            author=meta.get("/Author"),
+            subject=meta.get("/Subject"),
+            keywords=keywords,
+            # Creator/Producer are required strings; PDFs often omit them
+            creator=meta.get("/Creator", ""),
+            producer=meta.get("/Producer", ""),
+        )
@@ -41,17 +41,20 @@ class TaggingResult(BaseModel):
     entities: List[str] = Field(default_factory=list, description="People, organizations, or entities mentioned")
     confidence: float = Field(default=1.0, ge=0.0, le=1.0, description="Confidence score")
 
+    # Results are shared between duplicate documents and the result cache
+    model_config = ConfigDict(frozen=True)
+
     @field_validator("tags")
     @classmethod
     def validate_tags(cls, v: List[str]) -> List[str]:
         """Ensure tags are normalized."""
-        return [tag.strip().lower() for tag in v if tag.strip()]
+        return [tag for tag in (t.strip().lower() for t in v) if tag]
 
     @field_validator("entities")
     @classmethod
     def validate_entities(cls, v: List[str]) -> List[str]:
         """Ensure entities are normalized."""
-        return [e.strip() for e in v if e.strip()]
+        return [entity for entity in (e.strip() for e in v) if entity]
 
 
 class DocumentMetadata(BaseModel):
@@ -1,7 +1,9 @@
 """Output normalization for filenames and tags."""
 
 import logging
+import os
 import re
+from functools import lru_cache
 from pathlib import Path
 from typing import List
 
@@ -9,6 +11,74 @@ from .config import Config, get_config
 
 logger = logging.getLogger(__name__)
 
+_UNDERSCORES_RE = re.compile(r"_+")
+_TAG_UNSAFE_RE = re.compile(r"[^a-z0-9\-]")
+
+# Lowercased ASCII tags are filtered in one str.translate pass: spaces become
+# hyphens and every character outside [a-z0-9-] is deleted
+_TAG_ASCII_TABLE = {
+    c: None for c in range(128) if not (chr(c).isdigit() or "a" <= chr(c) <= "z" or chr(c) == "-")
+}
+_TAG_ASCII_TABLE[ord(" ")] = ord("-")
+
+
+# Tags, document types and titles repeat heavily across documents, so results
+# are memoized at module scope (the instance is not part of the key; the
+# filename pattern is)
+@lru_cache(maxsize=4096)
+def _normalize_filename(safe_pattern: "re.Pattern[str]", filename: str, max_length: int) -> str:
+    """Normalize a filename, see Normalizer.normalize_filename."""
+    # Remove extension if present (same rule as pathlib's stem/suffix,
+    # without building a Path)
+    name = os.path.basename(filename.rstrip("/"))
+    dot = name.rfind(".")
+    if 0 < dot < len(name) - 1:
+        name, ext = name[:dot], name[dot:]
+    else:
+        ext = ""
+        if name == ".":
+            name = ""
+
+    # Replace unsafe characters with underscores
+    safe_name = safe_pattern.sub("_", name)
+
+    # Remove leading/trailing underscores and spaces
+    safe_name = safe_name.strip("_").strip()
+
+    # Collapse multiple underscores
+    safe_name = _UNDERSCORES_RE.sub("_", safe_name)
+
+    # Ensure it's not empty
+    if not safe_name:
+        safe_name = "untitled"
+
+    # Truncate if too long (leave room for extension and counter if needed)
+    if len(safe_name) > max_length:
+        safe_name = safe_name[:max_length]
+
+    # Add extension back
+    return f"{safe_name}{ext or '.pdf'}"
+
+
+@lru_cache(maxsize=4096)
+def _normalize_tag(tag: str) -> str:
+    """Normalize a single tag, see Normalizer.normalize_tag."""
+    # Convert to lowercase
+    normalized = tag.lower().strip()
+
+    if normalized.isascii():
+        # Replace spaces with hyphens and remove special characters
+        normalized = normalized.translate(_TAG_ASCII_TABLE)
+    else:
+        normalized = _TAG_UNSAFE_RE.sub("", normalized.replace(" ", "-"))
+
+    # Collapse multiple hyphens (runs are rare and short)
+    while "--" in normalized:
+        normalized = normalized.replace("--", "-")
+
+    # Remove leading/trailing hyphens
+    return normalized.strip("-")
+
 
 class Normalizer:
     """Normalizes output for safe filenames and controlled tags."""
@@ -16,6 +86,15 @@ class Normalizer:
     def __init__(self, config: Config = None):
         """Initialize normalizer."""
         self.config = config or get_config()
+        self._safe_pattern = self._compile_safe_pattern()
+
+    def _compile_safe_pattern(self) -> "re.Pattern[str]":
+        """Compile the configured unsafe-character pattern, recompiling only if it changed."""
+        pattern = self.config.safe_filename_pattern
+        compiled = getattr(self, "_safe_pattern", None)
+        if compiled is None or compiled.pattern != pattern:
+            compiled = re.compile(pattern)
+        return compiled
 
     def normalize_filename(self, filename: str, max_length: int = 200) -> str:
         """
@@ -28,29 +107,8 @@ class Normalizer:
         Returns:
             Safe filename
         """
-        # Remove extension if present
-        name, ext = Path(filename).stem, Path(filename).suffix
-
-        # Replace unsafe characters with underscores
-        pattern = self.config.safe_filename_pattern
-        safe_name = re.sub(pattern, "_", name)
-
-        # Remove leading/trailing underscores and spaces
-        safe_name = safe_name.strip("_").strip()
-
-        # Collapse multiple underscores
-        safe_name = re.sub(r"_+", "_", safe_name)
-
-        # Ensure it's not empty
-        if not safe_name:
-            safe_name = "untitled"
-
-        # Truncate if too long (leave room for extension and counter if needed)
-        if len(safe_name) > max_length:
-            safe_name = safe_name[:max_length]
-
-        # Add extension back
-        return f"{safe_name}{ext or '.pdf'}"
+        self._safe_pattern = self._compile_safe_pattern()
+        return _normalize_filename(self._safe_pattern, filename, max_length)
 
     def normalize_tag(self, tag: str) -> str:
         """
@@ -62,22 +120,7 @@ class Normalizer:
         Returns:
             Normalized tag
         """
-        # Convert to lowercase
-        normalized = tag.lower().strip()
-
-        # Replace spaces with hyphens
-        normalized = normalized.replace(" ", "-")
-
-        # Remove special characters except hyphens
-        normalized = re.sub(r"[^a-z0-9\-]", "", normalized)
-
-        # Collapse multiple hyphens
-        normalized = re.sub(r"-+", "-", normalized)
-
-        # Remove leading/trailing hyphens
-        normalized = normalized.strip("-")
-
-        return normalized
+        return _normalize_tag(tag)
 
     def normalize_tags(self, tags: List[str]) -> List[str]:
         """
@@ -89,17 +132,8 @@ class Normalizer:
         Returns:
             List of normalized, deduplicated tags
         """
-        normalized = [self.normalize_tag(tag) for tag in tags]
-
         # Remove empty tags and duplicates while preserving order
-        seen = set()
-        result = []
-        for tag in normalized:
-            if tag and tag not in seen:
-                seen.add(tag)
-                result.append(tag)
-
-        return result
+        return list(dict.fromkeys(tag for tag in map(_normalize_tag, tags) if tag))
 
     def create_archive_path(
         self,
@@ -151,10 +185,13 @@ class Normalizer:
             stem = archive_path.stem
             ext = archive_path.suffix
 
-            while archive_path.exists():
-                new_name = f"{stem}_{counter}{ext}"
-                archive_path = archive_path.parent / new_name
+            # One directory listing instead of a stat per taken counter
+            with os.scandir(archive_path.parent) as entries:
+                taken = {entry.name for entry in entries}
+
+            while f"{stem}_{counter}{ext}" in taken:
                 counter += 1
+            archive_path = archive_path.parent / f"{stem}_{counter}{ext}"
 
         return archive_path
 
@@ -169,11 +206,22 @@ class Normalizer:
         Returns:
             Sanitized title
         """
-        # Remove extra whitespace
-        sanitized = " ".join(title.split())
+        # Remove extra whitespace. Printable ASCII has no whitespace but the
+        # space, so a title without double or edge spaces is already clean.
+        if (
+            title.isascii()
+            and title.isprintable()
+            and "  " not in title
+            and not title.startswith(" ")
+            and not title.endswith(" ")
+        ):
+            sanitized = title
+        else:
+            sanitized = " ".join(title.split())
 
         # Truncate if needed
         if len(sanitized) > max_length:
-            sanitized = sanitized[:max_length].rsplit(" ", 1)[0] + "..."
+            head, space, _ = sanitized[:max_length].rpartition(" ")
+            sanitized = (head if space else sanitized[:max_length]) + "..."
 
         return sanitized
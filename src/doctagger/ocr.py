@@ -1,22 +1,148 @@
 """OCR processing using OCRmyPDF."""
 
+import io
 import logging
+import mmap
+import os
+import shutil
+import signal
 import subprocess
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import repeat
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+import pypdfium2 as pdfium
 
 from .config import Config, get_config
+from .extractor import PDFIUM_LOCK, _page_text
+
+try:
+    import ocrmypdf
+except ImportError:  # The ocrmypdf CLI is run per document instead
+    ocrmypdf = None
 
 logger = logging.getLogger(__name__)
 
+# Seconds a single OCR run may take
+_OCR_TIMEOUT = 300
+
+# Set in pool workers that lead their own process group, so a timed-out run
+# can kill the tesseract and Ghostscript processes it started
+_owns_process_group = False
+
+
+def _may_contain_text(pdf_path: Path) -> bool:
+    """
+    Cheap byte-level check for whether a PDF can have a text layer.
+
+    Showing text requires a /Font resource, whose key is either written in
+    plain bytes or hidden inside a compressed object stream (/ObjStm). A file
+    with neither (typically a plain scan) cannot contain text, so it needs no
+    parse. The converse does not hold: content streams are usually
+    compressed, so finding these markers proves nothing.
+
+    Args:
+        pdf_path: Path to the PDF file
+
+    Returns:
+        False if the PDF certainly has no text, True if it might
+    """
+    with open(pdf_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        return data.find(b"/Font") != -1 or data.find(b"/ObjStm") != -1
+
+
+def _init_ocr_worker() -> None:
+    """Make a pool worker the leader of a new process group (POSIX only)."""
+    global _owns_process_group
+    if hasattr(os, "setpgid"):
+        os.setpgid(0, 0)
+        _owns_process_group = True
+
+
+def _ocr_timed_out(signum: int, frame: Any) -> None:
+    """Stop a pool worker's OCR run when its time is up (SIGALRM handler)."""
+    if _owns_process_group:
+        # Kill the run's subprocesses, which are in this worker's group, while
+        # the worker itself ignores the signal and stays in the pool
+        previous = signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        try:
+            os.killpg(0, signal.SIGTERM)
+        finally:
+            signal.signal(signal.SIGTERM, previous)
+    raise TimeoutError("OCR run timed out")
+
+
+def _ocr_in_worker(
+    input_path: Path, output_path: Optional[Path], options: Dict[str, Any], timeout: float
+) -> Tuple[int, Optional[bytes], str]:
+    """
+    Run ocrmypdf's Python API in a pool worker process.
+
+    The timeout starts when the worker picks up the job, so time spent queued
+    behind other documents does not count against it.
+
+    Args:
+        input_path: Path to input PDF
+        output_path: Path for output PDF (if None, the PDF is returned)
+        options: Keyword arguments for ocrmypdf.ocr
+        timeout: Seconds the run may take (enforced where SIGALRM exists)
+
+    Returns:
+        ocrmypdf's exit code, the output PDF if output_path is None, and the
+        error message
+
+    Raises:
+        TimeoutError: If the run takes longer than timeout
+    """
+    output = io.BytesIO() if output_path is None else output_path
+    # Signal handlers can only be set in the main thread, where pool workers run
+    timed = (
+        hasattr(signal, "setitimer")
+        and threading.current_thread() is threading.main_thread()
+    )
+    if timed:
+        previous = signal.signal(signal.SIGALRM, _ocr_timed_out)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        ocrmypdf.ocr(input_path, output, **options)
+    except ocrmypdf.exceptions.ExitCodeException as e:
+        return int(e.exit_code), None, str(e)
+    finally:
+        if timed:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+    return 0, output.getvalue() if output_path is None else None, ""
+
 
 class OCRProcessor:
     """Handles OCR processing of PDF files."""
 
+    # Long-lived ocrmypdf worker processes shared by all instances, so the
+    # interpreter start and ocrmypdf import are paid once per worker rather
+    # than once per document
+    _pool: Optional[ProcessPoolExecutor] = None
+    _pool_lock = threading.Lock()
+
     def __init__(self, config: Optional[Config] = None):
         """Initialize OCR processor."""
         self.config = config or get_config()
 
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        """Return the shared worker pool, or None to run the ocrmypdf CLI per document."""
+        workers = self.config.ocr.workers
+        if ocrmypdf is None or workers == 0:
+            return None
+        with OCRProcessor._pool_lock:
+            if OCRProcessor._pool is None:
+                OCRProcessor._pool = ProcessPoolExecutor(
+                    max_workers=workers or max(1, (os.cpu_count() or 1) // 2),
+                    initializer=_init_ocr_worker,
+                )
+            return OCRProcessor._pool
+
     def needs_ocr(self, pdf_path: Path) -> bool:
         """
         Check if a PDF needs OCR processing.
@@ -36,15 +162,18 @@ class OCRProcessor:
         if not self.config.ocr.skip_if_exists:
             return True
 
-        # Check if PDF already has text using pdfplumber
+        # Check if PDF already has text, reading PDFium's raw text layer
+        # (no layout analysis, which is all this check needs)
         try:
-            import pdfplumber
+            if not _may_contain_text(pdf_path):
+                logger.info("PDF has no fonts, OCR needed")
+                return True
 
-            with pdfplumber.open(pdf_path) as pdf:
+            with PDFIUM_LOCK, pdfium.PdfDocument(pdf_path) as pdf:
                 # Check first few pages for text
-                for page_num, page in enumerate(pdf.pages[:3], 1):
-                    text = page.extract_text()
-                    if text and len(text.strip()) > 50:
+                for page_num in range(1, min(len(pdf), 3) + 1):
+                    text = _page_text(pdf, page_num - 1)
+                    if len(text.strip()) > self.config.ocr.skip_text_threshold:
                         logger.info(
                             f"PDF already has text content (page {page_num}), skipping OCR"
                         )
@@ -54,33 +183,49 @@ class OCRProcessor:
             logger.warning(f"Error checking PDF text content: {e}")
             return True
 
-    def process(self, input_path: Path, output_path: Optional[Path] = None) -> Path:
+    def process_many(
+        self,
+        input_paths: List[Path],
+        output_paths: Optional[List[Optional[Path]]] = None,
+        max_workers: Optional[int] = None,
+    ) -> List[Path]:
         """
-        Process a PDF with OCR.
+        OCR several PDFs with concurrent ocrmypdf processes.
+
+        The CPU cores are split between the processes (ocrmypdf --jobs), so
+        running files side by side does not oversubscribe the machine while
+        still using cores a single small file would leave idle.
 
         Args:
-            input_path: Path to input PDF
-            output_path: Path for output PDF (if None, overwrites input)
+            input_paths: Paths to input PDFs
+            output_paths: Paths for output PDFs, parallel to input_paths
+                (if None, or an entry is None, the input is overwritten)
+            max_workers: Concurrent ocrmypdf processes (defaults to half the
+                CPU cores)
 
         Returns:
-            Path to processed PDF
+            Paths to processed PDFs in the same order as the inputs
 
         Raises:
-            RuntimeError: If OCR processing fails
+            RuntimeError: If OCR processing of any PDF fails
         """
-        if output_path is None:
-            output_path = input_path
+        if output_paths is None:
+            output_paths = [None] * len(input_paths)
+        if len(output_paths) != len(input_paths):
+            raise ValueError("output_paths must be parallel to input_paths")
+        if not input_paths:
+            return []
 
-        if not self.needs_ocr(input_path):
-            logger.info(f"Skipping OCR for {input_path.name}")
-            if output_path != input_path:
-                import shutil
-
-                shutil.copy2(input_path, output_path)
-            return output_path
+        cpus = os.cpu_count() or 1
+        workers = min(max_workers or max(1, cpus // 2), len(input_paths))
+        jobs = max(1, cpus // workers)
+        logger.info(f"Running OCR on {len(input_paths)} PDFs with {workers} processes")
 
-        logger.info(f"Starting OCR processing for {input_path.name}")
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self.process, input_paths, output_paths, repeat(jobs)))
 
+    def _build_command(self, input_path: Path, output: str, jobs: Optional[int]) -> List[str]:
+        """Build the ocrmypdf command line ("-" as output writes to stdout)."""
         # Build OCRmyPDF command
         cmd = [
             "ocrmypdf",
@@ -95,43 +240,170 @@ class OCRProcessor:
         # Add optimization for faster processing
         cmd.extend(["--optimize", "1"])
 
+        if jobs is None:
+            jobs = self.config.ocr.jobs
+        if jobs is not None:
+            cmd.extend(["--jobs", str(jobs)])
+
         # Add input and output paths
-        cmd.extend([str(input_path), str(output_path)])
+        cmd.extend([str(input_path), output])
+        return cmd
 
+    def _api_options(self, jobs: Optional[int]) -> Dict[str, Any]:
+        """Build the ocrmypdf.ocr options matching _build_command."""
+        options: Dict[str, Any] = {
+            "language": self.config.ocr.language.split("+"),
+            "deskew": self.config.ocr.deskew,
+            "optimize": 1,
+            "progress_bar": False,
+            # Pages are OCR'd by tesseract subprocesses, so threads suffice and
+            # no process pool is nested inside the pool worker
+            "use_threads": True,
+        }
+        options["skip_text" if self.config.ocr.skip_if_exists else "force_ocr"] = True
+
+        if jobs is None:
+            jobs = self.config.ocr.jobs
+        if jobs is not None:
+            options["jobs"] = jobs
+        return options
+
+    def _run_ocr(
+        self, input_path: Path, output_path: Optional[Path], jobs: Optional[int]
+    ) -> Tuple[int, Optional[bytes]]:
+        """
+        Run ocrmypdf on a worker of the shared pool, or as a CLI process.
+
+        Args:
+            input_path: Path to input PDF
+            output_path: Path for output PDF (if None, the PDF is returned)
+            jobs: CPU cores ocrmypdf may use (defaults to config.ocr.jobs)
+
+        Returns:
+            ocrmypdf's exit code (0, or 6 if the PDF already has text) and the
+            output PDF if output_path is None
+
+        Raises:
+            RuntimeError: If OCR processing fails
+        """
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=300,  # 5 minute timeout
-                check=False,
-            )
-
-            if result.returncode == 0:
-                logger.info(f"OCR completed successfully for {input_path.name}")
-                return output_path
-            elif result.returncode == 6:
-                # OCRmyPDF returns 6 if the PDF already has text and --skip-text is used
-                logger.info(f"PDF already has text, no OCR needed: {input_path.name}")
-                if output_path != input_path:
-                    import shutil
-
-                    shutil.copy2(input_path, output_path)
-                return output_path
+            pool = self._get_pool()
+            if pool is not None:
+                try:
+                    future = pool.submit(
+                        _ocr_in_worker,
+                        input_path,
+                        output_path,
+                        self._api_options(jobs),
+                        _OCR_TIMEOUT,
+                    )
+                    # The worker enforces the timeout from when the run starts
+                    returncode, output, error = future.result()
+                except BrokenProcessPool:
+                    # A crashed worker breaks the pool; start a new one next time
+                    with OCRProcessor._pool_lock:
+                        if OCRProcessor._pool is pool:
+                            OCRProcessor._pool = None
+                    raise
             else:
-                error_msg = f"OCR failed with code {result.returncode}: {result.stderr}"
-                logger.error(error_msg)
-                raise RuntimeError(error_msg)
+                output_arg = "-" if output_path is None else str(output_path)
+                try:
+                    result = subprocess.run(
+                        self._build_command(input_path, output_arg, jobs),
+                        capture_output=True,
+                        timeout=_OCR_TIMEOUT,
+                        check=False,
+                    )
+                except FileNotFoundError:
+                    error_msg = "ocrmypdf not found. Please install: pip install ocrmypdf"
+                    logger.error(error_msg)
+                    raise RuntimeError(error_msg)
+                returncode = result.returncode
+                output = result.stdout if output_path is None else None
+                error = result.stderr.decode(errors="replace")
 
-        except subprocess.TimeoutExpired:
+        except (subprocess.TimeoutExpired, TimeoutError):
             error_msg = f"OCR timeout for {input_path.name}"
             logger.error(error_msg)
             raise RuntimeError(error_msg)
-        except FileNotFoundError:
-            error_msg = "ocrmypdf not found. Please install: pip install ocrmypdf"
-            logger.error(error_msg)
-            raise RuntimeError(error_msg)
+        except RuntimeError:
+            raise
         except Exception as e:
             error_msg = f"OCR processing error: {e}"
             logger.error(error_msg)
             raise RuntimeError(error_msg)
+
+        # OCRmyPDF returns 6 if the PDF already has text and --skip-text is used
+        if returncode not in (0, 6):
+            error_msg = f"OCR failed with code {returncode}: {error}"
+            logger.error(error_msg)
+            raise RuntimeError(error_msg)
+        return returncode, output
+
+    def process_to_bytes(self, input_path: Path, jobs: Optional[int] = None) -> Optional[bytes]:
+        """
+        Process a PDF with OCR, returning the output PDF instead of writing it.
+
+        ocrmypdf writes the result to stdout (or a buffer, in a pool worker),
+        so it can go straight to text extraction and the metadata writer
+        without a temp file round trip.
+
+        Args:
+            input_path: Path to input PDF
+            jobs: CPU cores ocrmypdf may use (defaults to config.ocr.jobs)
+
+        Returns:
+            The OCR'd PDF, or None if the input needs no OCR (use it as is)
+
+        Raises:
+            RuntimeError: If OCR processing fails
+        """
+        if not self.needs_ocr(input_path):
+            logger.info(f"Skipping OCR for {input_path.name}")
+            return None
+
+        logger.info(f"Starting OCR processing for {input_path.name}")
+        returncode, output = self._run_ocr(input_path, None, jobs)
+
+        if returncode == 6:
+            logger.info(f"PDF already has text, no OCR needed: {input_path.name}")
+            return None
+        logger.info(f"OCR completed successfully for {input_path.name}")
+        return output
+
+    def process(
+        self, input_path: Path, output_path: Optional[Path] = None, jobs: Optional[int] = None
+    ) -> Path:
+        """
+        Process a PDF with OCR.
+
+        Args:
+            input_path: Path to input PDF
+            output_path: Path for output PDF (if None, overwrites input)
+            jobs: CPU cores ocrmypdf may use (defaults to config.ocr.jobs)
+
+        Returns:
+            Path to processed PDF
+
+        Raises:
+            RuntimeError: If OCR processing fails
+        """
+        if output_path is None:
+            output_path = input_path
+
+        if not self.needs_ocr(input_path):
+            logger.info(f"Skipping OCR for {input_path.name}")
+            if output_path != input_path:
+                shutil.copy2(input_path, output_path)
+            return output_path
+
+        logger.info(f"Starting OCR processing for {input_path.name}")
+        returncode, _ = self._run_ocr(input_path, output_path, jobs)
+
+        if returncode == 6:
+            logger.info(f"PDF already has text, no OCR needed: {input_path.name}")
+            if output_path != input_path:
+                shutil.copy2(input_path, output_path)
+        else:
+            logger.info(f"OCR completed successfully for {input_path.name}")
+        return output_path
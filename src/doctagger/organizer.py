@@ -1,17 +1,57 @@
 """File organization and archiving."""
 
+import errno
 import json
 import logging
+import os
 import shutil
+import sqlite3
+import sys
+from contextlib import closing
 from datetime import datetime
+from itertools import chain
 from pathlib import Path
-from typing import List, Optional
+from typing import List, NamedTuple, Optional, Tuple
 
 from .config import Config, get_config
 from .models import ProcessingResult
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; stdlib json is used otherwise
+    orjson = None
+
+try:
+    import Cocoa
+    import objc
+    from Foundation import NSURL
+except ImportError:  # Finder tags need pyobjc (macOS only)
+    Cocoa = None
+    objc = None
+    NSURL = None
+
 logger = logging.getLogger(__name__)
 
+# Content-hash index of archived documents, kept in the archive folder
+INDEX_FILENAME = ".doctagger_index.sqlite"
+
+_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    content_hash TEXT PRIMARY KEY,
+    archive_path TEXT NOT NULL,
+    sidecar_path TEXT,
+    processed_at TIMESTAMP NOT NULL
+)
+"""
+
+
+class IndexEntry(NamedTuple):
+    """An archived document found by content hash."""
+
+    archive_path: Path
+    sidecar_path: Optional[Path]
+    processed_at: datetime
+
 
 class FileOrganizer:
     """Handles file organization and archiving."""
@@ -40,9 +80,15 @@ class FileOrganizer:
             # Create parent directories
             archive_path.parent.mkdir(parents=True, exist_ok=True)
 
-            # Move the file
+            # Move the file: a single rename within one filesystem, falling
+            # back to shutil's copy-and-delete across devices
             logger.info(f"Moving {source_path.name} to {archive_path}")
-            shutil.move(str(source_path), str(archive_path))
+            try:
+                os.replace(source_path, archive_path)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                shutil.move(str(source_path), str(archive_path))
 
             return archive_path
 
@@ -82,16 +128,24 @@ class FileOrganizer:
                 "processing_time": result.processing_time,
                 "timestamp": result.timestamp.isoformat(),
                 "content_hash": result.content_hash,
-                "metadata": result.metadata.dict() if result.metadata else None,
-                "tagging": result.tagging.dict() if result.tagging else None,
+                "metadata": result.metadata.model_dump() if result.metadata else None,
+                "tagging": result.tagging.model_dump() if result.tagging else None,
                 "embedding": result.embedding,
                 "embedding_model": result.embedding_model,
                 "error": result.error,
             }
 
-            # Write JSON
-            with open(sidecar_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            # Write JSON (orjson serializes the embedding floats natively)
+            if orjson is not None:
+                with open(sidecar_path, "wb") as f:
+                    f.write(
+                        orjson.dumps(
+                            data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+                        )
+                    )
+            else:
+                with open(sidecar_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
 
             logger.info(f"Wrote sidecar file: {sidecar_path.name}")
             return sidecar_path
@@ -112,58 +166,149 @@ class FileOrganizer:
         Returns:
             True if successful, False otherwise
         """
+        return self.apply_macos_tags_batch([(file_path, tags)])[0]
+
+    def apply_macos_tags_batch(self, files: List[Tuple[Path, List[str]]]) -> List[bool]:
+        """
+        Apply macOS Finder tags to several files.
+
+        Args:
+            files: (file path, tag names) pairs
+
+        Returns:
+            Whether tagging succeeded, for each file in order
+        """
         if not self.config.macos_tags.enabled:
-            return False
+            return [False] * len(files)
 
-        try:
-            import sys
+        if sys.platform != "darwin":
+            logger.warning("macOS tags are only supported on macOS")
+            return [False] * len(files)
+
+        if Cocoa is None:
+            logger.warning("pyobjc not installed. Install with: pip install 'doctagger[macos]'")
+            return [False] * len(files)
 
-            if sys.platform != "darwin":
-                logger.warning("macOS tags are only supported on macOS")
+        # One autorelease pool for the batch, so the NSURLs and tag arrays
+        # created per file are released together rather than accumulating
+        with objc.autorelease_pool():
+            return [self._set_macos_tags(file_path, tags) for file_path, tags in files]
+
+    def _set_macos_tags(self, file_path: Path, tags: List[str]) -> bool:
+        """Merge tags into a file's Finder tags (macOS with pyobjc only)."""
+        try:
+            url = NSURL.fileURLWithPath_(str(file_path))
+
+            # Get existing tags
+            existing_tags, error = url.resourceValuesForKeys_error_(
+                [Cocoa.NSURLTagNamesKey], None
+            )
+
+            if error:
+                logger.warning(f"Could not read existing tags: {error}")
+                existing_tags = {}
+
+            # Merge with new tags, skipping the write if nothing is new
+            current_tags = list(existing_tags.get(Cocoa.NSURLTagNamesKey, []))
+            all_tags = list(dict.fromkeys(chain(current_tags, tags)))
+            if len(all_tags) == len(current_tags):
+                logger.debug(f"macOS tags already present on {file_path.name}")
+                return True
+
+            # Set tags
+            success, error = url.setResourceValue_forKey_error_(
+                all_tags, Cocoa.NSURLTagNamesKey, None
+            )
+
+            if success:
+                logger.info(f"Applied macOS tags to {file_path.name}: {tags}")
+                return True
+            else:
+                logger.warning(f"Failed to set tags: {error}")
                 return False
 
-            # Import macOS-specific modules
-            try:
-                import Cocoa
-                from Foundation import NSURL
+        except Exception as e:
+            logger.warning(f"Failed to apply macOS tags: {e}")
+            return False
 
-                # Convert tags to NSArray
-                url = NSURL.fileURLWithPath_(str(file_path))
+    @property
+    def index_path(self) -> Path:
+        """Path of the content-hash index database."""
+        return self.config.archive_folder / INDEX_FILENAME
 
-                # Get existing tags
-                existing_tags, error = url.resourceValuesForKeys_error_(
-                    [Cocoa.NSURLTagNamesKey], None
-                )
+    def _connect_index(self) -> sqlite3.Connection:
+        """Open the index database, creating its table if needed."""
+        conn = sqlite3.connect(self.index_path, timeout=30)
+        conn.execute(_INDEX_SCHEMA)
+        return conn
 
-                if error:
-                    logger.warning(f"Could not read existing tags: {error}")
-                    existing_tags = {}
+    def lookup_hash(self, content_hash: str) -> Optional[IndexEntry]:
+        """
+        Find an archived document by content hash.
 
-                # Merge with new tags
-                current_tags = list(existing_tags.get(Cocoa.NSURLTagNamesKey, []))
-                all_tags = list(set(current_tags + tags))
+        A primary-key lookup in the archive's index, instead of reading every
+        sidecar in the archive. Entries whose PDF no longer exists are dropped.
 
-                # Set tags
-                success, error = url.setResourceValue_forKey_error_(
-                    all_tags, Cocoa.NSURLTagNamesKey, None
-                )
+        Args:
+            content_hash: SHA-256 hash of the PDF's content
 
-                if success:
-                    logger.info(f"Applied macOS tags to {file_path.name}: {tags}")
-                    return True
-                else:
-                    logger.warning(f"Failed to set tags: {error}")
-                    return False
+        Returns:
+            The archived document, or None if there is none
+        """
+        if not self.index_path.exists():
+            return None
 
-            except ImportError:
-                logger.warning(
-                    "pyobjc not installed. Install with: pip install 'doctagger[macos]'"
+        try:
+            with closing(self._connect_index()) as conn:
+                row = conn.execute(
+                    "SELECT archive_path, sidecar_path, processed_at FROM documents "
+                    "WHERE content_hash = ?",
+                    (content_hash,),
+                ).fetchone()
+                if row is None:
+                    return None
+
+                archive_path = Path(row[0])
+                if not archive_path.exists():
+                    with conn:
+                        conn.execute(
+                            "DELETE FROM documents WHERE content_hash = ?", (content_hash,)
+                        )
+                    return None
+
+                return IndexEntry(
+                    archive_path=archive_path,
+                    sidecar_path=Path(row[1]) if row[1] else None,
+                    processed_at=datetime.fromisoformat(row[2]),
                 )
-                return False
+        except Exception as e:
+            logger.warning(f"Failed to look up content hash in index: {e}")
+            return None
+
+    def index_document(self, result: ProcessingResult) -> None:
+        """
+        Record an archived document in the content-hash index.
+
+        Args:
+            result: Processing result with content_hash and archive_path set
+        """
+        if not result.content_hash or not result.archive_path:
+            return
 
+        try:
+            self.config.archive_folder.mkdir(parents=True, exist_ok=True)
+            with closing(self._connect_index()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?)",
+                    (
+                        result.content_hash,
+                        str(result.archive_path),
+                        str(result.sidecar_path) if result.sidecar_path else None,
+                        result.timestamp.isoformat(),
+                    ),
+                )
         except Exception as e:
-            logger.warning(f"Failed to apply macOS tags: {e}")
-            return False
+            logger.warning(f"Failed to update archive index: {e}")
 
     def cleanup_temp_files(self, temp_path: Path) -> None:
         """
@@ -173,12 +318,15 @@ class FileOrganizer:
             temp_path: Path to temporary file or directory
         """
         try:
-            if temp_path.exists():
-                if temp_path.is_file():
-                    temp_path.unlink()
-                    logger.debug(f"Deleted temp file: {temp_path}")
-                elif temp_path.is_dir():
-                    shutil.rmtree(temp_path)
-                    logger.debug(f"Deleted temp directory: {temp_path}")
+            # Try the common case (a file) first instead of stat-ing up front
+            try:
+                temp_path.unlink(missing_ok=True)
+                logger.debug(f"Deleted temp file: {temp_path}")
+            except (IsADirectoryError, PermissionError):
+                # unlink() on a directory fails with EISDIR (Linux) or EPERM (macOS)
+                if not temp_path.is_dir():
+                    raise
+                shutil.rmtree(temp_path)
+                logger.debug(f"Deleted temp directory: {temp_path}")
         except Exception as e:
             logger.warning(f"Failed to cleanup temp files: {e}")
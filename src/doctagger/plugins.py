@@ -20,9 +20,13 @@ Example plugin:
 
     register_plugin(MyCustomProcessor())
     ```
+
+Modules loaded with load_plugins_from_directory() may list their plugin
+classes in a module-level ``__plugins__`` list instead of being scanned.
 """
 
 import logging
+import os
 from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Type
@@ -253,28 +257,43 @@ class PluginRegistry:
         self._extractors: Dict[str, MetadataExtractorPlugin] = {}
         self._llm_providers: Dict[str, LLMProviderPlugin] = {}
         self._hooks: Dict[str, List[Callable]] = {}
+        # Plugin name -> the registry dicts holding it (one per plugin type)
+        self._index: Dict[str, List[Dict[str, BasePlugin]]] = {}
+        # Processors sorted by priority, rebuilt after (un)registration
+        self._processors_by_priority: Optional[List[ProcessorPlugin]] = None
+
+    def _index_plugin(self, plugin: BasePlugin, registry: Dict[str, BasePlugin]) -> None:
+        """Record which registry dict holds a plugin, for unregister."""
+        registries = self._index.setdefault(plugin.name, [])
+        if not any(held is registry for held in registries):
+            registries.append(registry)
 
     def register_processor(self, plugin: ProcessorPlugin) -> None:
         """Register a processor plugin."""
         self._processors[plugin.name] = plugin
+        self._index_plugin(plugin, self._processors)
+        self._processors_by_priority = None
         plugin.on_load()
         logger.info(f"Registered processor plugin: {plugin.name} v{plugin.version}")
 
     def register_storage(self, plugin: StoragePlugin) -> None:
         """Register a storage plugin."""
         self._storage[plugin.name] = plugin
+        self._index_plugin(plugin, self._storage)
         plugin.on_load()
         logger.info(f"Registered storage plugin: {plugin.name} v{plugin.version}")
 
     def register_extractor(self, plugin: MetadataExtractorPlugin) -> None:
         """Register a metadata extractor plugin."""
         self._extractors[plugin.name] = plugin
+        self._index_plugin(plugin, self._extractors)
         plugin.on_load()
         logger.info(f"Registered extractor plugin: {plugin.name} v{plugin.version}")
 
     def register_llm_provider(self, plugin: LLMProviderPlugin) -> None:
         """Register an LLM provider plugin."""
         self._llm_providers[plugin.name] = plugin
+        self._index_plugin(plugin, self._llm_providers)
         plugin.on_load()
         logger.info(f"Registered LLM provider plugin: {plugin.name} v{plugin.version}")
 
@@ -300,18 +319,39 @@ class PluginRegistry:
         Returns:
             True if unregistered
         """
-        for registry in [self._processors, self._storage, self._extractors, self._llm_providers]:
-            if plugin_name in registry:
-                plugin = registry.pop(plugin_name)
-                plugin.on_unload()
-                logger.info(f"Unregistered plugin: {plugin_name}")
-                return True
-        return False
+        registries = self._index.get(plugin_name)
+        if not registries:
+            return False
+
+        # A name used by several plugin types is removed one type per call
+        registry = next(
+            registry
+            for registry in (self._processors, self._storage, self._extractors, self._llm_providers)
+            if any(held is registry for held in registries)
+        )
+        registries[:] = [held for held in registries if held is not registry]
+        if not registries:
+            del self._index[plugin_name]
+
+        plugin = registry.pop(plugin_name)
+        if registry is self._processors:
+            self._processors_by_priority = None
+        plugin.on_unload()
+        logger.info(f"Unregistered plugin: {plugin_name}")
+        return True
 
     def get_processors(self) -> List[ProcessorPlugin]:
-        """Get all enabled processor plugins sorted by priority."""
-        plugins = [p for p in self._processors.values() if p.enabled]
-        return sorted(plugins, key=lambda p: p.priority)
+        """
+        Get all enabled processor plugins sorted by priority.
+
+        The sort is cached until a processor is registered or unregistered,
+        so priorities are read at registration; enabled is checked per call.
+        """
+        if self._processors_by_priority is None:
+            self._processors_by_priority = sorted(
+                self._processors.values(), key=lambda p: p.priority
+            )
+        return [p for p in self._processors_by_priority if p.enabled]
 
     def get_storage(self, name: str) -> Optional[StoragePlugin]:
         """Get a storage plugin by name."""
@@ -398,24 +438,36 @@ def load_plugins_from_directory(plugins_dir: Path) -> int:
 
     count = 0
 
-    if not plugins_dir.exists():
+    try:
+        with os.scandir(plugins_dir) as entries:
+            plugin_files = [
+                entry
+                for entry in entries
+                if entry.name.endswith(".py")
+                and not entry.name.startswith("_")
+                and entry.is_file()
+            ]
+    except (FileNotFoundError, NotADirectoryError):
         return count
 
-    for plugin_file in plugins_dir.glob("*.py"):
-        if plugin_file.name.startswith("_"):
-            continue
-
+    for plugin_file in plugin_files:
         try:
             spec = importlib.util.spec_from_file_location(
-                plugin_file.stem, plugin_file
+                plugin_file.name[:-3], plugin_file.path
             )
             if spec and spec.loader:
                 module = importlib.util.module_from_spec(spec)
                 spec.loader.exec_module(module)
 
-                # Look for plugin classes
-                for attr_name in dir(module):
-                    attr = getattr(module, attr_name)
+                # Use the module's __plugins__ list if it declares one,
+                # otherwise look for plugin classes among all its attributes
+                manifest = getattr(module, "__plugins__", None)
+                if manifest is not None:
+                    candidates = [(getattr(cls, "__name__", repr(cls)), cls) for cls in manifest]
+                else:
+                    candidates = [(name, getattr(module, name)) for name in dir(module)]
+
+                for attr_name, attr in candidates:
                     if (
                         isinstance(attr, type)
                         and issubclass(attr, BasePlugin)
@@ -429,6 +481,6 @@ def load_plugins_from_directory(plugins_dir: Path) -> int:
                             logger.error(f"Failed to instantiate plugin {attr_name}: {e}")
 
         except Exception as e:
-            logger.error(f"Failed to load plugin from {plugin_file}: {e}")
+            logger.error(f"Failed to load plugin from {plugin_file.path}: {e}")
 
     return count
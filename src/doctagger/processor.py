@@ -1,10 +1,25 @@
 """Main document processing pipeline."""
 
 import logging
+import multiprocessing
+import os
+import shutil
+import threading
 import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import contextmanager
+from itertools import islice
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
 
+from .cache import ResultCache
 from .config import Config, get_config
 from .extractor import TextExtractor
 from .llm import LLMTagger
@@ -15,21 +30,192 @@ from .ocr import OCRProcessor
 from .organizer import FileOrganizer
 from .utils import calculate_file_hash
 
+if TYPE_CHECKING:
+    from .embedder import DocumentEmbedder
+
 logger = logging.getLogger(__name__)
 
 
+class _PreparedDocument(NamedTuple):
+    """A document after OCR and text extraction, ready for LLM tagging."""
+
+    result: ProcessingResult
+    text: str
+    work_path: Union[Path, bytes]  # OCR'd copy (file or in-memory), or the original PDF
+    start_time: float
+
+
+# The DocumentProcessor of a process_many worker process
+_worker_processor: Optional["DocumentProcessor"] = None
+
+
+@contextmanager
+def _worker_log_queue() -> Iterator[Optional["multiprocessing.Queue"]]:
+    """
+    Collect log records from worker processes and emit them in this process.
+
+    Workers then never write to the console or log file themselves, so their
+    lines neither interleave nor contend for it. Yields None (workers keep
+    their inherited handlers) if the root logger has no handlers.
+    """
+    handlers = logging.getLogger().handlers
+    if not handlers:
+        yield None
+        return
+
+    queue = multiprocessing.Queue()
+    listener = QueueListener(queue, *handlers, respect_handler_level=True)
+    listener.start()
+    try:
+        yield queue
+    finally:
+        listener.stop()
+        queue.close()
+
+
+def _init_worker(
+    config: Config,
+    log_queue: Optional["multiprocessing.Queue"] = None,
+    log_level: int = logging.NOTSET,
+) -> None:
+    """Create the worker process's DocumentProcessor, loaded once and reused."""
+    global _worker_processor
+    if log_queue is not None:
+        root = logging.getLogger()
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+        root.addHandler(QueueHandler(log_queue))
+        root.setLevel(log_level)
+
+    # Worker processes exit without joining threads, so a background cleanup
+    # could be cut short
+    _worker_processor = DocumentProcessor(config, background_cleanup=False)
+    _worker_processor.preload_embedder()
+
+
+def _prepare_in_worker(pdf_path: Path, skip_ocr: bool) -> _PreparedDocument:
+    """OCR and extract one document in a worker process."""
+    return _worker_processor._prepare(pdf_path, skip_ocr)
+
+
+def _complete_in_worker(
+    prepared: _PreparedDocument,
+    tagging: Union[TaggingResult, BaseException, None],
+    skip_archive: bool,
+) -> ProcessingResult:
+    """Finish one tagged document in a worker process."""
+    # process_many applies macOS tags for the whole batch in the parent
+    return _worker_processor._complete(prepared, tagging, skip_archive, macos_tags=False)
+
+
 class DocumentProcessor:
     """Main pipeline for processing PDF documents."""
 
-    def __init__(self, config: Optional[Config] = None):
-        """Initialize document processor."""
+    def __init__(self, config: Optional[Config] = None, background_cleanup: bool = True):
+        """
+        Initialize document processor.
+
+        Args:
+            config: Configuration (defaults to the global config)
+            background_cleanup: Delete temp files on a background thread
+                instead of before returning each result
+        """
         self.config = config or get_config()
+        self.background_cleanup = background_cleanup
+        self._cleanup_pool: Optional[ThreadPoolExecutor] = None
+        self._cleanup_pool_lock = threading.Lock()
+        self.result_cache: Optional[ResultCache] = None
+        if self.config.cache_enabled:
+            ttl_hours = self.config.cache_ttl_hours
+            self.result_cache = ResultCache(
+                self.config.cache_folder or self.config.temp_folder / "cache",
+                tagging_ttl=ttl_hours * 3600 if ttl_hours is not None else None,
+            )
         self.ocr_processor = OCRProcessor(self.config)
-        self.text_extractor = TextExtractor()
-        self.llm_tagger = LLMTagger(self.config)
+        # Documents already run concurrently (process_batch threads, process_many
+        # workers), so each one's pages are extracted in-process
+        self.text_extractor = TextExtractor(workers=1, cache=self.result_cache)
+        self.llm_tagger = LLMTagger(self.config, cache=self.result_cache)
         self.normalizer = Normalizer(self.config)
         self.metadata_writer = MetadataWriter()
         self.file_organizer = FileOrganizer(self.config)
+        self._embedder: Optional["DocumentEmbedder"] = None
+
+    @property
+    def embedder(self) -> "DocumentEmbedder":
+        """Lazy-load the document embedder shared by all processed documents."""
+        if self._embedder is None:
+            from .embedder import DocumentEmbedder
+
+            self._embedder = DocumentEmbedder(
+                config=self.config,
+                model_name=self.config.embedding.model,
+            )
+        return self._embedder
+
+    @property
+    def cleanup_pool(self) -> ThreadPoolExecutor:
+        """Lazy-load the temp file cleanup pool, reused across documents."""
+        if self._cleanup_pool is None:
+            with self._cleanup_pool_lock:
+                if self._cleanup_pool is None:
+                    self._cleanup_pool = ThreadPoolExecutor(
+                        max_workers=2, thread_name_prefix="cleanup"
+                    )
+        return self._cleanup_pool
+
+    def close(self) -> None:
+        """Wait for pending temp file cleanup, shut down worker pools and close LLM connections."""
+        if self._cleanup_pool is not None:
+            self._cleanup_pool.shutdown(wait=True)
+            self._cleanup_pool = None
+        self.text_extractor.close()
+        self.llm_tagger.close()
+
+    def __enter__(self) -> "DocumentProcessor":
+        """Use the processor as a context manager that closes it on exit."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Close the processor."""
+        self.close()
+
+    def _cleanup(self, temp_path: Path) -> None:
+        """Delete a temp file, in the background unless disabled."""
+        if self.background_cleanup:
+            self.cleanup_pool.submit(self.file_organizer.cleanup_temp_files, temp_path)
+        else:
+            self.file_organizer.cleanup_temp_files(temp_path)
+
+    def preload_embedder(self) -> Optional[threading.Thread]:
+        """
+        Load the embedding model in a background thread.
+
+        Hides model load time behind OCR and LLM tagging of the first document.
+
+        Returns:
+            The loader thread, or None if embeddings are disabled
+        """
+        if not self.config.embedding.enabled:
+            return None
+
+        # Create the embedder here so only the model load runs concurrently
+        embedder = self.embedder
+        thread = threading.Thread(
+            target=self._load_embedding_model,
+            args=(embedder,),
+            name="embedder-preload",
+            daemon=True,
+        )
+        thread.start()
+        return thread
+
+    def _load_embedding_model(self, embedder: "DocumentEmbedder") -> None:
+        """Load the embedding model, logging instead of raising on failure."""
+        try:
+            embedder.load()
+        except Exception as e:
+            logger.warning("Embedding model preload failed: %s", e)
 
     def process(
         self,
@@ -50,16 +236,42 @@ class DocumentProcessor:
         Returns:
             ProcessingResult with processing details
         """
+        return self._process(pdf_path, skip_ocr, skip_archive, force_reprocess)
+
+    def _process(
+        self,
+        pdf_path: Path,
+        skip_ocr: bool = False,
+        skip_archive: bool = False,
+        force_reprocess: bool = False,
+        macos_tags: bool = True,
+    ) -> ProcessingResult:
+        """Run every step for one document (macos_tags=False leaves step 8 to the caller)."""
+        prepared = self._prepare(pdf_path, skip_ocr, force_reprocess)
+        if prepared.result.status != ProcessingStatus.PROCESSING:
+            return prepared.result
+
+        try:
+            tagging = self._tag(prepared)
+        except Exception as e:
+            return self._fail(prepared, e)
+
+        return self._finish(prepared, tagging, skip_archive, macos_tags)
+
+    def _prepare(
+        self, pdf_path: Path, skip_ocr: bool = False, force_reprocess: bool = False
+    ) -> _PreparedDocument:
+        """Hash, OCR and extract text from a document (the steps before LLM tagging)."""
         start_time = time.time()
         original_path = pdf_path.resolve()
 
-        logger.info(f"Starting processing: {pdf_path.name}")
+        logger.info("Starting processing: %s", pdf_path.name)
 
         # Calculate content hash for deduplication
         try:
             content_hash = calculate_file_hash(original_path)
         except Exception as e:
-            logger.warning(f"Failed to calculate file hash: {e}")
+            logger.warning("Failed to calculate file hash: %s", e)
             content_hash = None
 
         result = ProcessingResult(
@@ -68,11 +280,22 @@ class DocumentProcessor:
             content_hash=content_hash,
         )
 
+        # Skip documents whose content is already archived
+        if content_hash and not force_reprocess:
+            existing = self.file_organizer.lookup_hash(content_hash)
+            if existing is not None:
+                logger.info("Already archived as %s, skipping", existing.archive_path)
+                result.status = ProcessingStatus.SKIPPED
+                result.archive_path = existing.archive_path
+                result.sidecar_path = existing.sidecar_path
+                result.processing_time = time.time() - start_time
+                return _PreparedDocument(result, "", original_path, start_time)
+
+        # Step 1: OCR Processing (skip if using vision mode)
+        ocr_applied = False
+        text = ""
+
         try:
-            # Step 1: OCR Processing (skip if using vision mode)
-            ocr_applied = False
-            text = ""
-            
             if self.config.llm.vision_enabled:
                 # Vision mode: skip OCR and text extraction, use images directly
                 logger.info("Vision mode enabled - skipping OCR and text extraction")
@@ -80,52 +303,101 @@ class DocumentProcessor:
                 # Traditional mode: OCR if needed, then text extraction
                 if not skip_ocr and self.config.ocr.enabled:
                     try:
-                        # Create temp file for OCR output
-                        temp_path = self.config.temp_folder / f"ocr_{pdf_path.name}"
-                        self.ocr_processor.process(pdf_path, temp_path)
-                        ocr_applied = True
-                        pdf_path = temp_path  # Use OCR'd version for subsequent steps
+                        if self.config.ocr.in_memory:
+                            # OCR output goes straight to extraction and the
+                            # metadata writer, skipping a disk round trip
+                            ocr_output = self.ocr_processor.process_to_bytes(pdf_path)
+                            if ocr_output is not None:
+                                ocr_applied = True
+                                pdf_path = ocr_output  # Use OCR'd version for subsequent steps
+                        else:
+                            # Create temp file for OCR output
+                            temp_path = self.config.temp_folder / f"ocr_{pdf_path.name}"
+                            self.ocr_processor.process(pdf_path, temp_path)
+                            ocr_applied = True
+                            pdf_path = temp_path  # Use OCR'd version for subsequent steps
                         logger.info("OCR processing completed")
                     except Exception as e:
-                        logger.warning(f"OCR failed, continuing without OCR: {e}")
+                        logger.warning("OCR failed, continuing without OCR: %s", e)
 
                 # Step 2: Text Extraction
                 logger.info("Extracting text...")
                 text = self.text_extractor.extract(pdf_path)
 
-                if not text.strip():
+                if not text or text.isspace():
                     raise RuntimeError("No text could be extracted from the PDF")
 
             result.ocr_applied = ocr_applied
 
-            # Step 3: LLM Tagging
-            logger.info("Tagging with LLM...")
-            if self.config.llm.vision_enabled:
-                # Use vision model - send PDF images
-                tagging: TaggingResult = self.llm_tagger.tag_with_vision(original_path)
-            else:
-                # Use text-based tagging
-                tagging: TaggingResult = self.llm_tagger.tag(text)
+        except Exception as e:
+            prepared = _PreparedDocument(result, text, pdf_path, start_time)
+            self._fail(prepared, e)
+            return prepared
+
+        return _PreparedDocument(result, text, pdf_path, start_time)
+
+    def _tag(self, prepared: _PreparedDocument) -> TaggingResult:
+        """Step 3: LLM tagging of a prepared document."""
+        logger.info("Tagging with LLM...")
+        if self.config.llm.vision_enabled:
+            # Use vision model - send PDF images
+            return self.llm_tagger.tag_with_vision(prepared.result.original_path)
+        # Use text-based tagging
+        return self.llm_tagger.tag(prepared.text)
+
+    def _tag_or_exception(
+        self, prepared: _PreparedDocument
+    ) -> Union[TaggingResult, BaseException]:
+        """Tag a prepared document, returning the exception instead of raising it."""
+        try:
+            return self._tag(prepared)
+        except Exception as e:
+            return e
+
+    def _complete(
+        self,
+        prepared: _PreparedDocument,
+        tagging: Union[TaggingResult, BaseException, None],
+        skip_archive: bool,
+        macos_tags: bool = True,
+    ) -> ProcessingResult:
+        """Finish a tagged document, recording a failure from an earlier stage."""
+        if prepared.result.status != ProcessingStatus.PROCESSING:
+            return prepared.result
+        if isinstance(tagging, BaseException):
+            return self._fail(prepared, tagging)
+        return self._finish(prepared, tagging, skip_archive, macos_tags)
+
+    def _finish(
+        self,
+        prepared: _PreparedDocument,
+        tagging: TaggingResult,
+        skip_archive: bool,
+        macos_tags: bool = True,
+    ) -> ProcessingResult:
+        """Embed, write metadata and archive a tagged document (the steps after LLM tagging)."""
+        result, text, pdf_path, start_time = prepared
+        original_path = result.original_path
+        temp_with_metadata = None
+
+        try:
             result.tagging = tagging
 
             # Step 3.5: Generate Embedding (if enabled)
             if self.config.embedding.enabled:
                 logger.info("Generating embedding...")
                 try:
-                    from .embedder import DocumentEmbedder
-                    embedder = DocumentEmbedder(
-                        config=self.config,
-                        model_name=self.config.embedding.model,
-                    )
-                    
+                    embedder = self.embedder
+
                     # In vision mode, we don't have text, so use metadata for embedding
-                    if self.config.llm.vision_enabled or not text.strip():
+                    if self.config.llm.vision_enabled or not text or text.isspace():
                         # Generate embedding from metadata only
                         embedding = embedder.embed_with_metadata(
                             text=tagging.summary or "",  # Use summary as base text
                             title=tagging.title,
                             entities=tagging.entities,
                             tags=tagging.tags,
+                            max_chars=self.config.embedding.max_chars,
                         )
                     elif self.config.embedding.include_metadata:
                         # Generate embedding with enriched context
@@ -134,6 +406,7 @@ class DocumentProcessor:
                             title=tagging.title,
                             entities=tagging.entities,
                             tags=tagging.tags,
+                            max_chars=self.config.embedding.max_chars,
                         )
                     else:
                         # Generate embedding from text only
@@ -145,13 +418,13 @@ class DocumentProcessor:
                     if embedding:
                         result.embedding = embedding
                         result.embedding_model = self.config.embedding.model
-                        logger.info(f"Generated embedding ({len(embedding)} dimensions)")
+                        logger.info("Generated embedding (%d dimensions)", len(embedding))
                     else:
                         logger.warning("Embedding generation returned None")
                 except ImportError as e:
-                    logger.warning(f"Embedding skipped - sentence-transformers not installed: {e}")
+                    logger.warning("Embedding skipped - sentence-transformers not installed: %s", e)
                 except Exception as e:
-                    logger.warning(f"Embedding generation failed: {e}")
+                    logger.warning("Embedding generation failed: %s", e)
 
             # Step 4: Normalize Output
             logger.info("Normalizing output...")
@@ -166,12 +439,7 @@ class DocumentProcessor:
             )
             result.metadata = metadata
 
-            # Step 5: Apply Metadata to PDF
-            logger.info("Writing metadata to PDF...")
-            temp_with_metadata = self.config.temp_folder / f"meta_{pdf_path.name}"
-            self.metadata_writer.write_metadata(pdf_path, metadata, temp_with_metadata)
-
-            # Step 6: Determine Archive Path
+            # Step 5: Determine Archive Path
             if not skip_archive:
                 archive_path = self.normalizer.create_archive_path(
                     original_filename=original_path.name,
@@ -180,46 +448,246 @@ class DocumentProcessor:
                 )
                 result.archive_path = archive_path
 
+                # Written inside the archive folder, so the move is a rename
+                # even when temp_folder is on another filesystem
+                archive_path.parent.mkdir(parents=True, exist_ok=True)
+                temp_with_metadata = archive_path.with_name(f".{archive_path.name}.tmp")
+            else:
+                # Written beside the original, so it can be renamed over it
+                temp_with_metadata = original_path.with_name(f".{original_path.name}.tmp")
+
+            # Step 6: Apply Metadata to PDF
+            logger.info("Writing metadata to PDF...")
+            self.metadata_writer.write_metadata(pdf_path, metadata, temp_with_metadata)
+
+            if not skip_archive:
                 # Step 7: Move to Archive
-                logger.info(f"Moving to archive: {archive_path}")
+                logger.info("Moving to archive: %s", archive_path)
                 self.file_organizer.move_to_archive(temp_with_metadata, archive_path)
 
-                # Step 8: Apply macOS Tags (optional)
-                if self.config.macos_tags.enabled:
+                # Step 8: Apply macOS Tags (optional; batches tag all their
+                # documents at once, see _apply_macos_tags)
+                if macos_tags and self.config.macos_tags.enabled:
                     self.file_organizer.apply_macos_tags(archive_path, normalized_tags)
 
                 # Step 9: Write Sidecar JSON
                 sidecar_path = self.file_organizer.write_sidecar(archive_path, result)
                 result.sidecar_path = sidecar_path
 
-            else:
-                # If not archiving, write back to original location
-                self.metadata_writer.write_metadata(
-                    temp_with_metadata, metadata, original_path
-                )
+                # Step 10: Index the content hash, so duplicates are skipped
+                self.file_organizer.index_document(result)
 
-            # Step 10: Cleanup
-            if ocr_applied:
-                temp_path = self.config.temp_folder / f"ocr_{original_path.name}"
-                self.file_organizer.cleanup_temp_files(temp_path)
-            self.file_organizer.cleanup_temp_files(temp_with_metadata)
+            else:
+                # If not archiving, replace the original with the temp copy,
+                # which already carries the metadata (a rename, not a copy)
+                shutil.copymode(original_path, temp_with_metadata)
+                os.replace(temp_with_metadata, original_path)
+
+            # Step 11: Cleanup (off the hot path; the result doesn't depend on it)
+            if result.ocr_applied and isinstance(pdf_path, Path):
+                # The work path is the OCR temp file; reuse it rather than
+                # rebuilding it from the resolved name, which differs for symlinks
+                self._cleanup(pdf_path)
+            self._cleanup(temp_with_metadata)
 
             # Success
             result.status = ProcessingStatus.COMPLETED
             result.processing_time = time.time() - start_time
 
             logger.info(
-                f"Processing completed successfully in {result.processing_time:.2f}s"
+                "Processing completed successfully in %.2fs", result.processing_time
             )
 
             return result
 
         except Exception as e:
-            logger.error(f"Processing failed: {e}", exc_info=True)
-            result.status = ProcessingStatus.FAILED
-            result.error = str(e)
-            result.processing_time = time.time() - start_time
-            return result
+            # Don't leave a partial copy beside the archive or original
+            if temp_with_metadata is not None:
+                self.file_organizer.cleanup_temp_files(temp_with_metadata)
+            return self._fail(prepared, e)
+
+    def _fail(self, prepared: _PreparedDocument, error: BaseException) -> ProcessingResult:
+        """Mark a document's result as failed."""
+        logger.error("Processing failed: %s", error, exc_info=error)
+        result = prepared.result
+        result.status = ProcessingStatus.FAILED
+        result.error = str(error)
+        result.processing_time = time.time() - prepared.start_time
+        return result
+
+    def _apply_macos_tags(self, results: List[ProcessingResult]) -> None:
+        """Step 8 for a batch: tag every archived document in one pass."""
+        if not self.config.macos_tags.enabled:
+            return
+        files = [
+            (result.archive_path, result.metadata.keywords)
+            for result in results
+            if result.status == ProcessingStatus.COMPLETED
+            and result.archive_path is not None
+            and result.metadata is not None
+        ]
+        if files:
+            self.file_organizer.apply_macos_tags_batch(files)
+
+    def process_batch(
+        self,
+        pdf_paths: List[Path],
+        skip_ocr: bool = False,
+        skip_archive: bool = False,
+        max_workers: Optional[int] = None,
+    ) -> List[ProcessingResult]:
+        """
+        Process several PDF documents concurrently.
+
+        Keeping the batch's LLM requests in flight together lets servers with
+        continuous batching (vLLM, LM Studio, Ollama with OLLAMA_NUM_PARALLEL)
+        serve them in shared forward passes instead of one at a time.
+
+        Args:
+            pdf_paths: Paths to the PDF files
+            skip_ocr: Skip OCR processing
+            skip_archive: Skip archiving (keep in original location)
+            max_workers: Documents processed at once (defaults to config.batch_workers)
+
+        Returns:
+            ProcessingResults in the same order as pdf_paths
+        """
+        if not pdf_paths:
+            return []
+
+        workers = min(len(pdf_paths), max_workers or self.config.batch_workers)
+        logger.info("Processing batch of %d documents (%d workers)", len(pdf_paths), workers)
+
+        def process_one(pdf_path: Path) -> ProcessingResult:
+            return self._process(
+                pdf_path, skip_ocr=skip_ocr, skip_archive=skip_archive, macos_tags=False
+            )
+
+        if workers <= 1:
+            results = [process_one(pdf_path) for pdf_path in pdf_paths]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(process_one, pdf_paths))
+
+        self._apply_macos_tags(results)
+        return results
+
+    @classmethod
+    def process_many(
+        cls,
+        pdf_paths: List[Path],
+        config: Optional[Config] = None,
+        skip_ocr: bool = False,
+        skip_archive: bool = False,
+        workers: Optional[int] = None,
+    ) -> List[ProcessingResult]:
+        """
+        Process PDF documents in parallel worker processes.
+
+        Unlike process_batch, which shares one process (and GIL) between its
+        threads, this spreads CPU-bound work such as text extraction,
+        embedding and sidecar writing across cores. Each worker builds one
+        DocumentProcessor, so the embedding model is loaded once per worker,
+        and the OCR cores are split between the workers.
+
+        The stages run as a pipeline: workers OCR and extract documents,
+        each prepared document is tagged from a thread pool in this process
+        (up to llm.max_concurrent_requests requests in flight), and workers
+        then embed, write and archive it, so OCR, LLM and disk work overlap.
+        At most twice max(workers, llm.max_concurrent_requests) documents are
+        between stages at once, which bounds the extracted text held in memory.
+
+        Args:
+            pdf_paths: Paths to the PDF files
+            config: Configuration (defaults to the global config)
+            skip_ocr: Skip OCR processing
+            skip_archive: Skip archiving (keep in original location)
+            workers: Worker processes (defaults to half the CPU cores)
+
+        Returns:
+            ProcessingResults in the same order as pdf_paths
+        """
+        if not pdf_paths:
+            return []
+
+        config = config or get_config()
+        cpus = os.cpu_count() or 1
+        workers = min(len(pdf_paths), workers or max(1, cpus // 2))
+
+        worker_config = config.model_copy(deep=True)
+        if worker_config.ocr.jobs is None:
+            worker_config.ocr.jobs = max(1, cpus // workers)
+        if worker_config.ocr.workers is None:
+            # Each worker process OCRs one document at a time
+            worker_config.ocr.workers = 1
+        # Prepared documents cross the process boundary twice; keep OCR output
+        # in a worker-local temp file so only its path and the text are pickled
+        worker_config.ocr.in_memory = False
+
+        # LLM requests are sent from this process's threads, so the server
+        # sees every prepared document at once rather than one per worker
+        llm_slots = config.llm.max_concurrent_requests
+        window = 2 * max(workers, llm_slots)
+
+        logger.info("Processing %d documents in %d worker processes", len(pdf_paths), workers)
+        results: List[Optional[ProcessingResult]] = [None] * len(pdf_paths)
+        queued = iter(enumerate(pdf_paths))
+        # Future -> (stage, document index, prepared document)
+        stages: Dict[Future, Tuple[str, int, Optional[_PreparedDocument]]] = {}
+
+        with cls(config) as processor, _worker_log_queue() as log_queue, ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(worker_config, log_queue, logging.getLogger().level),
+        ) as executor, ThreadPoolExecutor(max_workers=llm_slots) as llm_pool:
+
+            def failed(index: int, error: BaseException) -> ProcessingResult:
+                # A worker crash or unpicklable result fails only its document
+                pdf_path = pdf_paths[index]
+                result = ProcessingResult(
+                    status=ProcessingStatus.PROCESSING, original_path=pdf_path.resolve()
+                )
+                return processor._fail(_PreparedDocument(result, "", pdf_path, time.time()), error)
+
+            def admit() -> None:
+                for index, pdf_path in islice(queued, window - len(stages)):
+                    try:
+                        future = executor.submit(_prepare_in_worker, pdf_path, skip_ocr)
+                    except Exception as e:
+                        results[index] = failed(index, e)
+                        continue
+                    stages[future] = ("prepare", index, None)
+
+            admit()
+            while stages:
+                done, _ = wait(stages, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, index, prepared = stages.pop(future)
+                    try:
+                        if stage == "prepare":
+                            prepared = future.result()
+                            if prepared.result.status != ProcessingStatus.PROCESSING:
+                                results[index] = prepared.result
+                            else:
+                                tag_future = llm_pool.submit(processor._tag_or_exception, prepared)
+                                stages[tag_future] = ("tag", index, prepared)
+                        elif stage == "tag":
+                            complete_future = executor.submit(
+                                _complete_in_worker, prepared, future.result(), skip_archive
+                            )
+                            stages[complete_future] = ("complete", index, prepared)
+                        else:
+                            results[index] = future.result()
+                    except Exception as e:
+                        if prepared is not None:
+                            results[index] = processor._fail(prepared, e)
+                        else:
+                            results[index] = failed(index, e)
+                admit()
+
+            processor._apply_macos_tags(results)
+
+        return results
 
     def check_system(self) -> dict:
         """
@@ -248,6 +716,6 @@ class DocumentProcessor:
                 status["ollama_available"] = True  # backward compat
                 status["ollama_model"] = self.config.llm.model
         except Exception as e:
-            logger.warning(f"LLM check failed: {e}")
+            logger.warning("LLM check failed: %s", e)
 
         return status
@@ -237,7 +237,7 @@ async def get_processing_status(request_id: str) -> ProcessingStatusResponse:
     return ProcessingStatusResponse(
         request_id=request_id,
         status=result.status,
-        result=result if result.status in [ProcessingStatus.COMPLETED, ProcessingStatus.FAILED] else None,
+        result=result if result.status in [ProcessingStatus.COMPLETED, ProcessingStatus.FAILED, ProcessingStatus.SKIPPED] else None,
         message=result.error if result.error else None,
     )
 
@@ -690,7 +690,8 @@ async def process_batch_document(batch_id: str, request_id: str, file_path: Path
         # Update batch status
         if batch_id in batch_tasks:
             result = processing_tasks.get(request_id)
-            if result and result.status == ProcessingStatus.COMPLETED:
+            # Duplicates of archived documents count as done
+            if result and result.status in (ProcessingStatus.COMPLETED, ProcessingStatus.SKIPPED):
                 batch_tasks[batch_id]["completed"] += 1
             elif result and result.status == ProcessingStatus.FAILED:
                 batch_tasks[batch_id]["failed"] += 1
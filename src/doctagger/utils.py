@@ -2,11 +2,16 @@
 
 import hashlib
 import logging
+import mmap
+import os
 from pathlib import Path
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# Files at least this large are hashed through a memory map
+_MMAP_HASH_MIN_SIZE = 1024 * 1024
+
 
 def calculate_file_hash(file_path: Path, algorithm: str = "sha256") -> str:
     """
@@ -33,8 +38,14 @@ def calculate_file_hash(file_path: Path, algorithm: str = "sha256") -> str:
 
     try:
         with open(file_path, "rb") as f:
-            while chunk := f.read(chunk_size):
-                hash_obj.update(chunk)
+            if os.fstat(f.fileno()).st_size >= _MMAP_HASH_MIN_SIZE:
+                # One update over the mapped file: no read copies, and hashlib
+                # releases the GIL for the whole digest
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    hash_obj.update(data)
+            else:
+                while chunk := f.read(chunk_size):
+                    hash_obj.update(chunk)
 
         file_hash = hash_obj.hexdigest()
         logger.debug(f"Calculated {algorithm} hash for {file_path.name}: {file_hash}")
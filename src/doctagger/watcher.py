@@ -1,10 +1,11 @@
 """Folder watcher for monitoring inbox."""
 
 import logging
+import queue
 import threading
 import time
 from pathlib import Path
-from typing import Callable, Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Tuple, Any
 from enum import Enum
 
 from watchdog.events import FileSystemEvent, FileSystemEventHandler
@@ -252,13 +253,19 @@ class BatchProcessor:
 
 
 class PDFHandler(FileSystemEventHandler):
-    """Handles PDF file events."""
+    """Handles PDF file events.
+
+    New files are queued and handed to a worker thread, which coalesces
+    arrivals within a short window into a single processor batch.
+    """
 
     def __init__(
         self,
         processor: DocumentProcessor,
         callback: Optional[Callable[[Path], None]] = None,
         debounce_seconds: float = 2.0,
+        batch_window_seconds: float = 0.5,
+        max_batch: int = 16,
     ):
         """
         Initialize PDF handler.
@@ -267,12 +274,35 @@ class PDFHandler(FileSystemEventHandler):
             processor: DocumentProcessor instance
             callback: Optional callback to call after processing
             debounce_seconds: Seconds to wait before processing (for file copying)
+            batch_window_seconds: Seconds to wait for more files before processing a batch
+            max_batch: Maximum number of files processed as one batch
         """
         super().__init__()
         self.processor = processor
         self.callback = callback
         self.debounce_seconds = debounce_seconds
+        self.batch_window_seconds = batch_window_seconds
+        self.max_batch = max(1, max_batch)
         self._processing = set()
+        self._processing_lock = threading.Lock()
+        # (path, arrival time) entries; None tells the worker to exit
+        self._queue: "queue.Queue[Optional[Tuple[Path, float]]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the batch worker thread."""
+        if self._worker is None:
+            self._worker = threading.Thread(
+                target=self._run, name="pdf-batch-worker", daemon=True
+            )
+            self._worker.start()
+
+    def stop(self, timeout: Optional[float] = 5) -> None:
+        """Stop the batch worker after it finishes the batch in progress."""
+        if self._worker is not None:
+            self._queue.put(None)
+            self._worker.join(timeout=timeout)
+            self._worker = None
 
     def on_created(self, event: FileSystemEvent) -> None:
         """Handle file creation event."""
@@ -286,41 +316,79 @@ class PDFHandler(FileSystemEventHandler):
             return
 
         # Avoid processing the same file multiple times
-        if file_path in self._processing:
-            return
+        with self._processing_lock:
+            if file_path in self._processing:
+                return
+            self._processing.add(file_path)
 
         logger.info(f"New PDF detected: {file_path.name}")
-
-        # Wait for file to be fully written
-        time.sleep(self.debounce_seconds)
-
-        # Check if file still exists and is readable
-        if not file_path.exists():
-            logger.warning(f"File disappeared: {file_path.name}")
-            return
+        self._queue.put((file_path, time.monotonic()))
+
+    def _run(self) -> None:
+        """Collect queued files into batches and process them."""
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            deadline = time.monotonic() + self.batch_window_seconds
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            # Wait for the most recent file to be fully written
+            settle = batch[-1][1] + self.debounce_seconds - time.monotonic()
+            if settle > 0:
+                time.sleep(settle)
+
+            self._process_batch([path for path, _ in batch])
+
+    def _process_batch(self, file_paths: List[Path]) -> None:
+        """Process a batch of detected files."""
+        ready = []
+        for file_path in file_paths:
+            # Check if file still exists and is readable
+            if file_path.exists():
+                ready.append(file_path)
+            else:
+                logger.warning(f"File disappeared: {file_path.name}")
 
         try:
-            # Mark as processing
-            self._processing.add(file_path)
-
-            # Process the PDF
-            result = self.processor.process(file_path)
+            results = self.processor.process_batch(ready)
 
-            if result.status.value == "completed":
-                logger.info(f"Successfully processed: {file_path.name}")
-            else:
-                logger.error(f"Processing failed for {file_path.name}: {result.error}")
+            for file_path, result in zip(ready, results):
+                if result.status.value == "completed":
+                    logger.info(f"Successfully processed: {file_path.name}")
+                elif result.status.value == "skipped":
+                    logger.info(f"Skipped {file_path.name}: already archived as {result.archive_path}")
+                else:
+                    logger.error(f"Processing failed for {file_path.name}: {result.error}")
 
-            # Call callback if provided
-            if self.callback:
-                self.callback(file_path)
+                # Call callback if provided
+                if self.callback:
+                    try:
+                        self.callback(file_path)
+                    except Exception as e:
+                        logger.error(f"Callback failed for {file_path.name}: {e}", exc_info=True)
 
         except Exception as e:
-            logger.error(f"Unexpected error processing {file_path.name}: {e}", exc_info=True)
+            logger.error(f"Unexpected error processing batch: {e}", exc_info=True)
 
         finally:
             # Remove from processing set
-            self._processing.discard(file_path)
+            with self._processing_lock:
+                self._processing.difference_update(file_paths)
 
 
 class FolderWatcher:
@@ -342,6 +410,7 @@ class FolderWatcher:
         self.callback = callback
         self.processor = DocumentProcessor(self.config)
         self.observer: Optional[Observer] = None
+        self._event_handler: Optional[PDFHandler] = None
         self._running = False
         # Batch processor for handling existing files
         self.batch_processor = BatchProcessor(self)
@@ -368,7 +437,11 @@ class FolderWatcher:
         event_handler = PDFHandler(
             processor=self.processor,
             callback=self.callback,
+            batch_window_seconds=self.config.watch_batch_window_ms / 1000,
+            max_batch=self.config.watch_max_batch,
         )
+        event_handler.start()
+        self._event_handler = event_handler
 
         # Create observer
         self.observer = Observer()
@@ -399,6 +472,10 @@ class FolderWatcher:
             self.observer.join(timeout=5)
             self.observer = None
 
+        if self._event_handler:
+            self._event_handler.stop()
+            self._event_handler = None
+
         self._running = False
         logger.info("Folder watcher stopped")
 
@@ -483,6 +560,7 @@ class FolderWatcher:
             "files": []
         }
 
+        to_process = []
         for pdf_file in pdf_files:
             # Check if already processed
             if skip_processed and self.is_already_processed(pdf_file):
@@ -490,24 +568,33 @@ class FolderWatcher:
                 stats["skipped"] += 1
                 stats["files"].append({"name": pdf_file.name, "status": "skipped"})
                 continue
+            to_process.append(pdf_file)
 
+        batch_size = max(1, self.config.watch_max_batch)
+        for i in range(0, len(to_process), batch_size):
+            batch = to_process[i:i + batch_size]
             try:
-                logger.info(f"Processing existing file: {pdf_file.name}")
-                result = self.processor.process(pdf_file)
+                logger.info(f"Processing {len(batch)} existing files")
+                results = self.processor.process_batch(batch)
+            except Exception as e:
+                logger.error(f"Error processing batch: {e}", exc_info=True)
+                results = [None] * len(batch)
+                error = str(e)
 
-                if result.status.value == "completed":
+            for pdf_file, result in zip(batch, results):
+                if result is not None and result.status.value == "completed":
                     stats["processed"] += 1
                     stats["files"].append({"name": pdf_file.name, "status": "completed"})
                     logger.info(f"Successfully processed: {pdf_file.name}")
+                elif result is not None and result.status.value == "skipped":
+                    stats["skipped"] += 1
+                    stats["files"].append({"name": pdf_file.name, "status": "skipped"})
+                    logger.info(f"Skipped {pdf_file.name}: already archived as {result.archive_path}")
                 else:
+                    file_error = result.error if result is not None else error
                     stats["failed"] += 1
-                    stats["files"].append({"name": pdf_file.name, "status": "failed", "error": result.error})
-                    logger.error(f"Failed to process {pdf_file.name}: {result.error}")
-
-            except Exception as e:
-                stats["failed"] += 1
-                stats["files"].append({"name": pdf_file.name, "status": "failed", "error": str(e)})
-                logger.error(f"Error processing {pdf_file.name}: {e}", exc_info=True)
+                    stats["files"].append({"name": pdf_file.name, "status": "failed", "error": file_error})
+                    logger.error(f"Failed to process {pdf_file.name}: {file_error}")
 
         logger.info(f"Processed {stats['processed']}, skipped {stats['skipped']}, failed {stats['failed']} of {stats['total']} files")
         return stats
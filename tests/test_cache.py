@@ -0,0 +1,60 @@
+"""Test result cache functionality."""
+
+import os
+import time
+
+from doctagger.cache import ResultCache, make_cache_key
+from doctagger.models import TaggingResult
+
+
+def test_make_cache_key_separates_parts():
+    """Test that keys differ when the same text is split differently."""
+    assert make_cache_key("ab", "c") != make_cache_key("a", "bc")
+    assert make_cache_key("a", "b") == make_cache_key("a", "b")
+
+
+def test_text_roundtrip(tmp_path):
+    """Test storing and loading extracted text."""
+    cache = ResultCache(tmp_path)
+    key = make_cache_key("doc")
+
+    assert cache.get_text(key) is None
+    cache.put_text(key, "Page one\n\nPage two ü")
+    assert cache.get_text(key) == "Page one\n\nPage two ü"
+
+
+def test_tagging_roundtrip(tmp_path):
+    """Test storing and loading tagging results."""
+    cache = ResultCache(tmp_path)
+    key = make_cache_key("doc")
+    result = TaggingResult(
+        title="Invoice", document_type="invoice", tags=["bill"], confidence=0.9
+    )
+
+    cache.put_tagging(key, result)
+
+    assert cache.get_tagging(key) == result
+
+
+def test_corrupt_tagging_entry_is_a_miss(tmp_path):
+    """Test that an unreadable entry is ignored."""
+    cache = ResultCache(tmp_path)
+    key = make_cache_key("doc")
+    (tmp_path / "tags" / f"{key}.json").write_text("{not json")
+
+    assert cache.get_tagging(key) is None
+
+
+def test_expired_tagging_entry_is_a_miss(tmp_path):
+    """Test that tagging results older than the TTL are ignored."""
+    cache = ResultCache(tmp_path, tagging_ttl=60)
+    key = make_cache_key("doc")
+    cache.put_tagging(key, TaggingResult(title="Old", document_type="other"))
+    path = tmp_path / "tags" / f"{key}.json"
+
+    assert cache.get_tagging(key) is not None
+
+    old = time.time() - 120
+    os.utime(path, (old, old))
+
+    assert cache.get_tagging(key) is None
@@ -25,3 +25,25 @@ def test_config_folders_created(tmp_path):
 
     assert inbox.exists()
     assert archive.exists()
+
+
+def test_config_sub_settings_are_independent(tmp_path):
+    """Test that cached sub-settings are copied per Config instance."""
+    first = Config(inbox_folder=tmp_path / "a", archive_folder=tmp_path / "b")
+    second = Config(inbox_folder=tmp_path / "a", archive_folder=tmp_path / "b")
+
+    first.ollama.url = "http://example:11434"
+    first.tags.custom_categories.append("Statement")
+
+    assert second.ollama.url == "http://localhost:11434"
+    assert "Statement" not in second.tags.custom_categories
+
+
+def test_config_picks_up_environment_changes(tmp_path, monkeypatch):
+    """Test that sub-settings are re-read after the environment changes."""
+    folders = {"inbox_folder": tmp_path / "a", "archive_folder": tmp_path / "b"}
+    monkeypatch.setenv("OCR_LANGUAGE", "eng")
+    assert Config(**folders).ocr.language == "eng"
+
+    monkeypatch.setenv("OCR_LANGUAGE", "deu")
+    assert Config(**folders).ocr.language == "deu"
@@ -0,0 +1,145 @@
+"""Test embedder functionality."""
+
+import pickle
+
+import numpy as np
+import pytest
+
+from doctagger.config import Config
+from doctagger.embedder import DocumentEmbedder, decode_embedding
+
+
+class FakeModel:
+    """Stand-in for a sentence-transformers model."""
+
+    def __init__(self, dimensions: int = 4):
+        self.dimensions = dimensions
+        self.calls = []
+
+    def encode(self, sentences, **kwargs):
+        self.calls.append((sentences, kwargs))
+        if isinstance(sentences, str):
+            return np.full(self.dimensions, len(sentences), dtype=np.float32)
+        return np.array([np.full(self.dimensions, len(s), dtype=np.float32) for s in sentences])
+
+
+@pytest.fixture
+def embedder(tmp_path):
+    """Create embedder with a fake model."""
+    config = Config(
+        inbox_folder=tmp_path / "inbox",
+        archive_folder=tmp_path / "archive",
+        temp_folder=tmp_path / "tmp",
+    )
+    embedder = DocumentEmbedder(config=config)
+    embedder._model = FakeModel()
+    return embedder
+
+
+def test_embed_chunks_single_batch(embedder):
+    """Test that all chunks are encoded in one model call."""
+    text = "x" * 2500
+    chunks = embedder.embed_chunks(text, chunk_size=1000, overlap=200)
+
+    assert [(c["start"], c["end"]) for c in chunks] == [
+        (0, 1000),
+        (800, 1800),
+        (1600, 2500),
+    ]
+    assert len(embedder.model.calls) == 1
+    assert chunks[2]["embedding"] == [900.0] * 4
+
+
+def test_embed_chunks_rejects_overlap_not_smaller_than_chunk(embedder):
+    """Test that a non-advancing window is rejected instead of looping."""
+    with pytest.raises(ValueError):
+        embedder.embed_chunks("some text", chunk_size=100, overlap=100)
+
+
+def test_embed_chunks_empty_text(embedder):
+    """Test that empty text yields no chunks."""
+    assert embedder.embed_chunks("") == []
+    assert embedder.model.calls == []
+
+
+def test_embed_text_uses_cache(embedder):
+    """Test that identical text is only encoded once."""
+    tokenized = []
+
+    def tokenizer(text, **kwargs):
+        tokenized.append(text)
+        return {"offset_mapping": []}
+
+    embedder.model.tokenizer = tokenizer
+    embedder.model.max_seq_length = 5
+
+    first = embedder.embed_text("same text")
+    second = embedder.embed_text("same text")
+
+    assert first == second
+    assert len(embedder.model.calls) == 1
+    # Cache hits skip tokenization
+    assert tokenized == ["same text"]
+
+
+def test_embed_text_truncates_at_token_limit(embedder):
+    """Test that text is cut at the model's token limit."""
+
+    def tokenizer(text, max_length, **kwargs):
+        offsets = []
+        position = 0
+        for word in text.split():
+            start = text.index(word, position)
+            position = start + len(word)
+            offsets.append((start, position))
+        return {"offset_mapping": offsets[:max_length]}
+
+    embedder.model.tokenizer = tokenizer
+    embedder.model.max_seq_length = 5
+
+    embedder.embed_text("one two three four five")
+
+    assert embedder.model.calls[0][0] == "one two three"
+
+
+def test_embed_text_bytes_roundtrip(embedder):
+    """Test that packed embeddings decode to the list form."""
+    data = embedder.embed_text_bytes("abc")
+
+    assert len(data) == 4 * 4
+    assert decode_embedding(data) == embedder.embed_text("abc")
+
+
+def test_embedder_pickles_without_model(embedder):
+    """Test that pickling drops the loaded model and cache."""
+    embedder.embed_text("cached")
+
+    restored = pickle.loads(pickle.dumps(embedder))
+
+    assert restored._model is None
+    assert len(restored._cache) == 0
+    assert restored.model_name == embedder.model_name
+    assert restored.quantization == embedder.quantization
+
+
+def test_int8_falls_back_to_dynamic_quantization(tmp_path, monkeypatch):
+    """Test that int8 quantizes the torch model when no ONNX export loads."""
+    config = Config(
+        inbox_folder=tmp_path / "inbox",
+        archive_folder=tmp_path / "archive",
+        temp_folder=tmp_path / "tmp",
+    )
+    embedder = DocumentEmbedder(config=config, quantization="int8")
+    model = FakeModel()
+
+    def from_pretrained(**kwargs):
+        if kwargs.get("backend") == "onnx":
+            raise OSError("no onnx export")
+        return model
+
+    quantized = []
+    monkeypatch.setattr(embedder, "_from_pretrained", from_pretrained)
+    monkeypatch.setattr(embedder, "_quantize_dynamic", lambda m: quantized.append(m) or m)
+
+    assert embedder.model is model
+    assert quantized == [model]
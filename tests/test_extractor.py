@@ -0,0 +1,86 @@
+"""Test text extraction functionality."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pikepdf
+
+from doctagger import extractor as extractor_module
+from doctagger.extractor import PARALLEL_MIN_PAGES, TextExtractor
+
+
+def _write_text_pdf(path, pages):
+    """Write a PDF whose pages each show 'Page N'."""
+    pdf = pikepdf.new()
+    font = pdf.make_indirect(
+        pikepdf.Dictionary(
+            Type=pikepdf.Name.Font, Subtype=pikepdf.Name.Type1, BaseFont=pikepdf.Name.Helvetica
+        )
+    )
+    for number in range(1, pages + 1):
+        content = pikepdf.Stream(pdf, f"BT /F1 12 Tf 72 720 Td (Page {number}) Tj ET".encode())
+        pdf.pages.append(
+            pikepdf.Page(
+                pikepdf.Dictionary(
+                    Type=pikepdf.Name.Page,
+                    MediaBox=[0, 0, 612, 792],
+                    Resources=pikepdf.Dictionary(Font=pikepdf.Dictionary(F1=font)),
+                    Contents=content,
+                )
+            )
+        )
+    pdf.save(path)
+
+
+def test_extract_in_process_by_default(tmp_path):
+    """Test that the default extractor never starts a process pool."""
+    pdf_path = tmp_path / "long.pdf"
+    _write_text_pdf(pdf_path, PARALLEL_MIN_PAGES)
+
+    extractor = TextExtractor()
+    text = extractor.extract(pdf_path)
+
+    assert text.startswith("Page 1\n\nPage 2")
+    assert extractor._pool is None
+
+
+def test_extract_parallel_reuses_pool(tmp_path):
+    """Test that long documents share one page extraction pool."""
+    pdf_path = tmp_path / "long.pdf"
+    _write_text_pdf(pdf_path, PARALLEL_MIN_PAGES)
+
+    extractor = TextExtractor(workers=2)
+    first = extractor.extract(pdf_path)
+    pool = extractor._pool
+    second = extractor.extract(pdf_path)
+    reused = extractor._pool is pool
+    extractor.close()
+
+    assert pool is not None and reused
+    assert first == second
+    assert first.endswith(f"Page {PARALLEL_MIN_PAGES}")
+    assert extractor._pool is None
+
+
+def test_extract_serializes_pdfium_across_threads(tmp_path, monkeypatch):
+    """Test that concurrent extractions never use PDFium at the same time."""
+    paths = []
+    for number in range(4):
+        path = tmp_path / f"doc{number}.pdf"
+        _write_text_pdf(path, number + 1)
+        paths.append(path)
+
+    real_page_text = extractor_module._page_text
+    held = []
+
+    def checking_page_text(pdf, page_index):
+        held.append(extractor_module.PDFIUM_LOCK.locked())
+        return real_page_text(pdf, page_index)
+
+    monkeypatch.setattr(extractor_module, "_page_text", checking_page_text)
+
+    extractor = TextExtractor()
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        texts = list(pool.map(extractor.extract, paths))
+
+    assert [text.count("Page") for text in texts] == [1, 2, 3, 4]
+    assert held and all(held)
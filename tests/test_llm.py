@@ -0,0 +1,388 @@
+"""Test LLM tagger functionality."""
+
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from doctagger import llm as llm_module
+from doctagger.cache import ResultCache
+from doctagger.config import Config
+from doctagger.llm import LLMTagger
+from doctagger.models import TaggingResult
+
+
+@pytest.fixture
+def tagger(tmp_path):
+    """Create tagger with a test config."""
+    config = Config(
+        inbox_folder=tmp_path / "inbox",
+        archive_folder=tmp_path / "archive",
+        temp_folder=tmp_path / "tmp",
+    )
+    return LLMTagger(config=config)
+
+
+def test_tag_many_preserves_order_and_runs_concurrently(tagger, monkeypatch):
+    """Test that documents are tagged concurrently and returned in input order."""
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def fake_call(prompt):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.05)
+        with lock:
+            in_flight -= 1
+        title = prompt.split("Document text:\n", 1)[1].split("\n", 1)[0]
+        return json.dumps({"title": title, "document_type": "other", "tags": []})
+
+    monkeypatch.setattr(tagger, "_call_openai", fake_call)
+    tagger.config.llm.max_concurrent_requests = 3
+
+    texts = [f"doc-{i}" for i in range(6)]
+    results = tagger.tag_many(texts)
+
+    assert [r.title for r in results] == texts
+    assert 1 < peak <= 3
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        '{"title": "Invoice", "document_type": "invoice", "tags": ["bill"]}',
+        '```json\n{"title": "Invoice", "document_type": "invoice", "tags": ["bill"]}\n```',
+        'Here you go:\n```\n{"title": "Invoice", "document_type": "invoice", "tags": ["bill"]}\n```\nDone.',
+        '{"title": "Invoice", "document_type": "invoice", "tags": ["bill",],}',
+        "{'title': 'Invoice', 'document_type': 'invoice', 'tags': ['bill']}",
+        '{"title": "Invoice", "document_type": "invoice", "tags": ["bill"]}\n'
+        "Note: fields use the {name: value} format.",
+    ],
+)
+def test_parse_response_recovers_json(tagger, response):
+    """Test that fenced, wrapped and slightly malformed JSON is parsed."""
+    result = tagger.parse_response(response)
+
+    assert result.title == "Invoice"
+    assert result.document_type == "invoice"
+    assert result.tags == ["bill"]
+
+
+def test_parse_response_without_json(tagger):
+    """Test that a response without a JSON object is rejected."""
+    with pytest.raises(ValueError):
+        tagger.parse_response("I could not read this document.")
+
+
+def test_tag_uses_result_cache(tagger, tmp_path, monkeypatch):
+    """Test that an identical request is answered from the cache."""
+    calls = []
+
+    def fake_call(prompt):
+        calls.append(prompt)
+        return '{"title": "Invoice", "document_type": "invoice", "tags": []}'
+
+    monkeypatch.setattr(tagger, "_call_openai", fake_call)
+    tagger.cache = ResultCache(tmp_path / "cache")
+
+    first = tagger.tag("Invoice text")
+    second = tagger.tag("Invoice text")
+
+    assert first == second
+    assert len(calls) == 1
+
+
+def test_create_prompt_truncates_at_word_boundary(tagger):
+    """Test that long text is cut before a partial word."""
+    prompt = tagger.create_prompt("alpha beta gamma delta", max_chars=14)
+
+    assert prompt.endswith("Document text:\nalpha beta")
+    assert "gam" not in prompt
+
+
+def test_tag_many_async_limits_concurrency(tagger, monkeypatch):
+    """Test that async tagging keeps order and respects the request limit."""
+    in_flight = 0
+    peak = 0
+
+    async def fake_call(prompt):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        title = prompt.split("Document text:\n", 1)[1].split("\n", 1)[0]
+        return json.dumps({"title": title, "document_type": "other", "tags": []})
+
+    monkeypatch.setattr(tagger, "_call_openai_async", fake_call)
+    tagger.config.llm.max_concurrent_requests = 2
+
+    texts = [f"doc-{i}" for i in range(5)]
+    results = asyncio.run(tagger.tag_many_async(texts))
+
+    assert [r.title for r in results] == texts
+    assert peak == 2
+
+
+def test_structured_output_requests_json(tagger):
+    """Test that structured output asks both providers for JSON."""
+    assert tagger._openai_chat_kwargs("p")["response_format"] == {"type": "text"}
+    assert "format" not in tagger._ollama_generate_kwargs("p")
+
+    tagger.config.llm.structured_output = "json"
+
+    assert tagger._openai_chat_kwargs("p")["response_format"] == {"type": "json_object"}
+    assert tagger._ollama_generate_kwargs("p")["format"] == "json"
+
+    tagger.config.llm.structured_output = "schema"
+    schema = TaggingResult.model_json_schema()
+
+    assert tagger._openai_chat_kwargs("p")["response_format"]["json_schema"]["schema"] == schema
+    assert tagger._ollama_generate_kwargs("p")["format"] == schema
+
+
+def test_schema_output_drops_format_instructions(tmp_path):
+    """Test that schema-constrained prompts omit the JSON-only boilerplate."""
+    config = Config(
+        inbox_folder=tmp_path / "inbox",
+        archive_folder=tmp_path / "archive",
+        temp_folder=tmp_path / "tmp",
+    )
+    config.llm.structured_output = "schema"
+    tagger = LLMTagger(config=config)
+
+    assert "IMPORTANT" not in tagger.create_prompt("text")
+    assert "IMPORTANT" not in tagger.get_vision_prompt()
+
+
+def test_tag_many_async_returns_exceptions(tagger, monkeypatch):
+    """Test that one failed document does not discard the others."""
+
+    async def fake_call(prompt):
+        if "bad" in prompt:
+            raise RuntimeError("server error")
+        return '{"title": "Good", "document_type": "other", "tags": []}'
+
+    monkeypatch.setattr(tagger, "_call_openai_async", fake_call)
+
+    results = asyncio.run(
+        tagger.tag_many_async(["good", "bad"], concurrency=1, return_exceptions=True)
+    )
+
+    assert results[0].title == "Good"
+    assert isinstance(results[1], RuntimeError)
+
+
+class FakeBatchClient:
+    """Stand-in for the OpenAI client's files and batches endpoints."""
+
+    def __init__(self, output: str):
+        self.uploaded = None
+        self.files = SimpleNamespace(create=self._create_file, content=self._content)
+        self.batches = SimpleNamespace(create=self._create_batch, retrieve=self._retrieve)
+        self.output = output
+
+    def _create_file(self, file, purpose):
+        self.uploaded = file[1].decode("utf-8")
+        return SimpleNamespace(id="file-in")
+
+    def _create_batch(self, **kwargs):
+        return SimpleNamespace(id="batch-1")
+
+    def _retrieve(self, batch_id):
+        return SimpleNamespace(status="completed", output_file_id="file-out")
+
+    def _content(self, file_id):
+        return SimpleNamespace(text=self.output)
+
+
+def test_batch_api_roundtrip(tagger):
+    """Test submitting a batch and collecting its results."""
+    ok = {
+        "custom_id": "a",
+        "response": {
+            "status_code": 200,
+            "body": {
+                "choices": [
+                    {"message": {"content": '{"title": "A", "document_type": "other", "tags": []}'}}
+                ]
+            },
+        },
+    }
+    failed = {"custom_id": "b", "response": {"status_code": 500, "body": {}}}
+    malformed = '{"custom_id": "c", "response": {"status_code": 200, "body": '
+    client = FakeBatchClient("\n".join([json.dumps(ok), json.dumps(failed), malformed]))
+    tagger._openai_client = client
+
+    with pytest.raises(RuntimeError):
+        tagger.submit_batch(["text a"])
+
+    tagger.config.llm.use_batch_api = True
+    batch_id = tagger.submit_batch(["text a", "text b", "text c"], custom_ids=["a", "b", "c"])
+
+    requests = [json.loads(line) for line in client.uploaded.splitlines()]
+    assert [r["custom_id"] for r in requests] == ["a", "b", "c"]
+    assert requests[0]["body"]["model"] == tagger.config.llm.model
+
+    results = tagger.poll_batch(batch_id)
+    assert list(results) == ["a"]
+    assert results["a"].title == "A"
+
+
+def test_prompt_templates_follow_config_swap(tagger, tmp_path):
+    """Test that assigning a new config rebuilds the cached prompts."""
+    config = Config(
+        inbox_folder=tmp_path / "inbox",
+        archive_folder=tmp_path / "archive",
+        temp_folder=tmp_path / "tmp",
+    )
+    config.tags.custom_categories = ["receipt", "letter"]
+
+    tagger.config = config
+
+    assert "choose from: receipt, letter" in tagger.create_prompt("text")
+    assert "choose from: receipt, letter" in tagger.get_vision_prompt()
+
+
+def test_tag_many_sends_duplicates_once(tagger, monkeypatch):
+    """Test that identical documents in one batch share an LLM request."""
+    calls = []
+
+    def fake_call(prompt):
+        calls.append(prompt)
+        time.sleep(0.05)
+        return '{"title": "Statement", "document_type": "statement", "tags": []}'
+
+    monkeypatch.setattr(tagger, "_call_openai", fake_call)
+
+    results = tagger.tag_many(["same statement"] * 4)
+
+    assert [r.title for r in results] == ["Statement"] * 4
+    assert len(calls) == 1
+
+
+def test_concurrent_identical_tags_share_request(tagger, monkeypatch):
+    """Test that a tag call waits for an identical request already in flight."""
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def fake_call(prompt):
+        calls.append(prompt)
+        started.set()
+        release.wait(5)
+        return '{"title": "Receipt", "document_type": "receipt", "tags": []}'
+
+    monkeypatch.setattr(tagger, "_call_openai", fake_call)
+
+    first = []
+    thread = threading.Thread(target=lambda: first.append(tagger.tag("receipt text")))
+    thread.start()
+    started.wait(5)
+
+    threading.Timer(0.05, release.set).start()
+    second = tagger.tag("receipt text")
+    thread.join(5)
+
+    assert first == [second]
+    assert len(calls) == 1
+
+
+def test_tag_many_sends_shortest_first(tagger, monkeypatch):
+    """Test that requests are started in order of document length."""
+    sent = []
+
+    def fake_call(prompt):
+        text = prompt.split("Document text:\n", 1)[1]
+        sent.append(text)
+        return json.dumps({"title": text, "document_type": "other", "tags": []})
+
+    monkeypatch.setattr(tagger, "_call_openai", fake_call)
+    tagger.config.llm.max_concurrent_requests = 1
+
+    texts = ["a much longer document", "short", "medium doc"]
+    results = tagger.tag_many(texts)
+
+    assert [r.title for r in results] == texts
+    assert sent == ["short", "medium doc", "a much longer document"]
+
+
+def test_tag_many_async_closes_clients_it_opened(tagger, monkeypatch):
+    """Test that async clients opened by a batch do not outlive its event loop."""
+    clients = []
+
+    async def fake_call(prompt):
+        clients.append(tagger.async_openai_client)
+        return '{"title": "Doc", "document_type": "other", "tags": []}'
+
+    monkeypatch.setattr(tagger, "_call_openai_async", fake_call)
+
+    asyncio.run(tagger.tag_many_async(["one"]))
+
+    assert clients[0].is_closed()
+    assert tagger._async_openai_client is None
+
+
+def test_concurrent_tag_many_async_share_clients(tagger, monkeypatch):
+    """Test that one batch finishing does not close clients another is using."""
+    release_slow = None
+    seen_closed = []
+
+    async def fake_call(prompt):
+        client = tagger.async_openai_client
+        if "slow" in prompt:
+            await release_slow.wait()
+        seen_closed.append(client.is_closed())
+        return '{"title": "Doc", "document_type": "other", "tags": []}'
+
+    monkeypatch.setattr(tagger, "_call_openai_async", fake_call)
+
+    async def run():
+        nonlocal release_slow
+        release_slow = asyncio.Event()
+        slow = asyncio.create_task(tagger.tag_many_async(["slow"]))
+        await asyncio.sleep(0)
+        await tagger.tag_many_async(["fast"])
+        release_slow.set()
+        await slow
+
+    asyncio.run(run())
+
+    assert seen_closed == [False, False]
+    assert tagger._async_openai_client is None
+
+
+def test_pdf_to_images_serializes_in_process_rendering(tagger, tmp_path, monkeypatch):
+    """Test that concurrent in-process renders never use PyMuPDF at the same time."""
+    fitz = pytest.importorskip("fitz")
+    paths = []
+    for number in range(4):
+        path = tmp_path / f"doc{number}.pdf"
+        with fitz.open() as pdf:
+            pdf.new_page(width=72, height=72)
+            pdf.save(path)
+        paths.append(path)
+
+    real_render = llm_module._render_pages_jpeg
+    held = []
+
+    def checking_render(*args):
+        held.append(llm_module._FITZ_LOCK.locked())
+        return real_render(*args)
+
+    monkeypatch.setattr(llm_module, "_render_pages_jpeg", checking_render)
+    tagger.config.llm.vision_workers = 1
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(tagger.pdf_to_images, paths))
+
+    assert [len(images) for images in results] == [1, 1, 1, 1]
+    assert held == [True] * 4
+    assert tagger._render_pool is None
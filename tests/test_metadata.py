@@ -0,0 +1,104 @@
+"""Test PDF metadata handling."""
+
+import io
+
+import pikepdf
+from PyPDF2 import PdfReader, PdfWriter
+
+from doctagger import metadata as metadata_module
+from doctagger.metadata import MetadataWriter
+from doctagger.models import DocumentMetadata
+
+
+def test_write_and_read_metadata(tmp_path):
+    """Test that written metadata can be read back and pages are kept."""
+    pdf_path = tmp_path / "input.pdf"
+    writer = PdfWriter()
+    for _ in range(3):
+        writer.add_blank_page(width=612, height=792)
+    with open(pdf_path, "wb") as f:
+        writer.write(f)
+
+    metadata_writer = MetadataWriter()
+    output_path = metadata_writer.write_metadata(
+        pdf_path,
+        DocumentMetadata(title="Invoice", subject="Monthly bill", keywords=["bill", "2024"]),
+        tmp_path / "output.pdf",
+    )
+
+    metadata = metadata_writer.read_metadata(output_path)
+    assert metadata.title == "Invoice"
+    assert metadata.subject == "Monthly bill"
+    assert metadata.keywords == ["bill", "2024"]
+    assert metadata.creator == "DocTagger"
+
+    assert len(PdfReader(output_path).pages) == 3
+
+
+def test_update_metadata_returns_previous(tmp_path):
+    """Test that updating returns the metadata that was replaced."""
+    pdf_path = tmp_path / "input.pdf"
+    writer = PdfWriter()
+    writer.add_blank_page(width=612, height=792)
+    writer.add_metadata({"/Title": "Old title", "/Keywords": "a; b"})
+    with open(pdf_path, "wb") as f:
+        writer.write(f)
+
+    metadata_writer = MetadataWriter()
+    previous = metadata_writer.update_metadata(pdf_path, DocumentMetadata(title="New title"))
+
+    assert previous.title == "Old title"
+    assert previous.keywords == ["a", "b"]
+    assert metadata_writer.read_metadata(pdf_path).title == "New title"
+
+
+def test_write_metadata_from_bytes(tmp_path):
+    """Test writing metadata for a PDF held in memory."""
+    buf = io.BytesIO()
+    writer = PdfWriter()
+    writer.add_blank_page(width=612, height=792)
+    writer.write(buf)
+
+    metadata_writer = MetadataWriter()
+    output_path = metadata_writer.write_metadata(
+        buf.getvalue(), DocumentMetadata(title="Scan"), tmp_path / "output.pdf"
+    )
+
+    assert metadata_writer.read_metadata(output_path).title == "Scan"
+
+
+def _write_pdf_with_xmp(path):
+    """Write a one-page PDF whose Info and XMP metadata both say 'Old title'."""
+    with pikepdf.new() as pdf:
+        pdf.add_blank_page()
+        pdf.docinfo["/Title"] = "Old title"
+        with pdf.open_metadata() as meta:
+            meta["dc:title"] = "Old title"
+        pdf.save(path)
+
+
+def test_update_metadata_syncs_xmp(tmp_path):
+    """Test that XMP metadata is updated along with the Info dictionary."""
+    pdf_path = tmp_path / "input.pdf"
+    _write_pdf_with_xmp(pdf_path)
+
+    MetadataWriter().update_metadata(pdf_path, DocumentMetadata(title="New title"))
+
+    with pikepdf.open(pdf_path) as pdf:
+        assert str(pdf.docinfo["/Title"]) == "New title"
+        assert pdf.open_metadata()["dc:title"] == "New title"
+
+
+def test_pypdf2_fallback_drops_stale_xmp(tmp_path, monkeypatch):
+    """Test that the PyPDF2 fallback does not keep XMP it cannot update."""
+    pdf_path = tmp_path / "input.pdf"
+    _write_pdf_with_xmp(pdf_path)
+    monkeypatch.setattr(metadata_module, "pikepdf", None)
+
+    MetadataWriter().update_metadata(
+        pdf_path, DocumentMetadata(title="New title"), tmp_path / "output.pdf"
+    )
+
+    reader = PdfReader(tmp_path / "output.pdf")
+    assert reader.metadata["/Title"] == "New title"
+    assert "/Metadata" not in reader.trailer["/Root"]
@@ -25,6 +25,8 @@ def test_normalize_tag(normalizer):
     assert normalizer.normalize_tag("Invoice") == "invoice"
     assert normalizer.normalize_tag("Tax Forms") == "tax-forms"
     assert normalizer.normalize_tag("2023 Receipts!") == "2023-receipts"
+    assert normalizer.normalize_tag(" Tax -- Forms\t") == "tax-forms"
+    assert normalizer.normalize_tag("Café Bills") == "caf-bills"
 
 
 def test_normalize_tags(normalizer):
@@ -46,3 +48,24 @@ def test_sanitize_title(normalizer):
 
     assert len(sanitized) <= 103  # 100 + "..."
     assert sanitized.endswith("...")
+
+    assert normalizer.sanitize_title("Clean Title") == "Clean Title"
+    assert normalizer.sanitize_title(" Messy\t Title\n") == "Messy Title"
+    assert normalizer.sanitize_title("Non\xa0breaking  space") == "Non breaking space"
+
+
+def test_create_archive_path_skips_taken_names(tmp_path):
+    """Test that duplicate filenames get the first free counter."""
+    config = Config(
+        inbox_folder=tmp_path / "inbox",
+        archive_folder=tmp_path / "archive",
+        temp_folder=tmp_path / "tmp",
+        archive_structure="{document_type}",
+    )
+    normalizer = Normalizer(config)
+    folder = config.archive_folder / "invoice"
+    folder.mkdir()
+    for name in ("bill.pdf", "bill_1.pdf", "bill_2.pdf", "bill_4.pdf"):
+        (folder / name).touch()
+
+    assert normalizer.create_archive_path("bill.pdf", "invoice") == folder / "bill_3.pdf"
@@ -0,0 +1,190 @@
+"""Test OCR processor functionality."""
+
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import ocrmypdf
+import pikepdf
+import pytest
+from PyPDF2 import PdfWriter
+
+from doctagger import ocr as ocr_module
+from doctagger.config import Config
+from doctagger.ocr import OCRProcessor, _may_contain_text
+
+
+def test_needs_ocr_for_pdf_without_fonts(tmp_path):
+    """Test that a PDF without any font resources is sent to OCR."""
+    pdf_path = tmp_path / "scan.pdf"
+    writer = PdfWriter()
+    writer.add_blank_page(width=612, height=792)
+    with open(pdf_path, "wb") as f:
+        writer.write(f)
+
+    config = Config(
+        inbox_folder=tmp_path / "inbox",
+        archive_folder=tmp_path / "archive",
+        temp_folder=tmp_path / "tmp",
+    )
+
+    assert not _may_contain_text(pdf_path)
+    assert OCRProcessor(config).needs_ocr(pdf_path)
+
+
+def test_process_many_splits_cores(tmp_path, monkeypatch):
+    """Test that batch OCR keeps input order and limits each process's jobs."""
+    config = Config(
+        inbox_folder=tmp_path / "inbox",
+        archive_folder=tmp_path / "archive",
+        temp_folder=tmp_path / "tmp",
+    )
+    config.ocr.workers = 0  # ocrmypdf CLI
+    processor = OCRProcessor(config)
+    commands = []
+
+    def fake_run(cmd, **kwargs):
+        commands.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, b"", b"")
+
+    monkeypatch.setattr(processor, "needs_ocr", lambda path: True)
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    monkeypatch.setattr(os, "cpu_count", lambda: 8)
+
+    inputs = [tmp_path / f"in{i}.pdf" for i in range(3)]
+    outputs = [tmp_path / f"out{i}.pdf" for i in range(3)]
+
+    assert processor.process_many(inputs, outputs, max_workers=2) == outputs
+    assert len(commands) == 3
+    assert all(cmd[cmd.index("--jobs") + 1] == "4" for cmd in commands)
+
+
+def test_process_to_bytes_reads_stdout(tmp_path, monkeypatch):
+    """Test that in-memory OCR sends output to stdout and returns it."""
+    config = Config(
+        inbox_folder=tmp_path / "inbox",
+        archive_folder=tmp_path / "archive",
+        temp_folder=tmp_path / "tmp",
+    )
+    config.ocr.workers = 0  # ocrmypdf CLI
+    processor = OCRProcessor(config)
+    commands = []
+
+    def fake_run(cmd, **kwargs):
+        commands.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, b"%PDF-1.4 ocr", b"")
+
+    monkeypatch.setattr(processor, "needs_ocr", lambda path: True)
+    monkeypatch.setattr(subprocess, "run", fake_run)
+
+    assert processor.process_to_bytes(tmp_path / "scan.pdf") == b"%PDF-1.4 ocr"
+    assert commands[0][-1] == "-"
+
+    monkeypatch.setattr(processor, "needs_ocr", lambda path: False)
+    assert processor.process_to_bytes(tmp_path / "scan.pdf") is None
+
+
+def test_process_to_bytes_uses_worker_pool(tmp_path, monkeypatch):
+    """Test that pooled OCR calls the ocrmypdf API and maps its exit codes."""
+    config = Config(
+        inbox_folder=tmp_path / "inbox",
+        archive_folder=tmp_path / "archive",
+        temp_folder=tmp_path / "tmp",
+    )
+    config.ocr.language = "eng+deu"
+    processor = OCRProcessor(config)
+    calls = []
+
+    def fake_ocr(input_file, output_file, **options):
+        calls.append(options)
+        if input_file.name == "text.pdf":
+            raise ocrmypdf.exceptions.PriorOcrFoundError("page already has text")
+        output_file.write(b"%PDF-1.4 ocr")
+
+    # A thread pool stands in for the worker processes, so the patch applies
+    pool = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(processor, "_get_pool", lambda: pool)
+    monkeypatch.setattr(processor, "needs_ocr", lambda path: True)
+    monkeypatch.setattr(ocrmypdf, "ocr", fake_ocr)
+
+    assert processor.process_to_bytes(tmp_path / "scan.pdf") == b"%PDF-1.4 ocr"
+    assert processor.process_to_bytes(tmp_path / "text.pdf") is None
+    assert calls[0]["language"] == ["eng", "deu"]
+    assert calls[0]["skip_text"] is True
+    pool.shutdown()
+
+
+def _hanging_ocr(input_file, output_file, **options):
+    """Stand-in for ocrmypdf.ocr whose subprocess hangs on 'hang.pdf'."""
+    if input_file.name == "hang.pdf":
+        # Like subprocess.run, reap the child even when the wait is interrupted
+        with subprocess.Popen(["sleep", "30"]) as child:
+            (input_file.parent / "child.pid").write_text(str(child.pid))
+            child.wait()
+    output_file.write(b"%PDF-1.4 ocr")
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="needs SIGALRM and process groups")
+def test_pool_timeout_kills_hung_run(tmp_path, monkeypatch):
+    """Test that a hung OCR run is stopped in its worker, which stays usable."""
+    config = Config(
+        inbox_folder=tmp_path / "inbox",
+        archive_folder=tmp_path / "archive",
+        temp_folder=tmp_path / "tmp",
+    )
+    processor = OCRProcessor(config)
+    monkeypatch.setattr(ocrmypdf, "ocr", _hanging_ocr)
+    monkeypatch.setattr(ocr_module, "_OCR_TIMEOUT", 1)
+    monkeypatch.setattr(processor, "needs_ocr", lambda path: True)
+    # The fork start method carries the patched ocrmypdf.ocr into the worker
+    pool = ProcessPoolExecutor(max_workers=1, initializer=ocr_module._init_ocr_worker)
+    monkeypatch.setattr(processor, "_get_pool", lambda: pool)
+
+    started = time.monotonic()
+    with pytest.raises(RuntimeError, match="OCR timeout"):
+        processor.process_to_bytes(tmp_path / "hang.pdf")
+    elapsed = time.monotonic() - started
+    second = processor.process_to_bytes(tmp_path / "scan.pdf")
+    pool.shutdown()
+
+    child_pid = int((tmp_path / "child.pid").read_text())
+    assert elapsed < 10
+    assert second == b"%PDF-1.4 ocr"
+    with pytest.raises(ProcessLookupError):
+        os.kill(child_pid, 0)
+
+
+def test_needs_ocr_skips_pdf_with_text(tmp_path):
+    """Test that a PDF with a text layer skips OCR unless below the threshold."""
+    pdf = pikepdf.new()
+    font = pdf.make_indirect(
+        pikepdf.Dictionary(
+            Type=pikepdf.Name.Font, Subtype=pikepdf.Name.Type1, BaseFont=pikepdf.Name.Helvetica
+        )
+    )
+    text = b"Born digital text. " * 4
+    content = pikepdf.Stream(pdf, b"BT /F1 12 Tf 72 720 Td (" + text + b") Tj ET")
+    pdf.pages.append(
+        pikepdf.Page(
+            pikepdf.Dictionary(
+                Type=pikepdf.Name.Page,
+                MediaBox=[0, 0, 612, 792],
+                Resources=pikepdf.Dictionary(Font=pikepdf.Dictionary(F1=font)),
+                Contents=content,
+            )
+        )
+    )
+    pdf_path = tmp_path / "digital.pdf"
+    pdf.save(pdf_path)
+
+    config = Config(
+        inbox_folder=tmp_path / "inbox",
+        archive_folder=tmp_path / "archive",
+        temp_folder=tmp_path / "tmp",
+    )
+
+    assert not OCRProcessor(config).needs_ocr(pdf_path)
+    config.ocr.skip_text_threshold = 500
+    assert OCRProcessor(config).needs_ocr(pdf_path)
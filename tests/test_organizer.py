@@ -0,0 +1,68 @@
+"""Test file organizer functionality."""
+
+import json
+
+import pytest
+
+from doctagger.config import Config
+from doctagger.models import ProcessingResult, ProcessingStatus, TaggingResult
+from doctagger.organizer import FileOrganizer
+
+
+@pytest.fixture
+def organizer(tmp_path):
+    """Create file organizer instance."""
+    config = Config(
+        inbox_folder=tmp_path / "inbox",
+        archive_folder=tmp_path / "archive",
+        temp_folder=tmp_path / "tmp",
+    )
+    return FileOrganizer(config)
+
+
+def test_write_sidecar(organizer, tmp_path):
+    """Test that the sidecar JSON round-trips processing results."""
+    pdf_path = tmp_path / "archive" / "Café invoice.pdf"
+    result = ProcessingResult(
+        status=ProcessingStatus.COMPLETED,
+        original_path=tmp_path / "inbox" / "Café invoice.pdf",
+        archive_path=pdf_path,
+        tagging=TaggingResult(title="Café invoice", document_type="invoice", tags=["food"]),
+        embedding=[0.25, -0.5],
+        content_hash="abc123",
+    )
+
+    sidecar_path = organizer.write_sidecar(pdf_path, result)
+
+    assert sidecar_path == pdf_path.with_suffix(".pdf.json")
+    data = json.loads(sidecar_path.read_text(encoding="utf-8"))
+    assert data["status"] == "completed"
+    assert data["tagging"]["title"] == "Café invoice"
+    assert data["embedding"] == [0.25, -0.5]
+    assert data["content_hash"] == "abc123"
+
+
+def test_move_to_archive(organizer, tmp_path):
+    """Test moving a file into a new archive folder."""
+    source = tmp_path / "inbox" / "doc.pdf"
+    source.write_bytes(b"%PDF-1.4")
+    target = tmp_path / "archive" / "2024" / "01" / "doc.pdf"
+
+    assert organizer.move_to_archive(source, target) == target
+    assert not source.exists()
+    assert target.read_bytes() == b"%PDF-1.4"
+
+
+def test_cleanup_temp_files(organizer, tmp_path):
+    """Test removing temp files, temp directories and missing paths."""
+    temp_file = tmp_path / "tmp" / "page.pdf"
+    temp_file.write_bytes(b"data")
+    temp_dir = tmp_path / "tmp" / "job"
+    (temp_dir / "nested").mkdir(parents=True)
+
+    organizer.cleanup_temp_files(temp_file)
+    organizer.cleanup_temp_files(temp_dir)
+    organizer.cleanup_temp_files(tmp_path / "tmp" / "missing.pdf")
+
+    assert not temp_file.exists()
+    assert not temp_dir.exists()
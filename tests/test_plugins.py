@@ -0,0 +1,43 @@
+"""Test plugin registry."""
+
+from doctagger.plugins import PluginRegistry, ProcessorPlugin, StoragePlugin
+
+
+class EchoProcessor(ProcessorPlugin):
+    """Processor plugin that returns the text unchanged."""
+
+    name = "shared"
+
+    def process(self, text, context):
+        return text, {}
+
+
+class NullStorage(StoragePlugin):
+    """Storage plugin that stores nothing."""
+
+    name = "shared"
+
+    def save(self, file_path, destination, metadata):
+        return destination
+
+    def load(self, source, local_path):
+        return local_path
+
+    def delete(self, path):
+        return True
+
+    def list(self, prefix=""):
+        return []
+
+
+def test_unregister_removes_every_type_sharing_a_name():
+    """Test that a name registered under two plugin types can be fully removed."""
+    registry = PluginRegistry()
+    registry.register_processor(EchoProcessor())
+    registry.register_storage(NullStorage())
+
+    assert registry.unregister("shared")
+    assert registry.get_processors() == []
+    assert registry.unregister("shared")
+    assert registry._storage == {}
+    assert not registry.unregister("shared")
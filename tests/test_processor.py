@@ -0,0 +1,304 @@
+"""Test document processing pipeline."""
+
+import json
+import logging
+import shutil
+
+import pytest
+from PyPDF2 import PdfWriter
+
+from doctagger import processor as processor_module
+from doctagger.config import Config
+from doctagger.extractor import TextExtractor
+from doctagger.llm import LLMTagger
+from doctagger.models import ProcessingStatus
+from doctagger.ocr import OCRProcessor
+from doctagger.processor import DocumentProcessor
+
+_prepare_in_worker = processor_module._prepare_in_worker
+
+
+def _crashing_prepare(pdf_path, skip_ocr):
+    """Worker stage that raises for one document (module level, so it pickles)."""
+    if pdf_path.stem == "beta":
+        raise MemoryError("worker ran out of memory")
+    return _prepare_in_worker(pdf_path, skip_ocr)
+
+
+def test_process_many_keeps_order_and_failures(tmp_path, monkeypatch, caplog):
+    """Test that pipelined processing returns per-document results in input order."""
+    config = Config(
+        inbox_folder=tmp_path / "inbox",
+        archive_folder=tmp_path / "archive",
+        temp_folder=tmp_path / "tmp",
+        archive_structure="{document_type}",
+        cache_enabled=False,
+    )
+    config.ocr.enabled = False
+    config.embedding.enabled = False
+
+    pdf_paths = []
+    for name in ("alpha", "beta", "gamma"):
+        pdf_path = config.inbox_folder / f"{name}.pdf"
+        writer = PdfWriter()
+        writer.add_blank_page(width=612, height=792)
+        # Distinct content, so no document is skipped as a duplicate
+        writer.add_metadata({"/Subject": name})
+        with open(pdf_path, "wb") as f:
+            writer.write(f)
+        pdf_paths.append(pdf_path)
+
+    # Worker processes are forked, so they inherit these patches
+    monkeypatch.setattr(TextExtractor, "extract", lambda self, path: path.stem.split("_")[-1])
+
+    def fake_call(self, prompt):
+        title = prompt.split("Document text:\n", 1)[1]
+        if title == "gamma":
+            raise RuntimeError("server error")
+        return json.dumps({"title": title, "document_type": "letter", "tags": [title]})
+
+    monkeypatch.setattr(LLMTagger, "_call_openai", fake_call)
+
+    with caplog.at_level(logging.INFO):
+        results = DocumentProcessor.process_many(pdf_paths, config=config, workers=2)
+
+    assert [r.status for r in results] == [
+        ProcessingStatus.COMPLETED,
+        ProcessingStatus.COMPLETED,
+        ProcessingStatus.FAILED,
+    ]
+    assert [r.tagging.title for r in results[:2]] == ["alpha", "beta"]
+    assert results[0].archive_path == config.archive_folder / "letter" / "alpha.pdf"
+    assert results[0].archive_path.exists()
+    assert "server error" in results[2].error
+    # Worker processes log through this process's handlers
+    assert "Starting processing: alpha.pdf" in caplog.text
+
+
+def test_process_skip_archive_updates_original(tmp_path, monkeypatch):
+    """Test that skip_archive writes the metadata into the original file."""
+    config = Config(
+        inbox_folder=tmp_path / "inbox",
+        archive_folder=tmp_path / "archive",
+        temp_folder=tmp_path / "tmp",
+        cache_enabled=False,
+    )
+    config.ocr.enabled = False
+    config.embedding.enabled = False
+
+    pdf_path = config.inbox_folder / "letter.pdf"
+    writer = PdfWriter()
+    writer.add_blank_page(width=612, height=792)
+    with open(pdf_path, "wb") as f:
+        writer.write(f)
+
+    processor = DocumentProcessor(config)
+    monkeypatch.setattr(processor.text_extractor, "extract", lambda path: "letter text")
+    monkeypatch.setattr(
+        processor.llm_tagger,
+        "_call_openai",
+        lambda prompt: '{"title": "A Letter", "document_type": "letter", "tags": ["mail"]}',
+    )
+
+    result = processor.process(pdf_path, skip_archive=True)
+
+    assert result.status == ProcessingStatus.COMPLETED
+    assert result.archive_path is None
+    assert processor.metadata_writer.read_metadata(pdf_path).title == "A Letter"
+    assert [p.name for p in config.inbox_folder.iterdir()] == ["letter.pdf"]
+
+
+def test_process_skips_archived_duplicate(tmp_path, monkeypatch):
+    """Test that a document whose content is already archived is skipped."""
+    config = Config(
+        inbox_folder=tmp_path / "inbox",
+        archive_folder=tmp_path / "archive",
+        temp_folder=tmp_path / "tmp",
+        cache_enabled=False,
+    )
+    config.ocr.enabled = False
+    config.embedding.enabled = False
+
+    writer = PdfWriter()
+    writer.add_blank_page(width=612, height=792)
+    for name in ("scan.pdf", "scan copy.pdf"):
+        with open(config.inbox_folder / name, "wb") as f:
+            writer.write(f)
+
+    processor = DocumentProcessor(config)
+    calls = []
+    monkeypatch.setattr(processor.text_extractor, "extract", lambda path: "letter text")
+
+    def fake_call(prompt):
+        calls.append(prompt)
+        return '{"title": "A Letter", "document_type": "letter", "tags": ["mail"]}'
+
+    monkeypatch.setattr(processor.llm_tagger, "_call_openai", fake_call)
+
+    first = processor.process(config.inbox_folder / "scan.pdf")
+    duplicate = processor.process(config.inbox_folder / "scan copy.pdf")
+    forced = processor.process(config.inbox_folder / "scan copy.pdf", force_reprocess=True)
+
+    assert first.status == ProcessingStatus.COMPLETED
+    assert duplicate.status == ProcessingStatus.SKIPPED
+    assert duplicate.archive_path == first.archive_path
+    assert duplicate.sidecar_path == first.sidecar_path
+    assert forced.status == ProcessingStatus.COMPLETED
+    assert len(calls) == 2
+
+
+def test_process_batch_applies_macos_tags_once(tmp_path, monkeypatch):
+    """Test that a batch's Finder tags are applied in one call, not per document."""
+    config = Config(
+        inbox_folder=tmp_path / "inbox",
+        archive_folder=tmp_path / "archive",
+        temp_folder=tmp_path / "tmp",
+        archive_structure="{document_type}",
+        cache_enabled=False,
+    )
+    config.ocr.enabled = False
+    config.embedding.enabled = False
+    config.macos_tags.enabled = True
+
+    pdf_paths = []
+    for name in ("alpha", "beta"):
+        writer = PdfWriter()
+        writer.add_blank_page(width=612, height=792)
+        writer.add_metadata({"/Subject": name})
+        pdf_path = config.inbox_folder / f"{name}.pdf"
+        with open(pdf_path, "wb") as f:
+            writer.write(f)
+        pdf_paths.append(pdf_path)
+
+    processor = DocumentProcessor(config)
+    monkeypatch.setattr(processor.text_extractor, "extract", lambda path: "letter text")
+    monkeypatch.setattr(
+        processor.llm_tagger,
+        "_call_openai",
+        lambda prompt: '{"title": "A Letter", "document_type": "letter", "tags": ["mail"]}',
+    )
+    batches = []
+    monkeypatch.setattr(
+        processor.file_organizer, "apply_macos_tags_batch", lambda files: batches.append(files)
+    )
+    monkeypatch.setattr(
+        processor.file_organizer,
+        "apply_macos_tags",
+        lambda *args: pytest.fail("tagged a batch document on its own"),
+    )
+
+    results = processor.process_batch(pdf_paths, max_workers=2)
+
+    assert [r.status for r in results] == [ProcessingStatus.COMPLETED] * 2
+    assert batches == [[(r.archive_path, ["mail"]) for r in results]]
+
+
+def test_process_cleans_up_ocr_temp_file(tmp_path, monkeypatch):
+    """Test that the OCR temp file is deleted once background cleanup finishes."""
+    config = Config(
+        inbox_folder=tmp_path / "inbox",
+        archive_folder=tmp_path / "archive",
+        temp_folder=tmp_path / "tmp",
+        cache_enabled=False,
+    )
+    config.ocr.in_memory = False
+    config.embedding.enabled = False
+
+    pdf_path = config.inbox_folder / "scan.pdf"
+    writer = PdfWriter()
+    writer.add_blank_page(width=612, height=792)
+    with open(pdf_path, "wb") as f:
+        writer.write(f)
+
+    processor = DocumentProcessor(config)
+    monkeypatch.setattr(processor.ocr_processor, "process", lambda src, dst: shutil.copy(src, dst))
+    monkeypatch.setattr(processor.text_extractor, "extract", lambda path: "scanned text")
+    monkeypatch.setattr(
+        processor.llm_tagger,
+        "_call_openai",
+        lambda prompt: '{"title": "A Scan", "document_type": "letter", "tags": []}',
+    )
+
+    result = processor.process(pdf_path)
+    processor.close()
+
+    assert result.status == ProcessingStatus.COMPLETED
+    assert result.ocr_applied
+    assert list(config.temp_folder.iterdir()) == []
+
+
+def test_process_many_isolates_worker_exceptions(tmp_path, monkeypatch):
+    """Test that a worker raising fails only its document."""
+    config = Config(
+        inbox_folder=tmp_path / "inbox",
+        archive_folder=tmp_path / "archive",
+        temp_folder=tmp_path / "tmp",
+        archive_structure="{document_type}",
+        cache_enabled=False,
+    )
+    config.ocr.enabled = False
+    config.embedding.enabled = False
+
+    pdf_paths = []
+    for name in ("alpha", "beta"):
+        pdf_path = config.inbox_folder / f"{name}.pdf"
+        writer = PdfWriter()
+        writer.add_blank_page(width=612, height=792)
+        writer.add_metadata({"/Subject": name})
+        with open(pdf_path, "wb") as f:
+            writer.write(f)
+        pdf_paths.append(pdf_path)
+
+    # Worker processes are forked, so they inherit these patches
+    monkeypatch.setattr(processor_module, "_prepare_in_worker", _crashing_prepare)
+    monkeypatch.setattr(TextExtractor, "extract", lambda self, path: "letter text")
+    monkeypatch.setattr(
+        LLMTagger,
+        "_call_openai",
+        lambda self, prompt: '{"title": "A Letter", "document_type": "letter", "tags": []}',
+    )
+
+    results = DocumentProcessor.process_many(pdf_paths, config=config, workers=2)
+
+    assert [r.status for r in results] == [ProcessingStatus.COMPLETED, ProcessingStatus.FAILED]
+    assert results[1].original_path == pdf_paths[1].resolve()
+    assert "worker ran out of memory" in results[1].error
+    assert results[0].archive_path.exists()
+
+
+def test_process_many_keeps_ocr_output_in_worker_files(tmp_path, monkeypatch):
+    """Test that process_many workers OCR to temp files rather than in memory."""
+    config = Config(
+        inbox_folder=tmp_path / "inbox",
+        archive_folder=tmp_path / "archive",
+        temp_folder=tmp_path / "tmp",
+        cache_enabled=False,
+    )
+    config.embedding.enabled = False
+
+    pdf_path = config.inbox_folder / "scan.pdf"
+    writer = PdfWriter()
+    writer.add_blank_page(width=612, height=792)
+    with open(pdf_path, "wb") as f:
+        writer.write(f)
+
+    def process_to_bytes(self, input_path, jobs=None):
+        raise AssertionError("OCR output would be pickled between processes")
+
+    # Worker processes are forked, so they inherit these patches
+    monkeypatch.setattr(OCRProcessor, "process_to_bytes", process_to_bytes)
+    monkeypatch.setattr(
+        OCRProcessor, "process", lambda self, src, dst, jobs=None: shutil.copy(src, dst)
+    )
+    monkeypatch.setattr(TextExtractor, "extract", lambda self, path: "scanned text")
+    monkeypatch.setattr(
+        LLMTagger,
+        "_call_openai",
+        lambda self, prompt: '{"title": "A Scan", "document_type": "letter", "tags": []}',
+    )
+
+    (result,) = DocumentProcessor.process_many([pdf_path], config=config, workers=1)
+
+    assert result.status == ProcessingStatus.COMPLETED
+    assert result.ocr_applied
+    assert list(config.temp_folder.iterdir()) == []
@@ -0,0 +1,65 @@
+"""Test folder watcher functionality."""
+
+import logging
+
+from doctagger.config import Config
+from doctagger.models import ProcessingResult, ProcessingStatus
+from doctagger.watcher import FolderWatcher, PDFHandler
+
+
+class FakeProcessor:
+    """Processor stand-in that reports 'dup' files as already archived."""
+
+    def __init__(self, archive_path):
+        self.archive_path = archive_path
+
+    def process_batch(self, pdf_paths):
+        results = []
+        for pdf_path in pdf_paths:
+            if pdf_path.stem == "dup":
+                results.append(
+                    ProcessingResult(
+                        status=ProcessingStatus.SKIPPED,
+                        original_path=pdf_path,
+                        archive_path=self.archive_path,
+                    )
+                )
+            else:
+                results.append(
+                    ProcessingResult(status=ProcessingStatus.COMPLETED, original_path=pdf_path)
+                )
+        return results
+
+
+def test_process_existing_counts_duplicates_as_skipped(tmp_path):
+    """Test that documents skipped as duplicates are not counted as failures."""
+    config = Config(
+        inbox_folder=tmp_path / "inbox",
+        archive_folder=tmp_path / "archive",
+        temp_folder=tmp_path / "tmp",
+    )
+    for name in ("dup", "new"):
+        (config.inbox_folder / f"{name}.pdf").write_bytes(b"%PDF-1.4")
+
+    watcher = FolderWatcher(config)
+    watcher.processor = FakeProcessor(tmp_path / "archive" / "dup.pdf")
+    stats = watcher.process_existing(skip_processed=False)
+
+    assert stats["processed"] == 1
+    assert stats["skipped"] == 1
+    assert stats["failed"] == 0
+    statuses = {entry["name"]: entry["status"] for entry in stats["files"]}
+    assert statuses == {"dup.pdf": "skipped", "new.pdf": "completed"}
+
+
+def test_handler_logs_duplicates_as_skipped(tmp_path, caplog):
+    """Test that the watcher does not report skipped duplicates as failures."""
+    pdf_path = tmp_path / "dup.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4")
+    handler = PDFHandler(FakeProcessor(tmp_path / "archive" / "dup.pdf"))
+
+    with caplog.at_level(logging.INFO, logger="doctagger.watcher"):
+        handler._process_batch([pdf_path])
+
+    assert "Skipped dup.pdf: already archived" in caplog.text
+    assert not [record for record in caplog.records if record.levelno >= logging.ERROR]